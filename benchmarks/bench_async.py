@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Measure AsyncStreamParser throughput over many concurrent socket feeds.
+
+A local server streams data/Cheyenne.bin --repeat times to each of
+--connections clients. Every client parses its feed, either with
+AsyncStreamParser in one event loop or with a blocking StreamParser in a
+thread per connection for comparison.
+
+    $ python -m benchmarks.bench_async --connections 200
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import threading
+import time
+
+import klvdata
+
+SAMPLE = os.path.join(os.path.dirname(__file__), '..', 'data', 'Cheyenne.bin')
+
+
+async def serve(data, repeat):
+    async def feed(reader, writer):
+        for _ in range(repeat):
+            writer.write(data)
+            await writer.drain()
+
+        writer.close()
+
+    return await asyncio.start_server(feed, '127.0.0.1', 0)
+
+
+async def run_async(port, connections):
+    async def client():
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        packets = 0
+
+        async for packet in klvdata.AsyncStreamParser(reader):
+            packets += 1
+
+        writer.close()
+        return packets
+
+    return sum(await asyncio.gather(*(client() for _ in range(connections))))
+
+
+def run_threads(port, connections):
+    counts = []
+
+    def client():
+        with socket.create_connection(('127.0.0.1', port)) as sock:
+            with sock.makefile('rb') as f:
+                counts.append(sum(1 for _ in klvdata.StreamParser(f)))
+
+    threads = [threading.Thread(target=client) for _ in range(connections)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    return sum(counts)
+
+
+async def bench(mode, data, connections, repeat):
+    server = await serve(data, repeat)
+    port = server.sockets[0].getsockname()[1]
+
+    start = time.perf_counter()
+
+    if mode == 'async':
+        packets = await run_async(port, connections)
+    else:
+        packets = await asyncio.get_event_loop().run_in_executor(
+            None, run_threads, port, connections)
+
+    seconds = time.perf_counter() - start
+
+    server.close()
+    await server.wait_closed()
+
+    return packets, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--connections', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=2, help='copies of the sample sent per connection')
+    parser.add_argument('--mode', choices=('async', 'threads', 'both'), default='both')
+    args = parser.parse_args()
+
+    with open(SAMPLE, 'rb') as f:
+        data = f.read()
+
+    modes = ('async', 'threads') if args.mode == 'both' else (args.mode,)
+
+    for mode in modes:
+        # asyncio.run needs Python 3.7.
+        loop = asyncio.new_event_loop()
+
+        try:
+            packets, seconds = loop.run_until_complete(bench(mode, data, args.connections, args.repeat))
+        finally:
+            loop.close()
+
+        print('{:<8} {:5d} connections {:8d} packets {:8.2f} s {:10.0f} packets/s'.format(
+            mode, args.connections, packets, seconds, packets / seconds))
+
+
+if __name__ == '__main__':
+    main()
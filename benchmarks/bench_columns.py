@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Compare decode_columns with building columns from parsed packets.
+
+data/Cheyenne.bin is replicated --repeat times in memory. The per-object
+path parses every packet with StreamParser and reads the tags into lists;
+decode_columns returns NumPy arrays directly.
+
+    $ python -m benchmarks.bench_columns --repeat 100 --tags 2,13,14,15
+"""
+
+import argparse
+import os
+import time
+
+import klvdata
+from klvdata.columns import columnar_tags
+from klvdata.columns import decode_columns
+
+SAMPLE = os.path.join(os.path.dirname(__file__), '..', 'data', 'Cheyenne.bin')
+
+
+def per_object(data, tags):
+    keys = [bytes((tag,)) for tag in tags]
+    columns = {tag: [] for tag in tags}
+
+    for packet in klvdata.StreamParser(data):
+        for tag, key in zip(tags, keys):
+            item = packet.items.get(key)
+            columns[tag].append(None if item is None else item.value.value)
+
+    return columns
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=100, help='copies of the sample decoded')
+    parser.add_argument('--tags', help='comma separated tags (default: all supported)')
+    args = parser.parse_args()
+
+    with open(SAMPLE, 'rb') as f:
+        data = f.read() * args.repeat
+
+    tags = [int(tag) for tag in args.tags.split(',')] if args.tags else columnar_tags()
+
+    for name, decode in (('per object', per_object), ('decode_columns', decode_columns)):
+        start = time.perf_counter()
+        columns = decode(data, tags)
+        seconds = time.perf_counter() - start
+        packets = len(columns[tags[0]])
+
+        print('{:<16} {:8.3f} s {:12.0f} packets/s'.format(name, seconds, packets / seconds))
+
+
+if __name__ == '__main__':
+    main()
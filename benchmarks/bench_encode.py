@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Measure PacketEncoder throughput encoding ST0601 packets from values.
+
+The packets of data/Cheyenne.bin are decoded once into records, and into
+dictionaries of TAG to value, which are then encoded --repeat times.
+
+    $ python -m benchmarks.bench_encode --repeat 10
+"""
+
+import argparse
+import os
+import time
+
+import klvdata
+from klvdata.encoder import PacketEncoder
+from klvdata.parallel import compact
+
+SAMPLE = os.path.join(os.path.dirname(__file__), '..', 'data', 'Cheyenne.bin')
+
+
+def bench(encoder, values, repeat):
+    start = time.perf_counter()
+
+    for _ in range(repeat):
+        for value in values:
+            encoder.encode(value)
+
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=10, help='times the sample is encoded')
+    args = parser.parse_args()
+
+    with open(SAMPLE, 'rb') as f:
+        packets = list(klvdata.StreamParser(f.read()))
+
+    records = [packet.record() for packet in packets]
+    tags = [compact(packet) for packet in packets]
+
+    encoder = PacketEncoder()
+
+    for name, values in (('record', records), ('tags', tags)):
+        seconds = bench(encoder, values, args.repeat)
+        packets = len(values) * args.repeat
+        print('{:<8} {:8d} packets {:8.2f} s {:10.0f} packets/s'.format(
+            name, packets, seconds, packets / seconds))
+
+
+if __name__ == '__main__':
+    main()
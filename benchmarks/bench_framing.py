@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Compare KLVParser and BufferedKLVParser framing throughput.
+
+data/Cheyenne.bin is replicated into a temporary file of roughly --size MB.
+Framing walks every packet and every element nested in it without decoding
+values. Full decoding through StreamParser is much slower, so it runs over
+the first --decode-size MB only.
+
+    $ python -m benchmarks.bench_framing --size 1024
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import klvdata
+from klvdata.klvparser import BufferedKLVParser
+from klvdata.klvparser import KLVParser
+
+SAMPLE = os.path.join(os.path.dirname(__file__), '..', 'data', 'Cheyenne.bin')
+
+
+def replicate(path, size):
+    """Write SAMPLE repeatedly to path until it holds at least size bytes."""
+    with open(SAMPLE, 'rb') as f:
+        sample = f.read()
+
+    with open(path, 'wb') as f:
+        for _ in range(max(1, size // len(sample))):
+            f.write(sample)
+
+    return os.path.getsize(path)
+
+
+def frame(parser_class, path):
+    packets = 0
+
+    with open(path, 'rb') as f:
+        for key, value in parser_class(f, 16):
+            for _ in parser_class(value, 1):
+                pass
+            packets += 1
+
+    return packets
+
+
+def decode(path, size, buffered):
+    packets = 0
+
+    with open(path, 'rb') as f:
+        for packet in klvdata.StreamParser(f, buffered=buffered):
+            packets += 1
+            if f.tell() > size:
+                break
+
+    return packets
+
+
+def report(name, seconds, packets, size):
+    print('{:<28} {:8.2f} s {:10.0f} packets/s {:8.1f} MB/s'.format(
+        name, seconds, packets / seconds, size / seconds / 2 ** 20))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=1024, help='framing input size in MB')
+    parser.add_argument('--decode-size', type=int, default=16, help='decoding input size in MB')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'replicated.bin')
+        size = replicate(path, args.size * 2 ** 20)
+
+        for name, parser_class in (('KLVParser', KLVParser), ('BufferedKLVParser', BufferedKLVParser)):
+            start = time.perf_counter()
+            packets = frame(parser_class, path)
+            report('frame ' + name, time.perf_counter() - start, packets, size)
+
+        decode_size = min(size, args.decode_size * 2 ** 20)
+
+        for name, buffered in (('StreamParser', False), ('StreamParser(buffered)', True)):
+            start = time.perf_counter()
+            packets = decode(path, decode_size, buffered)
+            report('decode ' + name, time.perf_counter() - start, packets, decode_size)
+
+
+if __name__ == '__main__':
+    main()
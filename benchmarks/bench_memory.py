@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Measure the memory held per decoded packet with tracemalloc.
+
+Every packet of data/Cheyenne.bin, replicated --repeat times, is decoded
+with StreamParser and kept in a list, as when holding a recording in
+memory. The input is read before tracing starts, so only the decoded
+packets are counted.
+
+    $ python -m benchmarks.bench_memory --repeat 10
+"""
+
+import argparse
+import gc
+import os
+import tracemalloc
+
+import klvdata
+
+SAMPLE = os.path.join(os.path.dirname(__file__), '..', 'data', 'Cheyenne.bin')
+
+
+def measure(data, **options):
+    """Return the number of packets and bytes allocated to hold them."""
+    gc.collect()
+    tracemalloc.start()
+
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        packets = list(klvdata.StreamParser(data, **options))
+        gc.collect()
+        held = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    return len(packets), held
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=10, help='copies of the sample decoded')
+    args = parser.parse_args()
+
+    with open(SAMPLE, 'rb') as f:
+        data = f.read() * args.repeat
+
+    for name, options in (('StreamParser', {}), ('StreamParser(buffered)', {'buffered': True})):
+        packets, held = measure(data, **options)
+        print('{:<24} {:8d} packets {:10.0f} bytes/packet'.format(name, packets, held / packets))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Time the decoding of each ST0601 tag.
+
+Every element parser registered with UASLocalMetadataSet is timed on the
+value of its tag in the first packet of data/Cheyenne.bin, or on a zero
+value of its width if the sample lacks the tag. For mapped elements,
+MappedValue is also timed with the precompiled LinearMap used by the
+parser and with the generic bytes_to_float() path, which works out the
+map on every call.
+
+    $ python -m benchmarks.bench_tags --number 20000
+"""
+
+import argparse
+import os
+import timeit
+
+from klvdata.elementparser import MappedValue
+from klvdata.klvparser import KLVParser
+from klvdata.misb0601 import UASLocalMetadataSet
+
+SAMPLE = os.path.join(os.path.dirname(__file__), '..', 'data', 'Cheyenne.bin')
+
+
+def sample_values():
+    """Return the raw value of each tag in the first packet of SAMPLE."""
+    with open(SAMPLE, 'rb') as f:
+        _, value = next(KLVParser(f, 16))
+
+    return dict(KLVParser(value, 1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=20000, help='decodes timed per tag')
+    args = parser.parse_args()
+
+    values = sample_values()
+
+    print('{:>4} {:<32} {:>10} {:>10} {:>10}'.format('tag', 'element', 'parse ns', 'map ns', 'generic ns'))
+
+    def ns(function):
+        return '{:10.0f}'.format(1e9 / args.number * timeit.timeit(function, number=args.number))
+
+    for key, element in sorted(UASLocalMetadataSet.parsers.items()):
+        if not hasattr(element, 'TAG'):
+            continue
+
+        linear_map = getattr(element, '_linear_map', None)
+        value = values.get(key, bytes(linear_map.length if linear_map else 1))
+
+        try:
+            element(value)
+        except Exception:
+            continue
+
+        mapped = generic = ''
+
+        if linear_map is not None:
+            _domain, _range = element._domain, element._range
+            mapped = ns(lambda: MappedValue(value, _domain, _range, linear_map))
+            generic = ns(lambda: MappedValue(value, _domain, _range))
+
+        print('{:>4} {:<32} {} {:>10} {:>10}'.format(
+            element.TAG, element.__name__, ns(lambda: element(value)), mapped, generic))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""Time framing, decoding, encoding and export, and compare with a baseline.
+
+The recordings in data/*.bin are concatenated and replicated to roughly
+--size MB in memory. Each case is set up untimed and timed --repeat times
+with the garbage collector off, as timeit does, each time running it as
+often as takes --min-time seconds. It is then run once more under
+tracemalloc, over a single copy of the recordings, keeping what it
+produces for each packet. For each case the suite reports:
+
+- throughput in packets (or elements) per second, of the fastest run;
+- throughput in MB/s of the input it covers, of the fastest run;
+- throughput of the median run;
+- memory blocks and bytes allocated per packet for what it produces, from
+  tracemalloc snapshots taken before and after the traced run;
+- peak memory traced while the case ran, in KiB.
+
+--save writes the results as JSON. --compare reads a saved file and
+compares the fastest runs, which are less affected by other load on the
+machine than single runs, and the blocks allocated per packet. It marks
+each case that has become slower than --tolerance allows, and the suite
+exits with status 1 if any case has regressed.
+
+    $ python -m benchmarks.suite --size 8 --save baseline.json
+    $ python -m benchmarks.suite --size 8 --compare baseline.json
+"""
+
+import argparse
+import gc
+import glob
+import io
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+import klvdata
+from klvdata.elementparser import DateTimeElementParser
+from klvdata.elementparser import MappedElementParser
+from klvdata.elementparser import StringElementParser
+from klvdata.export import write_geojson
+from klvdata.klvparser import KLVParser
+from klvdata.misb0601 import UASLocalMetadataSet
+from klvdata.parallel import compact
+
+SAMPLES = os.path.join(os.path.dirname(__file__), '..', 'data', '*.bin')
+
+
+class Inputs(object):
+    """Replicated recordings and the inputs derived from them, built once."""
+
+    def __init__(self, data):
+        self.data = data
+        self._packets = None
+
+    @property
+    def packets(self):
+        """Return the decoded UASLocalMetadataSet packets of data."""
+        if self._packets is None:
+            self._packets = [packet for packet in klvdata.StreamParser(self.data)
+                             if isinstance(packet, UASLocalMetadataSet)]
+
+        return self._packets
+
+    def elements(self, parser_class):
+        """Return (parser, value bytes) of the packet elements of parser_class."""
+        parsers = UASLocalMetadataSet.parsers
+
+        return [(parsers[key], value)
+                for _, packet in KLVParser(self.data, 16)
+                for key, value in KLVParser(packet, 1)
+                if issubclass(parsers.get(key, object), parser_class)]
+
+
+def frame(inputs):
+    data = inputs.data
+
+    def run(keep=None):
+        packets = 0
+
+        for _, value in KLVParser(data, 16):
+            if keep is None:
+                for _ in KLVParser(value, 1):
+                    pass
+            else:
+                keep.append(list(KLVParser(value, 1)))
+            packets += 1
+
+        return packets
+
+    return run, len(data), 'packets'
+
+
+def decode(inputs):
+    data = inputs.data
+
+    def run(keep=None):
+        packets = 0
+
+        for packet in klvdata.StreamParser(data):
+            for _ in packet.items.values():
+                pass
+
+            if keep is not None:
+                keep.append(packet)
+            packets += 1
+
+        return packets
+
+    return run, len(data), 'packets'
+
+
+def element_decode(parser_class):
+    def case(inputs):
+        elements = inputs.elements(parser_class)
+
+        def run(keep=None):
+            for parser, value in elements:
+                element = parser(value)
+                element.value.value
+
+                if keep is not None:
+                    keep.append(element)
+
+            return len(elements)
+
+        return run, sum(len(value) for _, value in elements), 'elements'
+
+    return case
+
+
+def round_trip(inputs):
+    # A set keeps the bytes it was parsed from, so its elements are encoded
+    # one by one instead.
+    packets = [list(packet.items.values()) for packet in inputs.packets]
+
+    def run(keep=None):
+        for items in packets:
+            if keep is None:
+                for item in items:
+                    bytes(item)
+            else:
+                keep.append([bytes(item) for item in items])
+
+        return len(packets)
+
+    return run, len(inputs.data), 'packets'
+
+
+def metadata_list(inputs):
+    packets = inputs.packets
+
+    def run(keep=None):
+        for packet in packets:
+            metadata = packet.MetadataList()
+
+            if keep is not None:
+                keep.append(metadata)
+
+        return len(packets)
+
+    return run, len(inputs.data), 'packets'
+
+
+def encode(inputs):
+    records = [compact(packet) for packet in inputs.packets]
+    encoder = klvdata.PacketEncoder()
+
+    def run(keep=None):
+        for record in records:
+            encoded = encoder.encode(record)
+
+            if keep is not None:
+                keep.append(encoded)
+
+        return len(records)
+
+    return run, len(inputs.data), 'packets'
+
+
+def export(inputs):
+    records = [compact(packet) for packet in inputs.packets]
+
+    def run(keep=None):
+        f = io.StringIO()
+        write_geojson(iter(records), f)
+
+        if keep is not None:
+            keep.append(f)
+
+        return len(records)
+
+    return run, len(inputs.data), 'packets'
+
+
+CASES = (
+    ('frame KLVParser', frame),
+    ('decode StreamParser', decode),
+    ('decode MappedValue', element_decode(MappedElementParser)),
+    ('decode StringValue', element_decode(StringElementParser)),
+    ('decode DateTimeValue', element_decode(DateTimeElementParser)),
+    ('Element.__bytes__', round_trip),
+    ('MetadataList()', metadata_list),
+    ('encode PacketEncoder', encode),
+    ('export GeoJSON', export),
+)
+
+
+def measure(case, inputs, sample, repeat=5, min_time=0.2):
+    """Return the results of case, timed repeat times over inputs and traced
+    over sample."""
+    run, size, unit = case(inputs)
+
+    # Runs per timing, enough to take min_time.
+    start = time.perf_counter()
+    count = run()
+    loops = max(1, math.ceil(min_time / (time.perf_counter() - start)))
+    times = []
+
+    enabled = gc.isenabled()
+    gc.disable()
+
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+
+            for _ in range(loops):
+                run()
+
+            times.append((time.perf_counter() - start) / loops)
+    finally:
+        if enabled:
+            gc.enable()
+
+    seconds, median = min(times), statistics.median(times)
+
+    run, _, _ = case(sample)
+    keep = []
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    gc.disable()
+    tracemalloc.start()
+
+    try:
+        before = tracemalloc.take_snapshot().filter_traces(filters)
+        units = run(keep)
+        after = tracemalloc.take_snapshot().filter_traces(filters)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+        if enabled:
+            gc.enable()
+
+    # Leave out the items array of keep, which is not allocated per packet.
+    changes = after.compare_to(before, 'filename')
+    blocks = sum(change.count_diff for change in changes) - 1
+    allocated = sum(change.size_diff for change in changes) - (sys.getsizeof(keep) - sys.getsizeof([]))
+
+    return {'unit': unit, 'count': count, 'repeat': repeat, 'seconds': seconds,
+            'median_seconds': median,
+            'per_second': count / seconds if seconds else 0,
+            'median_per_second': count / median if median else 0,
+            'mb_per_second': size / seconds / 2 ** 20 if seconds else 0,
+            'blocks_per_unit': blocks / units if units else 0,
+            'bytes_per_unit': allocated / units if units else 0,
+            'peak_kib': peak / 2 ** 10}
+
+
+def compare(results, baseline, tolerance):
+    """Print the change of each case from baseline, returning the regressed."""
+    regressed = []
+
+    for name, result in results.items():
+        before = baseline.get(name)
+
+        if not before or not before['per_second']:
+            print('{:<24} {:>10}'.format(name, 'new'))
+            continue
+
+        ratio = result['per_second'] / before['per_second']
+        slower = ratio < 1 - tolerance
+
+        if slower:
+            regressed.append(name)
+
+        print('{:<24} {:10.0f} -> {:10.0f} {}/s {:+7.1%} {:8.2f} -> {:8.2f} blocks{}'.format(
+            name, before['per_second'], result['per_second'], result['unit'], ratio - 1,
+            before.get('blocks_per_unit', 0), result['blocks_per_unit'], '  REGRESSED' if slower else ''))
+
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=4, help='input size in MB')
+    parser.add_argument('--repeat', type=int, default=5, help='timings of each case (default: 5)')
+    parser.add_argument('--min-time', type=float, default=0.2,
+                        help='seconds each timing runs a case for (default: 0.2)')
+    parser.add_argument('--case', action='append', help='run only cases starting with this, repeatable')
+    parser.add_argument('--save', help='write the results to this JSON file')
+    parser.add_argument('--compare', help='compare with the results in this JSON file')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='slowdown allowed before a case counts as regressed (default: 0.1)')
+    args = parser.parse_args()
+
+    sample = b''
+
+    for path in sorted(glob.glob(SAMPLES)):
+        with open(path, 'rb') as f:
+            sample += f.read()
+
+    inputs = Inputs(sample * max(1, args.size * 2 ** 20 // len(sample)))
+    sample = Inputs(sample)
+    results = {}
+
+    for name, case in CASES:
+        if args.case and not any(name.startswith(prefix) for prefix in args.case):
+            continue
+
+        result = results[name] = measure(case, inputs, sample, args.repeat, args.min_time)
+        print('{:<24} {:8.2f} s {:10.0f} {}/s {:8.1f} MB/s (median {:10.0f}/s) '
+              '{:8.2f} blocks {:10.2f} B each {:8.0f} peak KiB'.format(
+                  name, result['seconds'], result['per_second'], result['unit'], result['mb_per_second'],
+                  result['median_per_second'], result['blocks_per_unit'], result['bytes_per_unit'],
+                  result['peak_kib']))
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'python': platform.python_version(), 'size': len(inputs.data),
+                       'results': results}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+        print()
+
+        if compare(results, baseline['results'], args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,11 @@
 from . import misb0601
 from . import misb0102
+from .encoder import PacketEncoder
+from .mpegts import TransportStreamParser
+from .record import PacketRecord
+from .state import PacketState
+from .streamparser import AsyncStreamParser
+from .streamparser import IncrementalStreamParser
 from .streamparser import StreamParser
 
 try:
@@ -0,0 +1,3 @@
+from klvdata.cli import main
+
+main()
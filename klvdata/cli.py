@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2017 Matthew Pare (paretech@gmail.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Command line interface, installed as ``klvdata`` or run as ``python -m klvdata``.
+
+    $ klvdata decode recording.bin --jobs 8 > recording.jsonl
+    $ klvdata ingest recordings/ --format csv --output decoded/ --jobs 8
+    $ klvdata export recording.bin --format kml --decimate 10 > recording.kml
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import as_completed
+
+
+def positive(value):
+    """Return value as an integer of at least 1, for argparse."""
+    number = int(value)
+
+    if number < 1:
+        raise argparse.ArgumentTypeError('{} is not at least 1'.format(value))
+
+    return number
+
+
+def decode(args):
+    from klvdata.ingest import write_jsonl
+    from klvdata.parallel import decode_parallel
+
+    write_jsonl(decode_parallel(args.path, workers=args.jobs, resync=args.resync), args.output)
+
+
+def ingest(args):
+    from klvdata.ingest import SINKS
+    from klvdata.ingest import expand
+    from klvdata.ingest import ingest_file
+
+    paths = expand(args.inputs, args.pattern)
+
+    if not paths:
+        sys.exit('klvdata ingest: no files match {}'.format(' '.join(args.inputs)))
+
+    # Mirror the input tree below the output directory, so recordings with
+    # the same name in different directories do not collide.
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in paths])
+    _, extension = SINKS[args.format]
+    outputs = [os.path.join(args.output, os.path.relpath(os.path.abspath(path), root) + extension)
+               for path in paths]
+
+    for output in outputs:
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+
+    start = time.perf_counter()
+    total = 0
+
+    with ProcessPoolExecutor(args.jobs) as executor:
+        futures = [executor.submit(ingest_file, path, output, args.format, args.resync)
+                   for path, output in zip(paths, outputs)]
+
+        for done, future in enumerate(as_completed(futures), 1):
+            path, packets, seconds = future.result()
+            total += packets
+            print('[{}/{}] {}: {} packets in {:.2f} s ({:.0f} packets/s)'.format(
+                done, len(paths), path, packets, seconds, packets / seconds if seconds else 0),
+                file=sys.stderr)
+
+    seconds = time.perf_counter() - start
+    print('{} files, {} packets in {:.2f} s ({:.0f} packets/s)'.format(
+        len(paths), total, seconds, total / seconds if seconds else 0), file=sys.stderr)
+
+
+def export(args):
+    from klvdata.export import PROPERTIES
+    from klvdata.export import write_geojson
+    from klvdata.export import write_kml
+    from klvdata.parallel import compact
+    from klvdata.streamparser import StreamParser
+
+    write = write_kml if args.format == 'kml' else write_geojson
+
+    with StreamParser.from_path(args.path, resync=args.resync) as parser:
+        write((compact(packet) for packet in parser), args.output,
+              properties=args.property or PROPERTIES, decimate=args.decimate,
+              footprints=not args.no_footprints)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='klvdata', description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    command = commands.add_parser('decode', help='decode a recording to JSON lines, one packet per line')
+    command.add_argument('path', help='file of concatenated KLV packets')
+    command.add_argument('--jobs', '-j', type=positive, help='worker processes (default: CPU count)')
+    command.add_argument('--resync', action='store_true', help='skip over corrupted data')
+    command.add_argument('--output', '-o', type=argparse.FileType('w'), default=sys.stdout)
+    command.set_defaults(func=decode)
+
+    command = commands.add_parser('ingest', help='decode many recordings, one output file each')
+    command.add_argument('inputs', nargs='+', help='recordings, directories or globs')
+    command.add_argument('--pattern', default='*',
+                         help='files to take from directories, other than outputs and sidecars (default: *)')
+    command.add_argument('--format', '-f', choices=('jsonl', 'csv', 'columns'), default='jsonl')
+    command.add_argument('--output', '-o', default='.', help='output directory (default: .)')
+    command.add_argument('--jobs', '-j', type=positive, help='worker processes (default: CPU count)')
+    command.add_argument('--resync', action='store_true', help='skip over corrupted data')
+    command.set_defaults(func=ingest)
+
+    command = commands.add_parser('export', help='export the sensor track and footprints of a recording')
+    command.add_argument('path', help='file of concatenated KLV packets')
+    command.add_argument('--format', '-f', choices=('geojson', 'kml'), default='geojson')
+    command.add_argument('--property', '-p', type=int, action='append',
+                         help='TAG to add to each footprint, repeatable (default: 2)')
+    command.add_argument('--decimate', type=positive, default=1, help='keep every Nth track point (default: 1)')
+    command.add_argument('--no-footprints', action='store_true', help='export the sensor track only')
+    command.add_argument('--resync', action='store_true', help='skip over corrupted data')
+    command.add_argument('--output', '-o', type=argparse.FileType('w'), default=sys.stdout)
+    command.set_defaults(func=export)
+
+    args = parser.parse_args(argv)
+    args.func(args)
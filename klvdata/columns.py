@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2017 Matthew Pare (paretech@gmail.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import mmap
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from klvdata.elementparser import MappedElementParser
+from klvdata.misb0601 import PrecisionTimeStamp
+from klvdata.misb0601 import UASLocalMetadataSet
+from klvdata.streamparser import StreamParser
+
+
+def columnar_tags():
+    """Return the TAG numbers decode_columns() supports: PrecisionTimeStamp
+    and the fixed width MappedElementParser elements."""
+    return sorted(parser.TAG for parser in UASLocalMetadataSet.parsers.values()
+                  if parser is PrecisionTimeStamp or
+                  (issubclass(parser, MappedElementParser) and parser._linear_map is not None))
+
+
+def decode_columns(source, tags=None, resync=False, batch=4096):
+    """Return a dictionary of TAG to a NumPy array of that tag in every packet.
+
+    source is a path, bytes or a file-like object of ST0601 packets. tags
+    are TAG numbers or parser classes from columnar_tags(), all of them by
+    default.
+
+    Only the packets themselves are framed one by one. Packets with values
+    of the same length are stacked into a byte matrix and the elements of
+    one of them framed as a template: every packet with the same bytes at
+    the template's key and length positions has the same layout, which is
+    checked for all of them at once. The raw bytes of each tag are then
+    sliced out as a column, viewed as big-endian integers and scaled with
+    the LinearMap of the element. Packets of another layout get their own
+    template. Values are stacked batch packets at a time, so the matrices
+    stay small however long the recording is.
+
+    Mapped tags are float64 arrays, not rounded like MappedValue, with NaN
+    where a packet lacks the tag or its value is out of domain (such as
+    the reserved error indicator). PrecisionTimeStamp is a datetime64[us]
+    array with NaT where missing. Arrays have one entry per
+    UASLocalMetadataSet packet, in order.
+    """
+    return _decode_columns(source, tags, resync, batch)[0]
+
+
+def _decode_columns(source, tags=None, resync=False, batch=4096):
+    """Return decode_columns() and an array of the offset of each packet,
+    taken from the same framing pass."""
+    if tags is None:
+        tags = columnar_tags()
+
+    keys = UASLocalMetadataSet.tag_keys(tags)
+    supported = {bytes((tag,)) for tag in columnar_tags()}
+
+    if not keys <= supported:
+        raise ValueError('Tags {} are not fixed width numeric tags'.format(
+            sorted(key[0] for key in keys - supported)))
+
+    parsers = UASLocalMetadataSet._tags
+    tags = sorted(key[0] for key in keys)
+
+    with _open(source, resync) as parser:
+        data = parser.source
+        framer = parser.iter_stream
+
+        # Start offsets of the values of each length, and their packet rows.
+        groups = {}
+        offsets = []
+        count = 0
+
+        for key, value in framer:
+            if key != UASLocalMetadataSet.key:
+                continue
+
+            offsets.append(framer.offset)
+            offset = framer.offset + len(key) + 1
+            byte_length = data[offset - 1]
+
+            if byte_length >= 128:
+                offset += byte_length - 128
+
+            starts, rows = groups.setdefault(len(value), ([], []))
+            starts.append(offset)
+            rows.append(count)
+            count += 1
+
+        columns = {tag: _empty(parsers[tag], count) for tag in tags}
+
+        if count:
+            data = np.frombuffer(data, dtype=np.uint8)
+
+        for length, (starts, rows) in groups.items():
+            for first in range(0, len(starts), batch):
+                matrix = _rows(data, starts[first:first + batch], length)
+                _fill(columns, parsers, matrix, np.array(rows[first:first + batch]))
+
+    return columns, np.array(offsets, dtype=np.uint64)
+
+
+def verify_packets(source, resync=False, batch=4096):
+    """Return a boolean array, True for each UASLocalMetadataSet packet of
+    source that ends with a matching Checksum element.
+
+    source is a path, bytes or a file-like object of ST0601 packets, with
+    one entry per packet as in decode_columns(). Packets are checked batch
+    at a time: those of the same length are stacked into a byte matrix and
+    the high and low bytes of their 16 bit words summed along the rows, so
+    thousands of packets are verified with a few array operations.
+    """
+    with _open(source, resync) as parser:
+        data = parser.source
+        framer = parser.iter_stream
+
+        # Start offsets of the packets of each length, and their rows.
+        groups = {}
+        count = 0
+
+        for key, value in framer:
+            if key != UASLocalMetadataSet.key:
+                continue
+
+            byte_length = data[framer.offset + len(key)]
+            header = len(key) + 1 + (byte_length - 128 if byte_length >= 128 else 0)
+
+            starts, rows = groups.setdefault(header + len(value), ([], []))
+            starts.append(framer.offset)
+            rows.append(count)
+            count += 1
+
+        verified = np.zeros(count, dtype=bool)
+
+        if count:
+            data = np.frombuffer(data, dtype=np.uint8)
+
+        for length, (starts, rows) in groups.items():
+            # Packets too short to hold a Checksum element fail.
+            if length < len(UASLocalMetadataSet.key) + 5:
+                continue
+
+            for first in range(0, len(starts), batch):
+                matrix = _rows(data, starts[first:first + batch], length)
+                verified[rows[first:first + batch]] = _checksums_match(matrix)
+
+    return verified
+
+
+def _rows(data, starts, length):
+    """Return the length bytes of data from each of starts as the rows of a
+    matrix, copied through a strided view without an index per byte."""
+    return sliding_window_view(data, length)[starts]
+
+
+def _checksums_match(matrix):
+    """Return which packets, the rows of matrix, end with their checksum."""
+    end = matrix.shape[1] - 2
+
+    # An odd last byte is the high byte of a word.
+    words = (matrix[:, 0:end:2].sum(axis=1, dtype=np.uint64) << np.uint64(8)) + \
+        matrix[:, 1:end:2].sum(axis=1, dtype=np.uint64)
+    checksums = (words & np.uint64(0xFFFF)).astype(np.uint16)
+    stored = (matrix[:, end].astype(np.uint16) << 8) | matrix[:, end + 1]
+
+    return (matrix[:, end - 2] == 1) & (matrix[:, end - 1] == 2) & (checksums == stored)
+
+
+def _open(source, resync):
+    """Return a buffered StreamParser over source, a path, bytes or file."""
+    # os.PathLike needs Python 3.6.
+    if isinstance(source, str) or hasattr(source, '__fspath__'):
+        return StreamParser.from_path(source, resync=resync)
+    elif isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+        return StreamParser(source, buffered=True, resync=resync)
+
+    return StreamParser(source.read(), buffered=True, resync=resync)
+
+
+def _empty(parser, count):
+    """Return a column of count missing values of parser."""
+    if parser is PrecisionTimeStamp:
+        return np.full(count, np.datetime64('NaT'), dtype='datetime64[us]')
+
+    return np.full(count, np.nan)
+
+
+def _layout(value):
+    """Return the header positions of the elements of a set value and the
+    position and length of the value of each tag."""
+    headers = []
+    tags = {}
+    pos, end = 0, len(value)
+
+    while pos + 1 < end:
+        tag, byte_length = value[pos], value[pos + 1]
+        header = pos + 2
+
+        if byte_length >= 128:
+            header += byte_length - 128
+            byte_length = int.from_bytes(value[pos + 2:header], byteorder='big')
+
+        headers.extend(range(pos, min(header, end)))
+        tags[tag] = header, min(byte_length, max(end - header, 0))
+        pos = header + byte_length
+
+    return headers, tags
+
+
+def _fill(columns, parsers, matrix, rows):
+    """Set the rows of columns from matrix, the values of one length."""
+    while len(rows):
+        headers, layout = _layout(matrix[0].tobytes())
+        same = (matrix[:, headers] == matrix[0, headers]).all(axis=1)
+
+        for tag, column in columns.items():
+            if tag not in layout:
+                continue
+
+            start, length = layout[tag]
+            parser = parsers[tag]
+            width = 8 if parser is PrecisionTimeStamp else parser._linear_map.length
+
+            # Values of other widths are left missing.
+            if length == width:
+                column[rows[same]] = _convert(parser, matrix[same, start:start + width])
+
+        matrix, rows = matrix[~same], rows[~same]
+
+
+def _convert(parser, raw):
+    """Return the values of parser from raw, a matrix of value bytes."""
+    if parser is PrecisionTimeStamp:
+        return np.ascontiguousarray(raw).view('>u8').ravel().astype(np.int64).astype('datetime64[us]')
+
+    linear_map = parser._linear_map
+    dtype = '>{}{}'.format('i' if linear_map.signed else 'u', linear_map.length)
+
+    raw = np.ascontiguousarray(raw).view(dtype).ravel().astype(np.float64)
+    values = linear_map.slope * (raw - linear_map.src_min) + linear_map.dst_min
+    values[(raw < linear_map.src_min) | (raw > linear_map.src_max)] = np.nan
+
+    return values
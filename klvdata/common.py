@@ -23,10 +23,10 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+from collections import namedtuple
 from datetime import datetime
 from datetime import timezone
 from struct import pack
-from struct import unpack
 
 
 def datetime_to_bytes(value):
@@ -123,6 +123,53 @@ def linear_map(src_value, src_domain, dst_range):
     return dst_value
 
 
+class LinearMap(namedtuple('LinearMap', ('signed', 'length', 'src_min', 'src_max',
+                                         'dst_min', 'dst_max', 'slope', 'inverse'))):
+    """Precomputed linear_map() of fixed point values onto a range.
+
+    Signedness, byte width, slope and inverse slope of a _domain and _range
+    pair are worked out once, leaving only the conversion and range checks
+    per value.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def compile(cls, _domain, _range):
+        """Return the map of fixed point _domain onto float _range."""
+        src_min, src_max = _domain
+        dst_min, dst_max = _range
+        length = (src_max - src_min).bit_length() // 8 or 1
+
+        return cls(src_min < 0, length, src_min, src_max, dst_min, dst_max,
+                   (dst_max - dst_min) / (src_max - src_min),
+                   (src_max - src_min) / (dst_max - dst_min))
+
+    def to_float(self, value):
+        """Return bytes value mapped onto the range, as bytes_to_float()."""
+        src_value = int.from_bytes(value, byteorder='big', signed=self.signed)
+
+        if not (self.src_min <= src_value <= self.src_max):
+            raise ValueError
+
+        dst_value = self.slope * (src_value - self.src_min) + self.dst_min
+
+        if not (self.dst_min <= dst_value <= self.dst_max):
+            raise ValueError
+
+        return dst_value
+
+    def from_float(self, value):
+        """Return the fixed point bytes of a float in the range, as float_to_bytes()."""
+        # Rounded before the domain check, as the range endpoints can map a
+        # float error beyond the domain endpoints.
+        src_value = round(self.inverse * (value - self.dst_min) + self.src_min)
+
+        if not (self.src_min <= src_value <= self.src_max):
+            raise ValueError
+
+        return src_value.to_bytes(self.length, byteorder='big', signed=self.signed)
+
+
 def bytes_to_float(value, _domain, _range):
     """Convert the fixed point value self.value to a floating point value."""
     src_value = int().from_bytes(value, byteorder='big', signed=(min(_domain) < 0))
@@ -142,13 +189,15 @@ def float_to_bytes(value, _domain, _range):
 
 
 def packet_checksum(data):
-    """Return two byte checksum from a SMPTE ST 336 KLV structured bytes object."""
-    length = len(data) - 2
-    word_size, mod = divmod(length, 2)
+    """Return two byte checksum from a SMPTE ST 336 KLV structured bytes object.
 
-    words = sum(unpack(">{:d}H".format(word_size), data[0:length - mod]))
+    The checksum is the sum of the big-endian 16 bit words of the packet
+    up to the checksum value itself. The high and low bytes of the words
+    are summed separately as strided slices, without unpacking each word.
+    An odd last byte is the high byte of a word.
+    """
+    length = len(data) - 2
 
-    if mod:
-        words += data[length - 1] << 8
+    words = (sum(data[0:length:2]) << 8) + sum(data[1:length:2])
 
     return pack('>H', words & 0xFFFF)
@@ -23,7 +23,6 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from abc import ABCMeta
 from abc import abstractmethod
 
 from klvdata.common import ber_encode
@@ -31,7 +30,21 @@ from klvdata.common import ber_encode
 # Proposed alternate names, "BaseElement" of modules "bases".
 
 
-class Element():
+class SlotsMeta(type):
+    """Metaclass giving each class that does not declare __slots__ empty ones.
+
+    Instances then only hold the slots declared up their hierarchy, with no
+    per-instance __dict__, while the many element definitions stay plain
+    class statements with their constants (key, TAG, names, _domain and
+    _range) kept on the class.
+    """
+
+    def __new__(mcs, name, bases, namespace, **kwargs):
+        namespace.setdefault('__slots__', ())
+        return super().__new__(mcs, name, bases, namespace, **kwargs)
+
+
+class Element(metaclass=SlotsMeta):
     """Construct a key, length, value tuplet.
 
     Elements provide the basic mechanisms to constitute the basic encoding
@@ -46,8 +59,11 @@ class Element():
     Properties:
         name: If name is set return name, else return class name.
         length: Length is calculated based off value.
+
+    Subclasses that define key on the class only set value, see
+    ElementParser.
     """
-    __metaclass__ = ABCMeta
+    __slots__ = ('key', 'value')
 
     def __init__(self, key, value):
         self.key = key
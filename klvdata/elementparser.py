@@ -26,7 +26,8 @@
 from abc import ABCMeta
 from abc import abstractmethod
 
-from klvdata.common import (bytes_to_datetime,
+from klvdata.common import (LinearMap,
+                                     bytes_to_datetime,
                                      bytes_to_float,
                                      bytes_to_hexstr,
                                      bytes_to_int,
@@ -35,6 +36,7 @@ from klvdata.common import (bytes_to_datetime,
                                      float_to_bytes,
                                      str_to_bytes)
 from klvdata.element import Element
+from klvdata.element import SlotsMeta
 
 
 class ElementParser(Element):
@@ -52,7 +54,8 @@ class ElementParser(Element):
     __metaclass__ = ABCMeta
 
     def __init__(self, value):
-        super().__init__(self.key, value)
+        # key is a class attribute of every element parser.
+        self.value = value
 
     @property
     @classmethod
@@ -65,10 +68,9 @@ class ElementParser(Element):
         return '{}({})'.format(self.name, bytes(self.value))
 
 
-class BaseValue():
-    __metaclass__ = ABCMeta
-
+class BaseValue(metaclass=SlotsMeta):
     """Abstract base class (superclass) used to insure internal interfaces are maintained."""
+    __slots__ = ('value',)
 
     @abstractmethod
     def __bytes__(self):
@@ -147,8 +149,18 @@ class StringValue(BaseValue):
 class MappedElementParser(ElementParser):
     __metaclass__ = ABCMeta
 
+    # LinearMap of _domain onto _range, set by prepare() on registration.
+    _linear_map = None
+
     def __init__(self, value):
-        super().__init__(MappedValue(value, self._domain, self._range))
+        super().__init__(MappedValue(value, self._domain, self._range, self._linear_map))
+
+    @classmethod
+    def prepare(cls):
+        """Precompute the LinearMap of the element, called by SetParser.add_parser."""
+        # Elements that do not define _domain and _range keep raw values.
+        if isinstance(cls._domain, tuple) and isinstance(cls._range, tuple):
+            cls._linear_map = LinearMap.compile(cls._domain, cls._range)
 
     @property
     @classmethod
@@ -164,14 +176,19 @@ class MappedElementParser(ElementParser):
 
 
 class MappedValue(BaseValue):
+    # _domain and _range refer to the tuples of the element class.
+    __slots__ = ('_domain', '_range')
 
-    def __init__(self, value, _domain, _range):
+    def __init__(self, value, _domain, _range, _linear_map=None):
         self._domain = _domain
         self._range = _range
 
         try:
-            self.value = round(bytes_to_float(
-                value, self._domain, self._range), 4)
+            if _linear_map is not None:
+                self.value = round(_linear_map.to_float(value), 4)
+            else:
+                self.value = round(bytes_to_float(
+                    value, self._domain, self._range), 4)
         except TypeError:
             self.value = value
 
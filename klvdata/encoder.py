@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2017 Matthew Pare (paretech@gmail.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from struct import Struct
+
+from klvdata.common import ber_encode
+from klvdata.common import int_to_bytes
+from klvdata.common import packet_checksum
+from klvdata.common import str_to_bytes
+from klvdata.elementparser import BytesElementParser
+from klvdata.elementparser import DateTimeElementParser
+from klvdata.elementparser import MappedElementParser
+from klvdata.elementparser import StringElementParser
+from klvdata.misb0601 import Checksum
+from klvdata.misb0601 import UASLocalMetadataSet
+from klvdata.setparser import SetParser
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECONDS = Struct('>Q')
+
+
+def datetime_to_microseconds(value):
+    """Return bytes of a datetime, taken as UTC if naive, or of an integer
+    number of microseconds since the epoch."""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+
+        # Unlike datetime_to_bytes, exact to the microsecond.
+        value = (value - _EPOCH) // timedelta(microseconds=1)
+
+    return _MICROSECONDS.pack(value)
+
+
+def bytes_value(value):
+    """Return bytes of an integer, in as few bytes as it fits, or of bytes."""
+    if isinstance(value, int):
+        return int_to_bytes(value, max((value.bit_length() + 7) // 8, 1))
+
+    return bytes(value)
+
+
+class PacketEncoder(object):
+    """Encode the packets of a set, ST0601 by default, from values.
+
+    Values are a mapping of element TAG numbers, parser class names or keys
+    to values, or a record of the set as returned by SetParser.record().
+    Values are those decoded by the parsers: float for mapped elements, str,
+    datetime (or microseconds since the epoch), int for bytes elements and
+    records or mappings for nested sets. Raw bytes are accepted for elements
+    without a _domain and _range. None values are left out.
+
+    The key, BER length and conversion of each element are worked out once,
+    when the encoder is created. Elements are written in key order. If
+    checksum is True, a Checksum element is computed and written last as
+    required by ST0601, and any Checksum value given is ignored.
+    """
+
+    def __init__(self, set_parser=UASLocalMetadataSet, checksum=True):
+        self.set_parser = set_parser
+        self.key = bytes(set_parser.key)
+        self.checksum = checksum
+
+        # Key of each TAG, name and key, as accepted in mappings.
+        self._keys = {}
+
+        # Header and conversion of the value of each key. The header is the
+        # key and BER length of fixed length elements, None otherwise.
+        self._encoders = {}
+
+        for key, parser in set_parser.parsers.items():
+            key = bytes(key)
+
+            if checksum and key == Checksum.key:
+                continue
+
+            self._keys[key] = self._keys[parser.__name__] = key
+
+            if hasattr(parser, 'TAG'):
+                self._keys[parser.TAG] = key
+
+            self._encoders[key] = self._encoder(key, parser)
+
+        # Keys in the order elements are written.
+        self._order = tuple(sorted(self._encoders))
+
+        # Keys of the fields of the record type, which are in key order.
+        record_type = set_parser.record_type
+        self._record_type = record_type
+        self._record_keys = () if record_type is None else tuple(
+            self._keys.get(name) for name in record_type._fields)
+
+    @staticmethod
+    def _encoder(key, parser):
+        """Return the header and conversion of values of parser."""
+        if issubclass(parser, SetParser):
+            return None, PacketEncoder(parser, checksum=False).encode_value
+        elif issubclass(parser, MappedElementParser) and parser._linear_map is not None:
+            linear_map = parser._linear_map
+            return key + ber_encode(linear_map.length), linear_map.from_float
+        elif issubclass(parser, DateTimeElementParser):
+            return key + ber_encode(_MICROSECONDS.size), datetime_to_microseconds
+        elif issubclass(parser, StringElementParser):
+            return None, str_to_bytes
+        elif issubclass(parser, BytesElementParser):
+            return None, bytes_value
+
+        return None, bytes
+
+    def _items(self, values):
+        """Return key, value pairs of values in key order."""
+        if isinstance(values, self._record_type or ()):
+            return zip(self._record_keys, values)
+
+        keys = self._keys
+        given = {}
+
+        for name, value in values.items():
+            try:
+                given[keys[name]] = value
+            except KeyError:
+                if self.checksum and name in (Checksum.TAG, Checksum.__name__, Checksum.key):
+                    continue
+
+                raise KeyError('{} has no element {!r}'.format(self.set_parser.__name__, name))
+
+        return [(key, given[key]) for key in self._order if key in given]
+
+    def encode_value(self, values):
+        """Return the encoded elements of values, without the set key and
+        length or a Checksum element."""
+        encoders = self._encoders
+        elements = []
+
+        for key, value in self._items(values):
+            # Fields of missing elements, and of the Checksum, are left out.
+            if value is None or key is None:
+                continue
+
+            header, convert = encoders[key]
+            value = convert(value)
+            elements.append(header + value if header else key + ber_encode(len(value)) + value)
+
+        return b''.join(elements)
+
+    def encode(self, values):
+        """Return a complete packet of values: the set key, BER length and
+        elements, ending with the Checksum if enabled."""
+        value = self.encode_value(values)
+
+        if not self.checksum:
+            return self.key + ber_encode(len(value)) + value
+
+        packet = bytearray(self.key)
+        packet += ber_encode(len(value) + 4)
+        packet += value
+
+        # The checksum covers the whole packet up to its own value.
+        packet += Checksum.key + b'\x02\x00\x00'
+        packet[-2:] = packet_checksum(packet)
+
+        return bytes(packet)
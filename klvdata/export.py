@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2017 Matthew Pare (paretech@gmail.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import json
+import shutil
+import tempfile
+from xml.sax.saxutils import escape
+
+from klvdata.geometry import footprint_ring
+from klvdata.ingest import tags
+from klvdata.ingest import to_json
+
+# Latitude and longitude TAGs of the sensor position.
+SENSOR_TAGS = (13, 14)
+
+# Properties of each footprint by default: the PrecisionTimeStamp.
+PROPERTIES = (2,)
+
+
+def sensor_position(record):
+    """Return the (longitude, latitude) of the sensor of record, or None."""
+    lat, lon = (record.get(tag) for tag in SENSOR_TAGS)
+
+    return None if lat is None or lon is None else (lon, lat)
+
+
+def _properties(record, properties):
+    """Return the values of properties, LDSName by TAG, in record."""
+    return {name: record.get(tag) for tag, name in properties.items()}
+
+
+def _names(properties):
+    """Return properties, TAG numbers, as a dictionary of TAG to LDSName."""
+    names = dict(tags())
+
+    return {tag: names.get(tag, str(tag)) for tag in properties}
+
+
+class _Track(object):
+    """Sensor positions spooled to a temporary file, so the track of any
+    length recording is held in constant memory until it is written."""
+
+    def __init__(self, decimate, separator, format):
+        if decimate < 1:
+            raise ValueError('decimate must be at least 1')
+
+        self.decimate = decimate
+        self.separator = separator
+        self.format = format
+        self.count = 0
+        self.points = 0
+        self.file = tempfile.TemporaryFile('w+')
+
+    def add(self, record):
+        position = sensor_position(record)
+
+        if position is None:
+            return
+
+        if self.count % self.decimate == 0:
+            if self.points:
+                self.file.write(self.separator)
+
+            self.file.write(self.format(position))
+            self.points += 1
+
+        self.count += 1
+
+    def copy(self, f):
+        """Write the spooled positions to f and release them."""
+        self.file.seek(0)
+        shutil.copyfileobj(self.file, f)
+        self.file.close()
+
+
+def write_geojson(records, f, properties=PROPERTIES, decimate=1, footprints=True):
+    """Write records as a GeoJSON FeatureCollection, feature by feature.
+
+    records are dictionaries of TAG to value, such as parallel.compact() of
+    each packet from a StreamParser. Each record with a footprint, if
+    footprints is True, is written as a Polygon feature as soon as it is
+    read, with properties, TAG numbers, named by LDSName. The sensor track
+    follows as a LineString feature of every decimate-th sensor position.
+    Memory use does not grow with the number of records.
+    """
+    track = _Track(decimate, ',', lambda position: json.dumps(list(position)))
+    properties = _names(properties)
+    features = 0
+
+    f.write('{"type": "FeatureCollection", "features": [\n')
+
+    try:
+        for record in records:
+            track.add(record)
+            ring = footprint_ring(record) if footprints else None
+
+            if ring is None:
+                continue
+
+            feature = {'type': 'Feature',
+                       'geometry': {'type': 'Polygon', 'coordinates': [[list(point) for point in ring]]},
+                       'properties': _properties(record, properties)}
+
+            if features:
+                f.write(',\n')
+
+            json.dump(feature, f, default=to_json)
+            features += 1
+
+        if track.points >= 2:
+            if features:
+                f.write(',\n')
+
+            f.write('{"type": "Feature", "properties": {"name": "Sensor track"}, '
+                    '"geometry": {"type": "LineString", "coordinates": [')
+            track.copy(f)
+            f.write(']}}')
+    finally:
+        track.file.close()
+
+    f.write('\n]}\n')
+
+
+def write_kml(records, f, properties=PROPERTIES, decimate=1, footprints=True):
+    """Write records as a KML document, placemark by placemark.
+
+    As write_geojson(): footprints are Polygon placemarks with properties
+    as ExtendedData, followed by the sensor track as a LineString.
+    """
+    track = _Track(decimate, ' ', lambda position: '{!r},{!r}'.format(*position))
+    properties = _names(properties)
+
+    f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<kml xmlns="http://www.opengis.net/kml/2.2">\n<Document>\n')
+
+    try:
+        for record in records:
+            track.add(record)
+            ring = footprint_ring(record) if footprints else None
+
+            if ring is None:
+                continue
+
+            data = ''.join('<Data name="{}"><value>{}</value></Data>'.format(
+                escape(name, {'"': '&quot;'}), escape(_kml_value(value)))
+                for name, value in _properties(record, properties).items())
+            coordinates = ' '.join('{!r},{!r}'.format(*point) for point in ring)
+
+            f.write('<Placemark><ExtendedData>{}</ExtendedData><Polygon><outerBoundaryIs><LinearRing>'
+                    '<coordinates>{}</coordinates></LinearRing></outerBoundaryIs></Polygon></Placemark>\n'
+                    .format(data, coordinates))
+
+        if track.points >= 2:
+            f.write('<Placemark><name>Sensor track</name><LineString><coordinates>')
+            track.copy(f)
+            f.write('</coordinates></LineString></Placemark>\n')
+    finally:
+        track.file.close()
+
+    f.write('</Document>\n</kml>\n')
+
+
+def _kml_value(value):
+    """Return value as KML text."""
+    if value is None:
+        return ''
+
+    try:
+        return to_json(value)
+    except TypeError:
+        return str(value)
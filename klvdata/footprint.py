@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2017 Matthew Pare (paretech@gmail.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import numpy as np
+
+from klvdata.columns import decode_columns
+from klvdata.geometry import FOOTPRINT_TAGS
+from klvdata.geometry import FRAME_CENTER_TAGS
+from klvdata.geometry import FULL_CORNER_TAGS
+from klvdata.geometry import OFFSET_CORNER_TAGS
+from klvdata.geometry import counter_clockwise
+
+
+def corners(columns):
+    """Return the latitudes and longitudes of the corners of the image
+    footprint of each packet, as two N x 4 arrays.
+
+    columns are the arrays of decode_columns() holding FOOTPRINT_TAGS.
+    Corners are points 1 to 4 of ST0601. Rows with all four full corners
+    (tags 82 to 89) take them, other rows add the offset corners (tags 26
+    to 33) to the frame center (tags 23 and 24). Rows with neither are
+    NaN. Longitudes are wrapped into [-180, 180).
+    """
+    def stack(tags, part):
+        return np.stack([np.asarray(columns[pair[part]], dtype=np.float64) for pair in tags], axis=1)
+
+    full_latitudes, full_longitudes = stack(FULL_CORNER_TAGS, 0), stack(FULL_CORNER_TAGS, 1)
+
+    latitudes = columns[FRAME_CENTER_TAGS[0]][:, np.newaxis] + stack(OFFSET_CORNER_TAGS, 0)
+    longitudes = columns[FRAME_CENTER_TAGS[1]][:, np.newaxis] + stack(OFFSET_CORNER_TAGS, 1)
+
+    full = ~(np.isnan(full_latitudes) | np.isnan(full_longitudes)).any(axis=1)
+    latitudes[full] = full_latitudes[full]
+    longitudes[full] = full_longitudes[full]
+
+    # Offsets from a frame center near the antimeridian may cross it.
+    longitudes = (longitudes + 180) % 360 - 180
+
+    return latitudes, longitudes
+
+
+def footprints(source, resync=False):
+    """Return corners() of the packets of source, a path, bytes or a
+    file-like object of ST0601 packets."""
+    return corners(decode_columns(source, tags=FOOTPRINT_TAGS, resync=resync))
+
+
+def _rings(latitudes, longitudes):
+    """Generate the closed, counter clockwise ring of (longitude, latitude)
+    pairs of each footprint, or None where it has missing corners."""
+    missing = (np.isnan(latitudes) | np.isnan(longitudes)).any(axis=1)
+
+    for lats, lons, skip in zip(latitudes.tolist(), longitudes.tolist(), missing.tolist()):
+        yield None if skip else counter_clockwise(list(zip(lons + lons[:1], lats + lats[:1])))
+
+
+def to_wkt(latitudes, longitudes):
+    """Return a WKT POLYGON of each footprint of corners(), None where it
+    has missing corners."""
+    return [None if ring is None else
+            'POLYGON (({}))'.format(', '.join('{!r} {!r}'.format(*point) for point in ring))
+            for ring in _rings(latitudes, longitudes)]
+
+
+def to_geojson(latitudes, longitudes):
+    """Return a GeoJSON Polygon geometry of each footprint of corners(),
+    None where it has missing corners."""
+    return [None if ring is None else {'type': 'Polygon', 'coordinates': [[list(point) for point in ring]]}
+            for ring in _rings(latitudes, longitudes)]
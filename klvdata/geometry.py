@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2017 Matthew Pare (paretech@gmail.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Image footprint tags and geometry shared by footprint and export, in
+pure Python so that export does not need NumPy."""
+
+FRAME_CENTER_TAGS = (23, 24)
+
+# Latitude and longitude tags of corner points 1 to 4, as offsets from
+# the frame center and as full coordinates.
+OFFSET_CORNER_TAGS = ((26, 27), (28, 29), (30, 31), (32, 33))
+FULL_CORNER_TAGS = ((82, 83), (84, 85), (86, 87), (88, 89))
+
+FOOTPRINT_TAGS = tuple(sorted(FRAME_CENTER_TAGS + sum(OFFSET_CORNER_TAGS + FULL_CORNER_TAGS, ())))
+
+
+def counter_clockwise(ring):
+    """Return a closed ring of (longitude, latitude) pairs running counter
+    clockwise, as RFC 7946 requires of polygon exterior rings.
+
+    ST0601 numbers the corners clockwise, so rings of them are reversed.
+    The orientation is that of the signed area, with longitudes taken
+    relative to the first point so rings crossing the antimeridian are
+    oriented too.
+    """
+    origin = ring[0][0]
+    points = [((lon - origin + 180) % 360 - 180, lat) for lon, lat in ring]
+    area = sum(x0 * y1 - x1 * y0 for (x0, y0), (x1, y1) in zip(points, points[1:]))
+
+    return ring[::-1] if area < 0 else ring
+
+
+def footprint_ring(values):
+    """Return the closed, counter clockwise ring of (longitude, latitude)
+    corners of the image footprint of one packet, or None.
+
+    values maps TAG to value, such as parallel.compact() of a packet. As
+    in footprint.corners(), which does the same for arrays of packets, the
+    full corners are taken if all are present, else the offset corners are
+    added to the frame center.
+    """
+    points = [(values.get(lon), values.get(lat)) for lat, lon in FULL_CORNER_TAGS]
+
+    if any(None in point for point in points):
+        center_lat, center_lon = (values.get(tag) for tag in FRAME_CENTER_TAGS)
+        offsets = [(values.get(lon), values.get(lat)) for lat, lon in OFFSET_CORNER_TAGS]
+
+        if center_lat is None or center_lon is None or any(None in offset for offset in offsets):
+            return None
+
+        # Offsets from a frame center near the antimeridian may cross it.
+        points = [((center_lon + lon + 180) % 360 - 180, center_lat + lat) for lon, lat in offsets]
+
+    return counter_clockwise(points + points[:1])
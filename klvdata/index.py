@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2017 Matthew Pare (paretech@gmail.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import contextlib
+import os
+import sys
+import tempfile
+from array import array
+from collections import namedtuple
+from struct import Struct
+
+from klvdata.misb0601 import UASLocalMetadataSet
+from klvdata.streamparser import StreamParser
+
+# Timestamp column value of packets without a PrecisionTimeStamp.
+NO_TIMESTAMP = 2 ** 64 - 1
+
+IndexEntry = namedtuple('IndexEntry', ('offset', 'length', 'key', 'timestamp'))
+
+# Suffixes of sidecar files, and of the temporary files they are written to.
+SIDECAR_SUFFIXES = ('.klvidx', '.klvgeo', '.partial')
+
+
+class Sidecar(object):
+    """Base of indexes of a file saved to a sidecar file next to it.
+
+    Subclasses set suffix and implement build(path, resync), load(path) and
+    _write(f). size, mtime and resync record the file and framing the index
+    was built from, so open() can tell whether a saved sidecar is current.
+    """
+    suffix = None
+
+    def save(self, path):
+        """Write the index to the sidecar file at path."""
+        # Write to a file of its own beside the destination and move it into
+        # place, so neither a reader nor a concurrent writer ever sees a
+        # partially written sidecar.
+        directory, name = os.path.split(path)
+        fd, partial = tempfile.mkstemp(suffix='.partial', prefix=name + '.', dir=directory or '.')
+
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                self._write(f)
+
+            os.replace(partial, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(partial)
+            raise
+
+    @classmethod
+    def open(cls, path, resync=False):
+        """Return the index of the file at path, reusing its sidecar if current.
+
+        A sidecar is current if it was built with the same resync from a file
+        of the same size and modification time. A missing or stale sidecar is
+        rebuilt and saved, unless the directory is not writable, in which
+        case the index is only kept in memory.
+        """
+        sidecar = path + cls.suffix
+        stat = os.stat(path)
+
+        try:
+            index = cls.load(sidecar)
+
+            if (index.size, index.mtime, index.resync) == (stat.st_size, stat.st_mtime_ns, resync):
+                return index
+        except (OSError, ValueError):
+            pass
+
+        index = cls.build(path, resync=resync)
+
+        try:
+            index.save(sidecar)
+        except OSError:
+            pass
+
+        return index
+
+
+class PacketIndex(Sidecar):
+    """Offset, length, key and raw PrecisionTimeStamp of each packet in a file.
+
+    The index is built with a single framing pass over the file, without
+    decoding any elements, and can be saved to a compact binary sidecar
+    file next to it. PacketIndex.open() reuses the sidecar for as long as
+    the size and modification time of the file, and resync, still match.
+
+    Columns are kept as arrays: offsets, lengths (of the whole packet),
+    key_ids (positions in keys) and timestamps (microseconds since the
+    epoch, NO_TIMESTAMP when the packet has none).
+    """
+    suffix = '.klvidx'
+
+    # Sidecar header: magic, version, file size, file mtime in nanoseconds,
+    # resync, key count and packet count. Keys and columns follow, little
+    # endian.
+    _header = Struct('<6sHQQ?II')
+    _magic = b'KLVIDX'
+    _version = 2
+
+    def __init__(self, size=0, mtime=0, resync=False):
+        self.size = size
+        self.mtime = mtime
+        self.resync = resync
+        self.keys = []
+        self.offsets = array('Q')
+        self.lengths = array('I')
+        self.key_ids = array('H')
+        self.timestamps = array('Q')
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, i):
+        timestamp = self.timestamps[i]
+
+        return IndexEntry(self.offsets[i], self.lengths[i], self.keys[self.key_ids[i]],
+                          None if timestamp == NO_TIMESTAMP else timestamp)
+
+    def _columns(self):
+        return self.offsets, self.lengths, self.key_ids, self.timestamps
+
+    @classmethod
+    def build(cls, path, resync=False):
+        """Return a new index of the packets in the file at path.
+
+        If resync is True, packets are located as by StreamParser with
+        resync=True.
+        """
+        stat = os.stat(path)
+        index = cls(stat.st_size, stat.st_mtime_ns, resync)
+        key_ids = {}
+
+        with StreamParser.from_path(path, resync=resync) as parser:
+            data, framer = parser.source, parser.iter_stream
+
+            for key, value in framer:
+                offset = framer.offset
+                byte_length = data[offset + len(key)]
+                header = len(key) + 1 + (byte_length - 128 if byte_length >= 128 else 0)
+
+                timestamp = None
+
+                if key == UASLocalMetadataSet.key:
+                    timestamp = UASLocalMetadataSet.read_timestamp(value)
+
+                key = bytes(key)
+
+                if key not in key_ids:
+                    key_ids[key] = len(index.keys)
+                    index.keys.append(key)
+
+                index.offsets.append(offset)
+                index.lengths.append(header + len(value))
+                index.key_ids.append(key_ids[key])
+                index.timestamps.append(NO_TIMESTAMP if timestamp is None else timestamp)
+
+        return index
+
+    @classmethod
+    def load(cls, path):
+        """Return the index saved in the sidecar file at path.
+
+        Raise ValueError if the file is not a valid sidecar.
+        """
+        with open(path, 'rb') as f:
+            header = f.read(cls._header.size)
+
+            if len(header) != cls._header.size:
+                raise ValueError('Truncated index header')
+
+            magic, version, size, mtime, resync, key_count, count = cls._header.unpack(header)
+
+            if magic != cls._magic or version != cls._version:
+                raise ValueError('Not a version {} packet index'.format(cls._version))
+
+            index = cls(size, mtime, resync)
+            index.keys = [f.read(16) for _ in range(key_count)]
+
+            try:
+                for column in index._columns():
+                    column.fromfile(f, count)
+            except EOFError:
+                raise ValueError('Truncated index columns')
+
+        if sys.byteorder == 'big':
+            for column in index._columns():
+                column.byteswap()
+
+        return index
+
+    def _write(self, f):
+        columns = self._columns()
+
+        if sys.byteorder == 'big':
+            columns = [array(column.typecode, column) for column in columns]
+
+            for column in columns:
+                column.byteswap()
+
+        f.write(self._header.pack(self._magic, self._version, self.size, self.mtime,
+                                  self.resync, len(self.keys), len(self)))
+
+        for key in self.keys:
+            f.write(key)
+
+        for column in columns:
+            column.tofile(f)
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2017 Matthew Pare (paretech@gmail.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import csv
+import glob
+import json
+import os
+import time
+from datetime import datetime
+
+from klvdata.index import SIDECAR_SUFFIXES
+from klvdata.misb0601 import UASLocalMetadataSet
+from klvdata.mpegts import TransportStreamParser
+from klvdata.parallel import compact
+from klvdata.streamparser import StreamParser
+
+# Extensions of files read as MPEG-2 transport streams instead of raw KLV.
+TS_EXTENSIONS = ('.ts', '.m2t', '.mpg', '.mpeg')
+
+
+def to_json(value):
+    """Return value in a form the json module can encode."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    elif isinstance(value, bytes):
+        return value.hex()
+
+    raise TypeError('{} is not JSON serializable'.format(type(value).__name__))
+
+
+def tags():
+    """Return the TAG and LDSName of the UAS Local Set elements, by TAG."""
+    elements = (parser for parser in UASLocalMetadataSet.parsers.values() if hasattr(parser, 'TAG'))
+
+    return sorted((parser.TAG, parser.LDSName) for parser in elements)
+
+
+def write_jsonl(records, f):
+    """Write each record as a JSON object on its own line."""
+    for record in records:
+        json.dump(record, f, default=to_json)
+        f.write('\n')
+
+
+def write_csv(records, f):
+    """Write records as CSV rows with a column per tag, headed by LDSName."""
+    columns = tags()
+    writer = csv.writer(f)
+    writer.writerow(name for _, name in columns)
+
+    for record in records:
+        writer.writerow(csv_value(record.get(tag)) for tag, _ in columns)
+
+
+def csv_value(value):
+    """Return value as written to a CSV cell."""
+    if value is None:
+        return ''
+    elif isinstance(value, (datetime, bytes)):
+        return to_json(value)
+
+    return value
+
+
+def write_columns(records, f):
+    """Write records as a JSON object of a list per tag, null where absent."""
+    columns = {tag: [] for tag, _ in tags()}
+
+    for record in records:
+        for tag, values in columns.items():
+            values.append(record.get(tag))
+
+    json.dump({str(tag): values for tag, values in columns.items() if any(v is not None for v in values)},
+              f, default=to_json)
+
+
+# Output format name to writer and file extension.
+SINKS = {
+    'jsonl': (write_jsonl, '.jsonl'),
+    'csv': (write_csv, '.csv'),
+    'columns': (write_columns, '.columns.json'),
+}
+
+
+# Extensions of files expand() passes over: the outputs of earlier runs and
+# sidecar files, which would otherwise be ingested as recordings when the
+# output directory is inside the input tree.
+SKIPPED_EXTENSIONS = tuple(extension for _, extension in SINKS.values()) + SIDECAR_SUFFIXES
+
+
+def expand(inputs, pattern='*'):
+    """Return the files named by inputs, each a file, a directory searched
+    recursively for pattern, or a glob, sorted and without duplicates.
+
+    Files with a SKIPPED_EXTENSIONS extension are left out.
+    """
+    paths = set()
+
+    for name in inputs:
+        if os.path.isdir(name):
+            paths.update(glob.glob(os.path.join(name, '**', pattern), recursive=True))
+        else:
+            paths.update(glob.glob(name, recursive=True))
+
+    return sorted(path for path in paths if os.path.isfile(path) and not path.endswith(SKIPPED_EXTENSIONS))
+
+
+def ingest_file(path, output, sink='jsonl', resync=False):
+    """Decode the recording at path into output with sink, returning the path,
+    the number of packets and the seconds taken.
+
+    Files with a TS_EXTENSIONS extension are demultiplexed with
+    TransportStreamParser, others parsed with StreamParser.
+    """
+    write, _ = SINKS[sink]
+    start = time.perf_counter()
+    count = 0
+
+    if path.lower().endswith(TS_EXTENSIONS):
+        parser = TransportStreamParser.from_path(path)
+        packets = (packet for _, packet in parser)
+    else:
+        parser = StreamParser.from_path(path, resync=resync)
+        packets = parser
+
+    def records():
+        nonlocal count
+
+        for packet in packets:
+            count += 1
+            yield compact(packet)
+
+    with parser, open(output, 'w', newline='' if sink == 'csv' else None) as f:
+        write(records(), f)
+
+    return path, count, time.perf_counter() - start
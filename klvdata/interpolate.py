@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2017 Matthew Pare (paretech@gmail.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import numpy as np
+
+from klvdata import misb0601
+from klvdata.misb0601 import PrecisionTimeStamp
+from klvdata.misb0601 import UASLocalMetadataSet
+
+# Elements whose values wrap around the ends of their range, such as
+# headings at 360 and longitudes at 180.
+ANGLE_TAGS = frozenset(parser.TAG for parser in (
+    misb0601.PlatformHeadingAngle,
+    misb0601.SensorLongitude,
+    misb0601.SensorRelativeAzimuthAngle,
+    misb0601.SensorRelativeElevationAngle,
+    misb0601.SensorRelativeRollAngle,
+    misb0601.FrameCenterLongitude,
+    misb0601.WindDirection,
+    misb0601.TargetLocationLongitude,
+    misb0601.PlatformMagneticHeading,
+    misb0601.AlternatePlatformLongitude,
+    misb0601.AlternatePlatformHeading,
+    misb0601.CornerLongitudePoint1Full,
+    misb0601.CornerLongitudePoint2Full,
+    misb0601.CornerLongitudePoint3Full,
+    misb0601.CornerLongitudePoint4Full,
+))
+
+
+def interpolate(columns, times, tags=None, angles=ANGLE_TAGS):
+    """Return a dictionary of TAG to the values of that tag at times.
+
+    columns are the arrays of decode_columns(), including the
+    PrecisionTimeStamp column, and times is an array of datetime64 or of
+    integer microseconds since the epoch, such as video frame times. tags
+    are the columns to resample, all but the timestamps by default.
+
+    Each tag is linearly interpolated between the packets that hold it, in
+    one vectorized call. Tags in angles are interpolated the short way
+    round: values are unwrapped over the period of their range, so 359 and
+    1 degrees meet at 0, and wrapped back into the range afterwards.
+
+    Values are NaN at times before the first or after the last packet
+    holding the tag, or if no packet holds it.
+    """
+    if tags is None:
+        tags = [tag for tag in columns if tag != PrecisionTimeStamp.TAG]
+
+    parsers = UASLocalMetadataSet._tags
+    stamps = columns[PrecisionTimeStamp.TAG].astype('datetime64[us]')
+    times = np.asarray(times)
+
+    if np.issubdtype(times.dtype, np.datetime64):
+        times = times.astype('datetime64[us]').astype(np.int64)
+
+    # Packets are put in time order, leaving out any without a timestamp.
+    # Microseconds since the epoch are exact as float64 until 2255.
+    timed = ~np.isnat(stamps)
+    order = np.argsort(stamps[timed], kind='stable')
+    stamps = stamps[timed][order].astype(np.int64).astype(np.float64)
+    times = times.astype(np.float64)
+
+    resampled = {}
+
+    for tag in tags:
+        values = np.asarray(columns[tag], dtype=np.float64)[timed][order]
+        held = ~np.isnan(values)
+        x, y = stamps[held], values[held]
+
+        if not len(x):
+            resampled[tag] = np.full(len(times), np.nan)
+            continue
+
+        if tag in angles:
+            low, high = parsers[tag]._range
+            y = np.unwrap(y, period=high - low)
+
+        result = np.interp(times, x, y, left=np.nan, right=np.nan)
+
+        if tag in angles:
+            result = (result - low) % (high - low) + low
+
+        resampled[tag] = result
+
+    return resampled
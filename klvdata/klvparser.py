@@ -23,14 +23,20 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+from io import DEFAULT_BUFFER_SIZE
 from io import BytesIO
 from io import IOBase
+from os.path import commonprefix
 
 from klvdata.common import bytes_to_int
 
 
 class KLVParser(object):
-    """Return key, value pairs parsed from an SMPTE ST 336 source."""
+    """Return key, value pairs parsed from an SMPTE ST 336 source.
+
+    The first byte of the BER length of the last element returned is kept
+    in byte_length, as are those of the other framers.
+    """
 
     def __init__(self, source, key_length):
         if isinstance(source, IOBase):
@@ -39,6 +45,7 @@ class KLVParser(object):
             self.source = BytesIO(source)
 
         self.key_length = key_length
+        self.byte_length = None
 
     def __iter__(self):
         return self
@@ -56,6 +63,7 @@ class KLVParser(object):
             length = bytes_to_int(self.__read(byte_length - 128))
 
         value = self.__read(length)
+        self.byte_length = byte_length
 
         return key, value
 
@@ -71,3 +79,339 @@ class KLVParser(object):
             return data
         else:
             raise StopIteration
+
+
+class BufferedKLVParser(object):
+    """Return key, value pairs parsed in place from an SMPTE ST 336 source.
+
+    Unlike KLVParser, which issues separate reads for the key, length and
+    value of every element, the source is read in large chunks and each
+    element is framed directly in the chunk. Keys and values are returned
+    as read-only memoryview slices of that chunk, so no per-element copies
+    are made. Bytes-like sources (bytes, memoryview, mmap) are framed
+    without any reads at all.
+
+    Returned views keep the chunk they point into alive. Copy them with
+    bytes() if only a small part of a large buffer needs to be retained.
+
+    Framing of a bytes-like source can begin at position start. The stream
+    offset of the last element returned is kept in offset.
+    """
+
+    def __init__(self, source, key_length, buffer_size=64 * DEFAULT_BUFFER_SIZE, start=0):
+        if isinstance(source, IOBase):
+            self.source = source
+            view = memoryview(b'')
+        else:
+            self.source = None
+            view = memoryview(source)
+
+            # Views are handed out as dictionary keys, which requires them
+            # to be read-only and byte formatted.
+            if view.format != 'B':
+                view = view.cast('B')
+            if not view.readonly:
+                view = memoryview(bytes(view))
+
+        self.key_length = key_length
+        self.buffer_size = buffer_size
+        self.offset = None
+        self.byte_length = None
+
+        # Stream offset of the start of the current buffer.
+        self._consumed = 0
+
+        self._elements = self._frame(view, start)
+
+    def __iter__(self):
+        return self._elements
+
+    def __next__(self):
+        return next(self._elements)
+
+    def close(self):
+        """Stop framing and drop the reference held to the current buffer."""
+        self._elements.close()
+
+    def _frame(self, view, pos):
+        """Generate key, value views. Offsets are kept relative to pos."""
+        key_length = self.key_length
+
+        while True:
+            header = key_length + 1
+
+            if pos + header > len(view):
+                view, pos = self._fill(view, pos, header)
+
+                if pos + header > len(view):
+                    return
+
+            byte_length = view[pos + key_length]
+
+            if byte_length < 128:
+                # BER Short Form
+                end = header + byte_length
+            else:
+                # BER Long Form
+                header += byte_length - 128
+
+                if pos + header > len(view):
+                    view, pos = self._fill(view, pos, header)
+
+                    if pos + header > len(view):
+                        return
+
+                end = header + int.from_bytes(
+                    view[pos + key_length + 1:pos + header], byteorder='big')
+
+            if pos + end > len(view):
+                view, pos = self._fill(view, pos, end)
+
+                # Match KLVParser, which returns a short value when the source
+                # ends part way through it but stops if none of it is left.
+                if pos + header >= len(view) and end > header:
+                    return
+
+                end = min(end, len(view) - pos)
+
+            self.offset = self._consumed + pos
+            self.byte_length = byte_length
+
+            yield view[pos:pos + key_length], view[pos + header:pos + end]
+
+            pos += end
+
+    def _fill(self, view, pos, size):
+        """Return view and pos with at least size bytes buffered past pos if
+        the source has them."""
+        while self.source is not None and pos + size > len(view):
+            chunk = self.source.read(max(self.buffer_size, size))
+
+            if not chunk:
+                break
+
+            # Only the unframed tail of the previous chunk is carried over.
+            self._consumed += pos
+            view, pos = memoryview(view[pos:].tobytes() + chunk), 0
+
+        return view, pos
+
+
+class ResyncKLVParser(BufferedKLVParser):
+    """Return key, value pairs found by scanning a source for known keys.
+
+    Framing does not assume the source starts on, or stays on, an element
+    boundary. The buffer is searched for the known keys with bytes.find and
+    each candidate is only accepted if its BER length is sane, its value
+    fits in the source and, when a validator is registered for its key, the
+    validator accepts the raw element (key, length and value bytes).
+    Rejected candidates are skipped and the scan resumes one byte later.
+
+    keys maps each known key to a validator callable or None. The number of
+    bytes skipped so far is kept in skipped.
+    """
+
+    def __init__(self, source, keys, key_length, max_length=2 ** 20, **kwargs):
+        self.keys = dict(keys)
+        self.max_length = max_length
+        self.skipped = 0
+
+        # Universal keys share a common prefix (06 0E 2B 34) which is cheaper
+        # to search for than every key in turn.
+        prefix = commonprefix(list(self.keys))
+        self._needles = [prefix] if prefix else list(self.keys)
+
+        super().__init__(source, key_length, **kwargs)
+
+    def _find(self, data, pos):
+        """Return the position of the first needle in data at or after pos."""
+        found = -1
+
+        for needle in self._needles:
+            index = data.find(needle, pos)
+
+            if index >= 0 and (found < 0 or index < found):
+                found = index
+
+        return found
+
+    @staticmethod
+    def _searchable(view):
+        """Return an object supporting find() with the same content as view."""
+        data = view.obj
+
+        if hasattr(data, 'find') and len(data) == len(view):
+            return data
+
+        return view.tobytes()
+
+    def _frame(self, view, pos):
+        key_length = self.key_length
+        keys = self.keys
+        max_length = self.max_length
+        overlap = max(map(len, self._needles), default=1) - 1
+
+        data = self._searchable(view)
+        found = pos
+
+        # Stream offset of the end of the last element.
+        last = pos
+
+        def ensure(size):
+            """Return True if size bytes from found on are buffered."""
+            nonlocal view, data, found
+
+            if found + size > len(view):
+                refill, found = self._fill(view, found, size)
+
+                if refill is not view:
+                    view, data = refill, self._searchable(refill)
+
+            return found + size <= len(view)
+
+        while True:
+            found = self._find(data, pos)
+
+            if found < 0:
+                # Keep enough of the tail to match a key straddling two chunks.
+                keep = max(pos, len(view) - overlap)
+                refill, pos = self._fill(view, keep, len(view) - keep + 1)
+
+                if refill is view:
+                    self.skipped += self._consumed + len(view) - last
+                    return
+
+                view, data = refill, self._searchable(refill)
+                continue
+
+            if not ensure(key_length + 1) or view[found:found + key_length] not in keys:
+                pos = found + 1
+                continue
+
+            validate = keys[view[found:found + key_length]]
+            byte_length = view[found + key_length]
+            header = key_length + 1
+
+            if byte_length < 128:
+                # BER Short Form
+                length = byte_length
+            else:
+                # BER Long Form, rejecting the indefinite and reserved forms.
+                header += byte_length - 128
+
+                if not 0 < byte_length - 128 <= 8 or not ensure(header):
+                    pos = found + 1
+                    continue
+
+                length = int.from_bytes(
+                    view[found + key_length + 1:found + header], byteorder='big')
+
+            if length > max_length or not ensure(header + length):
+                pos = found + 1
+                continue
+
+            if validate is not None and not validate(view[found:found + header + length]):
+                pos = found + 1
+                continue
+
+            self.offset = self._consumed + found
+            self.byte_length = byte_length
+            self.skipped += self.offset - last
+            pos = found + header + length
+            last = self._consumed + pos
+
+            yield view[found:found + key_length], view[found + header:pos]
+
+
+class IncrementalKLVParser(object):
+    """Return key, value pairs from data pushed in with feed().
+
+    Data is appended to a growable buffer and complete elements are framed
+    from it in turn. When the buffered data ends part way through an element
+    iteration stops, and resumes from that element once more data is fed.
+    """
+
+    def __init__(self, key_length):
+        self.key_length = key_length
+        self.buffer = bytearray()
+        self.byte_length = None
+        self._pos = 0
+
+    @property
+    def pending(self):
+        """Return the number of buffered bytes not yet returned as an element."""
+        return len(self.buffer) - self._pos
+
+    def feed(self, data):
+        """Append data to the buffer."""
+        # Deleting from the front of a bytearray only moves its start, so
+        # consumed data is dropped without copying what remains.
+        del self.buffer[:self._pos]
+        self._pos = 0
+
+        self.buffer += data
+
+    def reset(self):
+        """Discard all buffered data."""
+        del self.buffer[:]
+        self._pos = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        buffer, pos, key_length = self.buffer, self._pos, self.key_length
+        header = pos + key_length + 1
+
+        if header > len(buffer):
+            raise StopIteration
+
+        byte_length = buffer[header - 1]
+
+        if byte_length < 128:
+            # BER Short Form
+            end = header + byte_length
+        else:
+            # BER Long Form
+            header += byte_length - 128
+
+            if header > len(buffer):
+                raise StopIteration
+
+            end = header + bytes_to_int(buffer[pos + key_length + 1:header])
+
+        if end > len(buffer):
+            raise StopIteration
+
+        self._pos = end
+        self.byte_length = byte_length
+
+        with memoryview(buffer) as view:
+            return view[pos:pos + key_length].tobytes(), view[header:end].tobytes()
+
+
+def select_elements(data, keys, key_length):
+    """Generate the key, value pairs of the elements of data with keys in keys.
+
+    data is bytes or a memoryview holding whole elements, such as a set
+    value. Elements with other keys are stepped over by their length
+    alone, so skipping them costs no more than reading their headers. A
+    value cut short by the end of data is returned short, as by KLVParser.
+    """
+    pos, end = 0, len(data)
+
+    while pos + key_length < end:
+        key = data[pos:pos + key_length]
+        byte_length = data[pos + key_length]
+        pos += key_length + 1
+
+        if byte_length >= 128:
+            # BER Long Form
+            size = byte_length - 128
+            byte_length = int.from_bytes(data[pos:pos + size], byteorder='big')
+            pos += size
+
+        if key in keys:
+            yield key, data[pos:pos + byte_length]
+
+        pos += byte_length
@@ -23,12 +23,15 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+from klvdata.common import bytes_to_int
 from klvdata.common import hexstr_to_bytes
+from klvdata.common import packet_checksum
 from klvdata.element import UnknownElement
 from klvdata.elementparser import (BytesElementParser,
                                             DateTimeElementParser,
                                             MappedElementParser,
                                             StringElementParser)
+from klvdata.klvparser import BufferedKLVParser
 from klvdata.setparser import SetParser
 from klvdata.streamparser import StreamParser
 
@@ -49,6 +52,28 @@ class UASLocalMetadataSet(SetParser):
 
     _unknown_element = UnknownElement
 
+    @staticmethod
+    def verify(packet):
+        """Return True if the raw packet ends with a matching Checksum element.
+
+        The packet is the complete key, length and value bytes as read from
+        the stream.
+        """
+        return packet[-4:-2] == b'\x01\x02' and packet_checksum(packet) == packet[-2:]
+
+    @staticmethod
+    def read_timestamp(value):
+        """Return the PrecisionTimeStamp of an undecoded value in microseconds.
+
+        Only the elements up to the timestamp, which ST0601 places first, are
+        framed. Return None if the value has no timestamp.
+        """
+        for key, element in BufferedKLVParser(value, 1):
+            if key == PrecisionTimeStamp.key:
+                return bytes_to_int(element)
+
+        return None
+
 
 @UASLocalMetadataSet.add_parser
 class Checksum(BytesElementParser):
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2017 Matthew Pare (paretech@gmail.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import mmap
+
+from klvdata.streamparser import IncrementalStreamParser
+
+PACKET_SIZE = 188
+SYNC_BYTE = 0x47
+
+# PMT stream_type of metadata carried in PES packets (ISO/IEC 13818-1).
+METADATA_STREAM_TYPE = 0x15
+# PES stream_id of synchronous metadata, carried in metadata AU cells.
+METADATA_STREAM_ID = 0xFC
+# format_identifier of the registration descriptor of KLV streams.
+KLVA = b'KLVA'
+
+# Translates the second byte of a TS packet header to the top bits of its PID.
+_PID_HIGH = bytes(byte & 0x1F for byte in range(256))
+
+
+def read_pts(data):
+    """Return the 33-bit timestamp coded in 5 bytes of a PES header."""
+    return ((data[0] >> 1 & 0x07) << 30 | data[1] << 22 | (data[2] >> 1) << 15 |
+            data[3] << 7 | data[4] >> 1)
+
+
+def metadata_cells(payload):
+    """Return the data of the metadata AU cells in a synchronous metadata
+    PES payload, concatenated."""
+    data = bytearray()
+    pos = 0
+
+    while pos + 5 <= len(payload):
+        length = payload[pos + 3] << 8 | payload[pos + 4]
+        data += payload[pos + 5:pos + 5 + length]
+        pos += 5 + length
+
+    return bytes(data)
+
+
+class TransportStreamParser(object):
+    """Demultiplex KLV metadata from an MPEG-2 transport stream.
+
+    source is bytes or a memory map, see from_path(). Iterating yields
+    (pts, element) pairs: each element parsed as by StreamParser and the
+    presentation timestamp, in 90 kHz ticks or None, of the access unit it
+    was completed in.
+
+    The metadata PID is taken from the first PMT stream of stream_type
+    0x15 (ISO/IEC 13818-1 metadata) or with a 'KLVA' registration
+    descriptor (SMPTE RP 217 asynchronous KLV), unless given as pid.
+
+    TS packets are located without a Python loop over the stream: the PID
+    fields of a large run of packets are gathered with extended slices at a
+    188 byte stride and searched as a single bytes object, so only packets
+    of the wanted PID are visited. Lost sync is recovered by searching for
+    the next run of sync bytes.
+    """
+    # Packets gathered per extended slice.
+    chunk_packets = 2 ** 16
+
+    def __init__(self, source, pid=None):
+        self.source = source
+        self.pid = pid
+        self.discontinuities = 0
+
+    @classmethod
+    def from_path(cls, path, pid=None):
+        """Return a parser over the file at path through a read-only memory map."""
+        with open(path, 'rb') as f:
+            try:
+                source = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped.
+                source = b''
+
+        return cls(source, pid=pid)
+
+    def close(self):
+        """Release the memory map opened by from_path."""
+        if isinstance(self.source, mmap.mmap):
+            self.source.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _sync(self, pos):
+        """Return the offset of the first packet at or after pos, or None."""
+        data = self.source
+
+        while True:
+            pos = data.find(bytes((SYNC_BYTE,)), pos)
+
+            if pos == -1:
+                return None
+
+            if all(data[ahead] == SYNC_BYTE for ahead in (pos + PACKET_SIZE, pos + 2 * PACKET_SIZE)
+                   if ahead < len(data)):
+                return pos
+
+            pos += 1
+
+    def _offsets(self, pid):
+        """Generate the offset of each TS packet of pid."""
+        data = self.source
+        needle = pid.to_bytes(2, 'big')
+        pos = self._sync(0)
+
+        while pos is not None and pos + PACKET_SIZE <= len(data):
+            count = min((len(data) - pos) // PACKET_SIZE, self.chunk_packets)
+            end = pos + count * PACKET_SIZE
+
+            # Packets before the first missing sync byte are aligned, except
+            # the one just before it, which may itself be cut short.
+            sync = data[pos:end + 1:PACKET_SIZE]
+            aligned = len(sync) - len(sync.lstrip(bytes((SYNC_BYTE,))))
+
+            if aligned < len(sync):
+                aligned = max(aligned - 1, 0)
+
+            aligned = min(aligned, count)
+
+            end = pos + aligned * PACKET_SIZE
+
+            # Interleave the PID bytes so each PID is a big-endian pair at an
+            # even position.
+            pids = bytearray(2 * aligned)
+            pids[0::2] = data[pos + 1:end:PACKET_SIZE].translate(_PID_HIGH)
+            pids[1::2] = data[pos + 2:end:PACKET_SIZE]
+
+            i = pids.find(needle)
+
+            while i != -1:
+                if i % 2:
+                    i = pids.find(needle, i + 1)
+                else:
+                    yield pos + i // 2 * PACKET_SIZE
+                    i = pids.find(needle, i + 2)
+
+            pos = end if aligned == count else self._sync(end + 1)
+
+    def _payloads(self, pid):
+        """Generate payload_unit_start_indicator, continuity_counter and
+        payload of each TS packet of pid that has a payload."""
+        data = self.source
+
+        for offset in self._offsets(pid):
+            packet = data[offset:offset + PACKET_SIZE]
+
+            # Skip packets flagged with transport errors.
+            if packet[1] & 0x80:
+                continue
+
+            adaptation_field_control = packet[3] >> 4 & 0x03
+
+            if not adaptation_field_control & 0x01:
+                continue
+
+            start = 5 + packet[4] if adaptation_field_control == 0x03 else 4
+
+            yield packet[1] & 0x40, packet[3] & 0x0F, packet[start:]
+
+    def _section(self, pid):
+        """Return the first complete PSI section carried on pid, or None."""
+        section = None
+
+        for unit_start, _, payload in self._payloads(pid):
+            if unit_start:
+                section = payload[1 + payload[0]:]
+            elif section is not None:
+                section += payload
+            else:
+                continue
+
+            if len(section) >= 3:
+                length = 3 + ((section[1] & 0x0F) << 8 | section[2])
+
+                if len(section) >= length:
+                    return section[:length]
+
+        return None
+
+    def programs(self):
+        """Return the PMT PID of each program listed in the PAT."""
+        section = self._section(0)
+
+        if section is None or section[0] != 0x00:
+            return []
+
+        # Skip the 8 byte header and the CRC; program 0 is the network PID.
+        entries = section[8:-4]
+
+        return [(entries[i + 2] & 0x1F) << 8 | entries[i + 3]
+                for i in range(0, len(entries) - 3, 4)
+                if entries[i:i + 2] != b'\x00\x00']
+
+    def klv_pids(self):
+        """Return the PIDs of the KLV metadata streams listed in the PMTs."""
+        pids = []
+
+        for pmt_pid in self.programs():
+            section = self._section(pmt_pid)
+
+            if section is None or section[0] != 0x02:
+                continue
+
+            pos = 12 + ((section[10] & 0x0F) << 8 | section[11])
+
+            while pos + 5 <= len(section) - 4:
+                stream_type = section[pos]
+                pid = (section[pos + 1] & 0x1F) << 8 | section[pos + 2]
+                info_length = (section[pos + 3] & 0x0F) << 8 | section[pos + 4]
+                descriptors = section[pos + 5:pos + 5 + info_length]
+
+                if stream_type == METADATA_STREAM_TYPE or self._registered(descriptors):
+                    pids.append(pid)
+
+                pos += 5 + info_length
+
+        return pids
+
+    @staticmethod
+    def _registered(descriptors):
+        """Return True if descriptors include a KLVA registration descriptor."""
+        pos = 0
+
+        while pos + 2 <= len(descriptors):
+            tag, length = descriptors[pos], descriptors[pos + 1]
+
+            if tag == 0x05 and descriptors[pos + 2:pos + 6] == KLVA:
+                return True
+
+            pos += 2 + length
+
+        return False
+
+    def access_units(self):
+        """Generate the PTS and KLV payload of each PES packet of the metadata PID.
+
+        A packet interrupted by a continuity counter discontinuity is
+        dropped and counted in discontinuities.
+        """
+        pid = self.pid
+
+        if pid is None:
+            pids = self.klv_pids()
+
+            if not pids:
+                return
+
+            pid = self.pid = pids[0]
+
+        pes = None
+        expected = None
+
+        for unit_start, counter, payload in self._payloads(pid):
+            if expected is not None and counter != expected:
+                # A single repeated packet is allowed.
+                if counter == (expected - 1) & 0x0F:
+                    continue
+
+                self.discontinuities += 1
+                pes = None
+
+            expected = (counter + 1) & 0x0F
+
+            if unit_start:
+                if pes is not None:
+                    yield from self._access_unit(pes)
+
+                pes = bytearray(payload)
+            elif pes is not None:
+                pes += payload
+            else:
+                continue
+
+            length = pes[4] << 8 | pes[5] if len(pes) >= 6 else 0
+
+            # A bounded packet is complete once its length has arrived.
+            if length and len(pes) >= 6 + length:
+                yield from self._access_unit(pes[:6 + length])
+                pes = None
+
+        if pes is not None:
+            yield from self._access_unit(pes)
+
+    @staticmethod
+    def _access_unit(pes):
+        """Generate the PTS and KLV payload of a PES packet, if valid."""
+        if pes[:3] != b'\x00\x00\x01' or len(pes) < 9:
+            return
+
+        stream_id = pes[3]
+        pts = read_pts(pes[9:14]) if pes[7] & 0x80 else None
+        payload = bytes(pes[9 + pes[8]:])
+
+        if stream_id == METADATA_STREAM_ID:
+            payload = metadata_cells(payload)
+
+        yield pts, payload
+
+    def __iter__(self):
+        # Packets are reassembled across access units, as asynchronous
+        # KLV may split them.
+        parser = IncrementalStreamParser()
+        discontinuities = self.discontinuities
+
+        for pts, payload in self.access_units():
+            # The rest of a packet begun before a dropped PES packet is lost
+            # with it, so what was buffered of it is discarded.
+            if self.discontinuities != discontinuities:
+                discontinuities = self.discontinuities
+                parser.reset()
+
+            for element in parser.feed(payload):
+                yield pts, element
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2017 Matthew Pare (paretech@gmail.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import select
+import socket
+import struct
+import sys
+import time
+
+from klvdata.streamparser import IncrementalStreamParser
+from klvdata.streamparser import StreamParser
+
+# Linux socket option reporting the datagrams dropped for lack of receive
+# buffer space in the ancillary data of each datagram. The socket module
+# does not define it.
+SO_RXQ_OVFL = getattr(socket, 'SO_RXQ_OVFL', 40 if sys.platform.startswith('linux') else None)
+
+MAX_DATAGRAM = 65535
+
+
+class UDPReceiver(object):
+    """Receive KLV packets over UDP unicast or IPv4 multicast.
+
+    Datagrams are parsed with an IncrementalStreamParser per sender, so a
+    datagram may carry several packets and a packet may span several
+    datagrams. Each parsed packet is passed to callback(sender, packet)
+    or put on queue as a (sender, packet) tuple, as given.
+
+    poll() waits for datagrams and then drains the socket without blocking,
+    receiving into a single preallocated buffer, until it is empty or batch
+    datagrams have been read. A large receive buffer (buffer_size, subject
+    to the system limit) absorbs bursts between polls.
+
+    The parser of a sender is kept until no datagram has come from it for
+    idle seconds, when it is dropped along with any partial packet. If
+    idle is None, parsers are kept, one per sender seen, for as long as
+    the receiver runs.
+
+    Counters:
+        datagrams: datagrams received.
+        packets: packets delivered, to callback or onto queue.
+        kernel_drops: datagrams dropped by the kernel for lack of buffer
+            space, where the system reports it (Linux SO_RXQ_OVFL).
+        queue_drops: packets dropped because queue was full.
+        truncated: partial packets discarded because the next datagram
+            from the sender started a new packet, or the sender was idle.
+        parse_errors: packets that failed to parse.
+        verify_failures: packets that failed verification, see verify.
+
+    If verify is 'skip' or 'flag', packets are checked as by StreamParser
+    before they are decoded, and with 'skip' only those that pass are
+    delivered.
+    """
+
+    def __init__(self, port, host='', group=None, interface='0.0.0.0', callback=None, queue=None,
+                 buffer_size=2 ** 23, batch=256, verify=None, idle=None):
+        """Bind to host and port, joining multicast group on interface if given."""
+        self.callback = callback
+        self.queue = queue
+        self.batch = batch
+        self.verify = verify
+        self.idle = idle
+        self.parsers = {}
+
+        # When each sender was last seen, and when idle senders are next
+        # looked for.
+        self._seen = {}
+        self._evicted = time.monotonic()
+
+        self.datagrams = 0
+        self.packets = 0
+        self.kernel_drops = 0
+        self.queue_drops = 0
+        self.truncated = 0
+        self.parse_errors = 0
+        self._verify_failures = 0
+
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+        try:
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, buffer_size)
+
+            if group is not None:
+                self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+                self.sock.bind((host, port))
+                self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP,
+                                     socket.inet_aton(group) + socket.inet_aton(interface))
+            else:
+                self.sock.bind((host, port))
+
+            self._ancillary = 0
+
+            if SO_RXQ_OVFL is not None and hasattr(self.sock, 'recvmsg_into'):
+                try:
+                    self.sock.setsockopt(socket.SOL_SOCKET, SO_RXQ_OVFL, 1)
+                    self._ancillary = socket.CMSG_SPACE(4)
+                except OSError:
+                    pass
+
+            self.sock.setblocking(False)
+        except OSError:
+            self.sock.close()
+            raise
+
+        self._buffer = bytearray(MAX_DATAGRAM)
+        self._view = memoryview(self._buffer)
+
+    @property
+    def address(self):
+        """Return the address and port the socket is bound to."""
+        return self.sock.getsockname()
+
+    def fileno(self):
+        return self.sock.fileno()
+
+    def close(self):
+        self._view.release()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _receive(self):
+        """Return the size and sender of the next datagram, or None if there
+        is none waiting."""
+        try:
+            if self._ancillary:
+                size, ancdata, _, sender = self.sock.recvmsg_into([self._buffer], self._ancillary)
+
+                for level, kind, data in ancdata:
+                    if level == socket.SOL_SOCKET and kind == SO_RXQ_OVFL:
+                        # The count of drops since the socket was opened.
+                        self.kernel_drops = struct.unpack('I', data[:4])[0]
+            else:
+                size, sender = self.sock.recvfrom_into(self._buffer)
+        except (BlockingIOError, InterruptedError):
+            return None
+
+        return size, sender
+
+    def poll(self, timeout=None):
+        """Wait up to timeout seconds, or indefinitely if None, for datagrams
+        and deliver the packets of those waiting. Return the number of
+        packets delivered."""
+        delivered = 0
+
+        if self.idle is not None and time.monotonic() - self._evicted >= self.idle:
+            self._evict()
+
+        if not select.select([self.sock], [], [], timeout)[0]:
+            return delivered
+
+        now = time.monotonic()
+        seen = self._seen
+
+        for _ in range(self.batch):
+            received = self._receive()
+
+            if received is None:
+                break
+
+            size, sender = received
+            self.datagrams += 1
+            seen[sender] = now
+            delivered += self._parse(sender, self._view[:size])
+
+        return delivered
+
+    def serve_forever(self, stop=None, interval=0.1):
+        """Poll until stop, a threading.Event, is set."""
+        while stop is None or not stop.is_set():
+            self.poll(interval)
+
+    @property
+    def verify_failures(self):
+        """Return the number of packets that failed verification."""
+        return self._verify_failures + sum(parser.verify_failures for parser in self.parsers.values())
+
+    def _evict(self):
+        """Drop the parsers of senders not seen for idle seconds."""
+        self._evicted = now = time.monotonic()
+
+        for sender in [sender for sender, seen in self._seen.items() if now - seen >= self.idle]:
+            parser = self.parsers.pop(sender)
+            del self._seen[sender]
+            self._verify_failures += parser.verify_failures
+
+            if parser.pending:
+                self.truncated += 1
+
+    def _parse(self, sender, data):
+        parser = self.parsers.get(sender)
+
+        if parser is None:
+            parser = self.parsers[sender] = IncrementalStreamParser(verify=self.verify)
+        elif parser.pending and bytes(data[:16]) in StreamParser.parsers:
+            # A datagram that starts with a known key begins a new packet, so
+            # the rest of the previous one was lost.
+            parser.reset()
+            self.truncated += 1
+
+        parser.iter_stream.feed(data)
+        delivered = 0
+
+        while True:
+            try:
+                packet = next(parser)
+            except StopIteration:
+                break
+            except Exception:
+                # The element was framed, so parsing resumes with the next.
+                self.parse_errors += 1
+                continue
+
+            delivered += self._deliver(sender, packet)
+
+        return delivered
+
+    def _deliver(self, sender, packet):
+        """Pass packet to callback and onto queue, returning whether either
+        took it."""
+        delivered = False
+
+        if self.callback is not None:
+            self.callback(sender, packet)
+            delivered = True
+
+        if self.queue is not None:
+            try:
+                self.queue.put_nowait((sender, packet))
+                delivered = True
+            except Exception:
+                # queue.Full and asyncio.QueueFull do not share a base class.
+                self.queue_drops += 1
+
+        if delivered:
+            self.packets += 1
+
+        return delivered
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2017 Matthew Pare (paretech@gmail.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from klvdata.index import PacketIndex
+from klvdata.streamparser import StreamParser
+
+
+def compact(packet):
+    """Return a dictionary of TAG to value for the elements of a parsed packet.
+
+    Values are the decoded Python values (float, int, str or datetime), which
+    are far cheaper to pickle than the element objects. Elements without a
+    TAG, such as nested sets, and unknown packets are left out.
+    """
+    values = {}
+
+    for item in getattr(packet, 'items', {}).values():
+        if hasattr(item, 'TAG'):
+            value = item.value.value
+            values[item.TAG] = bytes(value) if isinstance(value, memoryview) else value
+
+    return values
+
+
+def packet_ranges(index, chunks):
+    """Return up to chunks (start, end) byte ranges splitting index evenly
+    on packet boundaries."""
+    count = len(index)
+
+    if not count:
+        return []
+
+    chunks = max(min(chunks, count), 1)
+    bounds = [i * count // chunks for i in range(chunks + 1)]
+    end = index.offsets[-1] + index.lengths[-1]
+
+    return [(index.offsets[first], index.offsets[last] if last < count else end)
+            for first, last in zip(bounds, bounds[1:])]
+
+
+def decode_range(path, start, end, resync=False):
+    """Return the compact form of each packet starting in [start, end) of the
+    file at path."""
+    with StreamParser.from_path(path, resync=resync) as parser:
+        parser.seek(start)
+        decoded = []
+
+        for packet in parser:
+            # The framer keeps the offset of the packet just parsed.
+            if parser.iter_stream.offset >= end:
+                break
+
+            decoded.append(compact(packet))
+
+        return decoded
+
+
+def decode_parallel(path, workers=None, resync=False, index=None):
+    """Generate the compact form of every packet in the file at path, in order.
+
+    The file is framed once, through index or PacketIndex.open(), and split
+    into packet aligned byte ranges that are decoded by a pool of worker
+    processes. Each worker maps the file itself, so only the compact packets
+    are passed between processes.
+    """
+    if index is None:
+        index = PacketIndex.open(path, resync=resync)
+
+    workers = workers or os.cpu_count() or 1
+
+    # Several ranges per worker keeps them busy when packets differ in cost.
+    ranges = packet_ranges(index, workers * 4)
+
+    if not ranges:
+        return
+
+    starts, ends = zip(*ranges)
+
+    with ProcessPoolExecutor(workers) as executor:
+        for decoded in executor.map(decode_range, repeat(path), starts, ends, repeat(resync)):
+            yield from decoded
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2017 Matthew Pare (paretech@gmail.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from datetime import datetime
+from typing import NamedTuple
+
+from klvdata.elementparser import BytesElementParser
+from klvdata.elementparser import DateTimeElementParser
+from klvdata.elementparser import MappedElementParser
+from klvdata.elementparser import StringElementParser
+from klvdata.misb0102 import SecurityLocalMetadataSet
+from klvdata.misb0601 import UASLocalMetadataSet
+from klvdata.setparser import SetParser
+
+
+def field_type(parser):
+    """Return the type of the values decoded by parser."""
+    if issubclass(parser, SetParser):
+        return parser.record_type
+    elif issubclass(parser, MappedElementParser):
+        # Elements without a _domain and _range keep their raw value.
+        return float if parser._linear_map is not None else bytes
+    elif issubclass(parser, DateTimeElementParser):
+        return datetime
+    elif issubclass(parser, StringElementParser):
+        return str
+    elif issubclass(parser, BytesElementParser):
+        return int
+
+    return object
+
+
+def record_type(set_parser, typename):
+    """Return a named tuple type with a field for each parser of set_parser.
+
+    Fields are named after the parser classes, in key order, and typed
+    after the values they decode. The type becomes the record_type of
+    set_parser, used by SetParser.record(). Nested sets need their own
+    record type first.
+    """
+    parsers = sorted(set_parser.parsers.items())
+    cls = NamedTuple(typename, [(parser.__name__, field_type(parser)) for key, parser in parsers])
+
+    # Position of the field of each key, looked up once per item.
+    cls._positions = {key: position for position, (key, parser) in enumerate(parsers)}
+    cls.__doc__ = 'Values of a {}, None where missing.'.format(set_parser.name)
+
+    set_parser.record_type = cls
+
+    return cls
+
+
+SecurityRecord = record_type(SecurityLocalMetadataSet, 'SecurityRecord')
+PacketRecord = record_type(UASLocalMetadataSet, 'PacketRecord')
@@ -26,53 +26,83 @@
 from abc import ABCMeta
 from abc import abstractmethod
 from collections import OrderedDict
+from collections.abc import Mapping
 from pprint import pformat
 
 from klvdata.element import Element
+from klvdata.klvparser import BufferedKLVParser
 from klvdata.klvparser import KLVParser
+from klvdata.klvparser import select_elements
 
 
 class SetParser(Element):
     """Parsable Element. Not intended to be used directly. Always as super class."""
     __metaclass__ = ABCMeta
 
-    def __init__(self, value, key_length=1):
-        """All parser needs is the value, no other information"""
-        super().__init__(self.key, value)
+    # Sets keep a __dict__ for the attributes recorded by MetadataList.
+    __slots__ = ('__dict__',)
+
+    # Parsers of one byte keys by tag number, see add_parser.
+    _tags = (None,) * 256
+
+    # Result of the packet check of StreamParser(verify=...), None if the
+    # set was not checked.
+    verified = None
+
+    # Named tuple type of the values of the set, see record() and
+    # klvdata.record.
+    record_type = None
+
+    # Values recorded by MetadataList, see the getters below.
+    _PlatformTailNumber = None
+    _PlatformHeadingAngle = None
+    _ImageSourceSensor = None
+    _SensorLatitude = None
+    _SensorLongitude = None
+    _SensorTrueAltitude = None
+    _SensorHorizontalFieldOfView = None
+    _SensorVerticalFieldOfView = None
+    _targetWidth = None
+    _slantRange = None
+    _SensorRelativeAzimuthAngle = None
+    _OffsetCornerLatitudePoint1 = None
+    _OffsetCornerLongitudePoint1 = None
+    _OffsetCornerLatitudePoint2 = None
+    _OffsetCornerLongitudePoint2 = None
+    _OffsetCornerLatitudePoint3 = None
+    _OffsetCornerLongitudePoint3 = None
+    _OffsetCornerLatitudePoint4 = None
+    _OffsetCornerLongitudePoint4 = None
+    _FrameCenterLatitude = None
+    _FrameCenterLongitude = None
+    _FrameCenterElevation = None
+    _CornerLatitudePoint1Full = None
+    _CornerLongitudePoint1Full = None
+    _CornerLatitudePoint2Full = None
+    _CornerLongitudePoint2Full = None
+    _CornerLatitudePoint3Full = None
+    _CornerLongitudePoint3Full = None
+    _CornerLatitudePoint4Full = None
+    _CornerLongitudePoint4Full = None
+
+    def __init__(self, value, key_length=1, lazy=False, tags=None):
+        """All parser needs is the value, no other information
+
+        If lazy is True, items are only framed on construction and each is
+        parsed the first time it is accessed, see LazyItems.
+
+        If tags is given, only the elements it names are parsed, see
+        tag_keys(). Other elements are passed over when framing, without
+        creating element objects, and nested sets are only parsed if named.
+        """
+        # key is a class attribute of every set parser.
+        self.value = value
         self.key_length = key_length
+        self.lazy = lazy
+        self.tags = tags if tags is None or isinstance(tags, TagKeys) else self.tag_keys(tags)
         self.items = OrderedDict()
         self.parse()
 
-        self._PlatformTailNumber = None
-        self._PlatformHeadingAngle = None
-        self._ImageSourceSensor = None
-        self._SensorLatitude = None
-        self._SensorLongitude = None
-        self._SensorTrueAltitude = None
-        self._SensorHorizontalFieldOfView = None
-        self._SensorVerticalFieldOfView = None
-        self._targetWidth = None
-        self._slantRange = None
-        self._SensorRelativeAzimuthAngle = None
-        self._OffsetCornerLatitudePoint1 = None
-        self._OffsetCornerLongitudePoint1 = None
-        self._OffsetCornerLatitudePoint2 = None
-        self._OffsetCornerLongitudePoint2 = None
-        self._OffsetCornerLatitudePoint3 = None
-        self._OffsetCornerLongitudePoint3 = None
-        self._OffsetCornerLatitudePoint4 = None
-        self._OffsetCornerLongitudePoint4 = None
-        self._FrameCenterLatitude = None
-        self._FrameCenterLongitude = None
-        self._FrameCenterElevation = None
-        self._CornerLatitudePoint1Full = None
-        self._CornerLongitudePoint1Full = None
-        self._CornerLatitudePoint2Full = None
-        self._CornerLongitudePoint2Full = None
-        self._CornerLatitudePoint3Full = None
-        self._CornerLongitudePoint3Full = None
-        self._CornerLatitudePoint4Full = None
-        self._CornerLongitudePoint4Full = None
 
     def __getitem__(self, key):
         """Return element provided bytes key.
@@ -87,13 +117,45 @@ class SetParser(Element):
         """Parse the parent into items. Called on init and modification of parent value.
 
         If a known parser is not available for key, parse as generic KLV element.
+
+        Values framed by BufferedKLVParser are memoryviews, in which case the
+        items are framed in place from the same buffer.
         """
-        for key, value in KLVParser(self.value, self.key_length):
+        if self.tags is not None:
+            elements = select_elements(self.value, self.tags, self.key_length)
+        elif self.lazy or isinstance(self.value, memoryview):
+            elements = BufferedKLVParser(self.value, self.key_length)
+        else:
+            elements = KLVParser(self.value, self.key_length)
+
+        if self.lazy:
+            self.items = LazyItems(self.parsers, elements)
+            return
+
+        # Parsers are looked up by tag number, rather than by bytes key,
+        # in sets with one byte keys.
+        tags = self._tags if self.key_length == 1 else None
+
+        for key, value in elements:
             try:
-                self.items[key] = self.parsers[key](value)
+                parser = tags[key[0]] if tags is not None else self.parsers[key]
+                self.items[bytes(key)] = parser(value)
             except Exception:
                 None
 
+    @classmethod
+    def tag_keys(cls, tags):
+        """Return the keys of tags, TAG numbers or parser classes, for tags=.
+
+        Keys are looked up once, so the result can be passed to every packet
+        parsed. Numbers without a registered parser stand for the one byte
+        key of that value, such as 48 for SecurityLocalMetadataSet.
+        """
+        keys = {parser.TAG: key for key, parser in cls.parsers.items() if hasattr(parser, 'TAG')}
+
+        return TagKeys(bytes(tag.key) if hasattr(tag, 'key') else keys.get(tag) or bytes((tag,))
+                       for tag in tags)
+
     @classmethod
     def add_parser(cls, obj):
         """Decorator method used to register a parser to the class parsing repertoire.
@@ -108,6 +170,19 @@ class SetParser(Element):
         # parsers.
         cls.parsers[bytes(obj.key)] = obj
 
+        # Each set class keeps its own table of the parsers of one byte keys,
+        # indexed by tag number, missing tags being None.
+        if '_tags' not in cls.__dict__:
+            cls._tags = [None] * 256
+
+        if len(obj.key) == 1:
+            cls._tags[obj.key[0]] = obj
+
+        # Parsers may precompute what they need to decode values, such as
+        # the LinearMap of a MappedElementParser.
+        if hasattr(obj, 'prepare'):
+            obj.prepare()
+
         return obj
 
     @property
@@ -130,6 +205,27 @@ class SetParser(Element):
     def __str__(self):
         return str_dict(self.items)
 
+    def record(self):
+        """Return the values of the items as a record_type named tuple.
+
+        Values are built in a single pass over the items and are not
+        converted to strings. Nested sets are records themselves. Fields of
+        elements that are missing, or failed to parse, are None.
+        """
+        if self.record_type is None:
+            raise TypeError('{} has no record type'.format(type(self).__name__))
+
+        positions = self.record_type._positions
+        values = [None] * len(positions)
+
+        for key, item in self.items.items():
+            position = positions.get(key)
+
+            if position is not None:
+                values[position] = element_value(item)
+
+        return self.record_type._make(values)
+
     def MetadataList(self):
         ''' Return metadata dictionary'''
         metadata = {}
@@ -138,66 +234,9 @@ class SetParser(Element):
             for item in items:
                 try:
                     metadata[item.TAG] = (item.LDSName, str(item.value.value))
-                    if item.TAG == 4:
-                        self.SetPlatformTailNumber(item.value.value)
-                    elif item.TAG == 5:
-                        self.SetPlatformHeadingAngle(item.value.value)
-                    elif item.TAG == 11:
-                        self.SetImageSourceSensor(item.value.value)
-                    elif item.TAG == 13:
-                        self.SetSensorLatitude(item.value.value)
-                    elif item.TAG == 14:
-                        self.SetSensorLongitude(item.value.value)
-                    elif item.TAG == 15:
-                        self.SetSensorTrueAltitude(item.value.value)
-                    elif item.TAG == 16:
-                        self.SetSensorHorizontalFieldOfView(item.value.value)
-                    elif item.TAG == 17:
-                        self.SetSensorVerticalFieldOfView(item.value.value)
-                    elif item.TAG == 18:
-                        self.SetSensorRelativeAzimuthAngle(item.value.value)
-                    elif item.TAG == 21:
-                        self.SetSlantRange(item.value.value)
-                    elif item.TAG == 22:
-                        self.SettargetWidth(item.value.value)
-                    elif item.TAG == 23:
-                        self.SetFrameCenterLatitude(item.value.value)
-                    elif item.TAG == 24:
-                        self.SetFrameCenterLongitude(item.value.value)
-                    elif item.TAG == 25:
-                        self.SetFrameCenterElevation(item.value.value)
-                    elif item.TAG == 26:
-                        self.SetOffsetCornerLatitudePoint1(item.value.value)
-                    elif item.TAG == 27:
-                        self.SetOffsetCornerLongitudePoint1(item.value.value)
-                    elif item.TAG == 28:
-                        self.SetOffsetCornerLatitudePoint2(item.value.value)
-                    elif item.TAG == 29:
-                        self.SetOffsetCornerLongitudePoint2(item.value.value)
-                    elif item.TAG == 30:
-                        self.SetOffsetCornerLatitudePoint3(item.value.value)
-                    elif item.TAG == 31:
-                        self.SetOffsetCornerLongitudePoint3(item.value.value)
-                    elif item.TAG == 32:
-                        self.SetOffsetCornerLatitudePoint4(item.value.value)
-                    elif item.TAG == 33:
-                        self.SetOffsetCornerLongitudePoint4(item.value.value)
-                    elif item.TAG == 82:
-                        self.SetCornerLatitudePoint1Full(item.value.value)
-                    elif item.TAG == 83:
-                        self.SetCornerLongitudePoint1Full(item.value.value)
-                    elif item.TAG == 84:
-                        self.SetCornerLatitudePoint2Full(item.value.value)
-                    elif item.TAG == 85:
-                        self.SetCornerLongitudePoint2Full(item.value.value)
-                    elif item.TAG == 86:
-                        self.SetCornerLatitudePoint3Full(item.value.value)
-                    elif item.TAG == 87:
-                        self.SetCornerLongitudePoint3Full(item.value.value)
-                    elif item.TAG == 88:
-                        self.SetCornerLatitudePoint4Full(item.value.value)
-                    elif item.TAG == 89:
-                        self.SetCornerLongitudePoint4Full(item.value.value)
+                    setter = self._setters.get(item.TAG)
+                    if setter is not None:
+                        setter(self, item.value.value)
                 except:
                     None
                 if hasattr(item, 'items'):
@@ -389,6 +428,40 @@ class SetParser(Element):
 
     # ------------ END Setters/Getters ------------
 
+    # Setter of the value of each TAG recorded by MetadataList.
+    _setters = {
+        4: SetPlatformTailNumber,
+        5: SetPlatformHeadingAngle,
+        11: SetImageSourceSensor,
+        13: SetSensorLatitude,
+        14: SetSensorLongitude,
+        15: SetSensorTrueAltitude,
+        16: SetSensorHorizontalFieldOfView,
+        17: SetSensorVerticalFieldOfView,
+        18: SetSensorRelativeAzimuthAngle,
+        21: SetSlantRange,
+        22: SettargetWidth,
+        23: SetFrameCenterLatitude,
+        24: SetFrameCenterLongitude,
+        25: SetFrameCenterElevation,
+        26: SetOffsetCornerLatitudePoint1,
+        27: SetOffsetCornerLongitudePoint1,
+        28: SetOffsetCornerLatitudePoint2,
+        29: SetOffsetCornerLongitudePoint2,
+        30: SetOffsetCornerLatitudePoint3,
+        31: SetOffsetCornerLongitudePoint3,
+        32: SetOffsetCornerLatitudePoint4,
+        33: SetOffsetCornerLongitudePoint4,
+        82: SetCornerLatitudePoint1Full,
+        83: SetCornerLongitudePoint1Full,
+        84: SetCornerLatitudePoint2Full,
+        85: SetCornerLongitudePoint2Full,
+        86: SetCornerLatitudePoint3Full,
+        87: SetCornerLongitudePoint3Full,
+        88: SetCornerLatitudePoint4Full,
+        89: SetCornerLongitudePoint4Full,
+    }
+
     def structure(self):
         ''' Return metadata structure'''
         print(str(type(self)))
@@ -402,6 +475,80 @@ class SetParser(Element):
         repeat(self.items.values())
 
 
+def element_value(item):
+    """Return the decoded value of an item of a set, the record of a nested set."""
+    if isinstance(item, SetParser):
+        return item.record()
+
+    value = item.value.value
+
+    # Values framed in place would keep the whole buffer alive.
+    if isinstance(value, memoryview):
+        return bytes(value)
+
+    return value
+
+
+class TagKeys(frozenset):
+    """Keys of the elements to parse, as returned by SetParser.tag_keys()."""
+
+
+class LazyItems(Mapping):
+    """Items of a SetParser, each parsed the first time it is accessed.
+
+    Construction only frames the elements, keeping their values as slices
+    of the set value, so a packet costs little more than its framing until
+    items are read. As with eager parsing, elements without a registered
+    parser, or that fail to parse, are left out. A failure is only found
+    when the element is accessed, after which it is removed.
+    """
+
+    def __init__(self, parsers, elements):
+        self.parsers = parsers
+        self._raw = OrderedDict((bytes(key), value) for key, value in elements if key in parsers)
+        self._parsed = {}
+
+    def __getitem__(self, key):
+        key = bytes(key)
+
+        try:
+            return self._parsed[key]
+        except KeyError:
+            pass
+
+        value = self._raw[key]
+
+        try:
+            item = self._parsed[key] = self.parsers[key](value)
+        except Exception:
+            del self._raw[key]
+            raise KeyError(key)
+
+        return item
+
+    def __iter__(self):
+        return iter(list(self._raw))
+
+    def __len__(self):
+        return len(self._raw)
+
+    def __contains__(self, key):
+        return bytes(key) in self._raw
+
+    def values(self):
+        """Return the items, parsing any not yet parsed."""
+        return [item for _, item in self.items()]
+
+    def items(self):
+        """Return the key, item pairs, parsing any items not yet parsed."""
+        pairs = ((key, self.get(key)) for key in self)
+
+        return [(key, item) for key, item in pairs if item is not None]
+
+    def __repr__(self):
+        return pformat(OrderedDict((key, self.get(key)) for key in self), indent=1)
+
+
 def str_dict(values):
     out = []
 
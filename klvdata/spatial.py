@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2017 Matthew Pare (paretech@gmail.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import math
+import os
+from zipfile import BadZipFile
+
+import numpy as np
+
+from klvdata.columns import _decode_columns
+from klvdata.footprint import FOOTPRINT_TAGS
+from klvdata.footprint import FRAME_CENTER_TAGS
+from klvdata.footprint import corners
+from klvdata.index import Sidecar
+
+
+class FootprintIndex(Sidecar):
+    """R-tree of the image footprints of the packets in a file.
+
+    Each UASLocalMetadataSet packet with a frame center or corners has a
+    bounding box (west, south, east, north) in degrees, from its corners()
+    and frame center. Boxes are packed into a static R-tree with the
+    Sort-Tile-Recursive algorithm: sorted into vertical slices by center
+    longitude, each slice sorted by center latitude, and grouped capacity
+    at a time into nodes, level by level up to a single root. Queries
+    descend the tree a level at a time with array operations.
+
+    Boxes are kept in packing order with the offset of their packet, as in
+    PacketIndex. levels holds the node boxes from the root down; node i of
+    a level covers entries i * capacity to (i + 1) * capacity - 1 of the
+    next level, or of the boxes below the last.
+
+    The index can be saved to a sidecar file next to the recording, beside
+    that of PacketIndex, and is reused by FootprintIndex.open() for as long
+    as the size and modification time of the file, and resync, still match.
+
+    Footprints crossing the antimeridian get boxes spanning the longitudes
+    in between, so queries may return extra packets for them but never
+    miss one.
+    """
+    suffix = '.klvgeo'
+
+    _version = 2
+
+    def __init__(self, offsets, boxes, levels, capacity, size=0, mtime=0, resync=False):
+        self.offsets = offsets
+        self.boxes = boxes
+        self.levels = levels
+        self.capacity = capacity
+        self.size = size
+        self.mtime = mtime
+        self.resync = resync
+
+    def __len__(self):
+        return len(self.offsets)
+
+    @classmethod
+    def pack(cls, offsets, boxes, capacity=16, **kwargs):
+        """Return the index of packets at offsets with the given boxes, an
+        N x 4 array of west, south, east and north."""
+        offsets = np.asarray(offsets, dtype=np.uint64)
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        count = len(boxes)
+
+        # Sort into vertical slices of about sqrt(leaf nodes) nodes each,
+        # then by latitude within each slice.
+        slices = math.ceil(math.sqrt(math.ceil(count / capacity))) or 1
+        per_slice = slices * capacity
+
+        x = (boxes[:, 0] + boxes[:, 2]) / 2
+        y = (boxes[:, 1] + boxes[:, 3]) / 2
+        by_x = np.argsort(x, kind='stable')
+        slice_of = np.empty(count, dtype=np.int64)
+        slice_of[by_x] = np.arange(count) // per_slice
+        order = np.lexsort((y, slice_of))
+
+        offsets, boxes = offsets[order], boxes[order]
+
+        levels = []
+        level = boxes
+
+        while len(level) > 1 or (len(level) == 1 and not levels):
+            starts = np.arange(0, len(level), capacity)
+            level = np.stack([np.minimum.reduceat(level[:, 0], starts),
+                              np.minimum.reduceat(level[:, 1], starts),
+                              np.maximum.reduceat(level[:, 2], starts),
+                              np.maximum.reduceat(level[:, 3], starts)], axis=1)
+            levels.insert(0, level)
+
+        return cls(offsets, boxes, levels, capacity, **kwargs)
+
+    @classmethod
+    def build(cls, path, resync=False, capacity=16):
+        """Return a new index of the footprints of the packets in the file at
+        path.
+
+        Packet offsets are taken from the framing pass that decodes the
+        columns, so each row is located where it was read.
+        """
+        stat = os.stat(path)
+        columns, offsets = _decode_columns(path, tags=FOOTPRINT_TAGS, resync=resync)
+        latitudes, longitudes = corners(columns)
+
+        # The frame center is a point of the footprint too, and the only
+        # one of packets without corners.
+        latitudes = np.column_stack([latitudes, columns[FRAME_CENTER_TAGS[0]]])
+        longitudes = np.column_stack([longitudes, columns[FRAME_CENTER_TAGS[1]]])
+
+        # fmin and fmax pass over missing corners.
+        boxes = np.column_stack([np.fmin.reduce(longitudes, axis=1), np.fmin.reduce(latitudes, axis=1),
+                                 np.fmax.reduce(longitudes, axis=1), np.fmax.reduce(latitudes, axis=1)])
+        located = ~np.isnan(boxes).any(axis=1)
+
+        return cls.pack(offsets[located], boxes[located], capacity,
+                        size=stat.st_size, mtime=stat.st_mtime_ns, resync=resync)
+
+    def query(self, west, south, east, north):
+        """Return the sorted offsets of the packets whose boxes intersect the
+        box from west to east and south to north, in degrees."""
+        if not len(self):
+            return np.empty(0, dtype=np.uint64)
+
+        query = np.array([west, south, east, north], dtype=np.float64)
+        capacity = self.capacity
+        candidates = np.zeros(1, dtype=np.int64)
+
+        for depth in range(len(self.levels) + 1):
+            boxes = self.levels[depth] if depth < len(self.levels) else self.boxes
+            found = boxes[candidates]
+            candidates = candidates[(found[:, 0] <= query[2]) & (found[:, 2] >= query[0]) &
+                                    (found[:, 1] <= query[3]) & (found[:, 3] >= query[1])]
+
+            if depth == len(self.levels):
+                break
+
+            below = len(self.levels[depth + 1]) if depth + 1 < len(self.levels) else len(self.boxes)
+            candidates = (candidates[:, np.newaxis] * capacity + np.arange(capacity)).ravel()
+            candidates = candidates[candidates < below]
+
+        return np.sort(self.offsets[candidates])
+
+    def query_point(self, longitude, latitude):
+        """Return the sorted offsets of the packets whose boxes contain the
+        point."""
+        return self.query(longitude, latitude, longitude, latitude)
+
+    @classmethod
+    def load(cls, path):
+        """Return the index saved in the sidecar file at path.
+
+        Raise ValueError if the file is not a valid sidecar.
+        """
+        try:
+            with np.load(path) as arrays:
+                header = arrays['header']
+
+                if header[0] != cls._version:
+                    raise ValueError('Not a version {} footprint index'.format(cls._version))
+
+                version, capacity, size, mtime, depth, resync = header.tolist()
+                levels = [arrays['level{}'.format(i)] for i in range(depth)]
+
+                return cls(arrays['offsets'], arrays['boxes'], levels, capacity, size, mtime, bool(resync))
+        except (KeyError, IndexError, EOFError, BadZipFile) as e:
+            raise ValueError('Not a footprint index: {}'.format(e))
+
+    def _write(self, f):
+        header = np.array([self._version, self.capacity, self.size, self.mtime, len(self.levels),
+                           self.resync], dtype=np.int64)
+        levels = {'level{}'.format(i): level for i, level in enumerate(self.levels)}
+
+        np.savez(f, header=header, offsets=self.offsets, boxes=self.boxes, **levels)
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2017 Matthew Pare (paretech@gmail.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from collections.abc import Mapping
+
+from klvdata.misb0601 import UASLocalMetadataSet
+from klvdata.setparser import element_value
+
+
+class PacketState(object):
+    """Last known value of each element of a set, ST0601 by default.
+
+    ST0601 allows packets to carry only the elements that changed since
+    the previous one. update() applies such a packet to the state in
+    place, setting the slot of each of its elements in an array indexed by
+    tag number, so the cost of a packet depends only on the elements it
+    holds, not on how many are known.
+
+    view is a read-only mapping of TAG number to value over the state
+    itself. It is not copied on update, so it always shows the current
+    values; take snapshot() to keep the values at one packet.
+
+    Values are those of SetParser.record(): decoded, not converted to
+    strings, with nested sets as records. Elements that fail to parse
+    leave their last known value in place.
+    """
+
+    def __init__(self, set_parser=UASLocalMetadataSet):
+        self.set_parser = set_parser
+        self.packets = 0
+
+        # Value of each tag, None if not yet seen.
+        self._values = [None] * 256
+        self._count = 0
+
+        self.view = StateView(self)
+
+        record_type = set_parser.record_type
+        self._positions = () if record_type is None else [
+            (key[0], position) for key, position in record_type._positions.items()]
+
+    def update(self, packet):
+        """Apply the elements of packet and return a dictionary of the TAG
+        numbers and values it changed."""
+        values = self._values
+        delta = {}
+
+        for key, item in packet.items.items():
+            tag = key[0]
+            value = element_value(item)
+
+            if values[tag] != value:
+                if values[tag] is None:
+                    self._count += 1
+
+                values[tag] = delta[tag] = value
+
+        self.packets += 1
+
+        return delta
+
+    def merge(self, packets, deltas=False):
+        """Generate the state after each packet of the set in packets, a
+        StreamParser or other iterable of parsed packets.
+
+        The same view is generated every time, or the delta of each packet
+        if deltas is True. Packets of other sets are passed over.
+        """
+        for packet in packets:
+            if not isinstance(packet, self.set_parser):
+                continue
+
+            delta = self.update(packet)
+
+            yield delta if deltas else self.view
+
+    def snapshot(self):
+        """Return a copy of the state as a record of the set, see
+        SetParser.record()."""
+        values = [None] * len(self._positions)
+
+        for tag, position in self._positions:
+            values[position] = self._values[tag]
+
+        return self.set_parser.record_type._make(values)
+
+    def clear(self):
+        """Forget all values and the packet count, as when a new recording
+        starts."""
+        self._values[:] = [None] * 256
+        self._count = 0
+        self.packets = 0
+
+
+class StateView(Mapping):
+    """Read-only mapping of TAG number to the current value of a PacketState."""
+
+    def __init__(self, state):
+        self._state = state
+
+    def __getitem__(self, tag):
+        try:
+            value = self._state._values[tag]
+        except (IndexError, TypeError):
+            raise KeyError(tag)
+
+        if value is None:
+            raise KeyError(tag)
+
+        return value
+
+    def __iter__(self):
+        return (tag for tag, value in enumerate(self._state._values) if value is not None)
+
+    def __len__(self):
+        return self._state._count
+
+    def __repr__(self):
+        return '{}({})'.format(type(self).__name__, dict(self))
@@ -23,32 +23,332 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import mmap
+from asyncio import IncompleteReadError
+from bisect import bisect_right
+from collections import deque
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+
+from klvdata.common import bytes_to_int
+from klvdata.common import int_to_bytes
 from klvdata.element import UnknownElement
+from klvdata.klvparser import BufferedKLVParser
+from klvdata.klvparser import IncrementalKLVParser
 from klvdata.klvparser import KLVParser
+from klvdata.klvparser import ResyncKLVParser
+from klvdata.setparser import SetParser
 
 
 class StreamParser:
     parsers = {}
 
-    def __init__(self, source):
+    def __init__(self, source, buffered=False, resync=False, lazy=False, tags=None, verify=None):
+        """Parse elements from source, a file-like object or bytes.
+
+        If buffered is True, the source is framed in large chunks by
+        BufferedKLVParser and element values are memoryview slices of those
+        chunks instead of individually read bytes objects.
+
+        If resync is True, the source may start mid-packet or contain
+        corrupted data. Packets are located by scanning for the keys of the
+        registered parsers with ResyncKLVParser and, where a parser provides
+        a verify() method (such as the ST0601 checksum), validated before they
+        are parsed. Values are memoryviews as in buffered mode. The number
+        of bytes passed over is available as bytes_skipped.
+
+        If lazy is True, sets are parsed lazily, see SetParser.
+
+        If tags is given, TAG numbers or parser classes, only those elements
+        of each set are parsed, see SetParser.tag_keys().
+
+        If verify is 'skip' or 'flag', packets whose parser provides a
+        verify() method (such as the ST0601 checksum) are checked before they
+        are decoded. Packets that fail are dropped with 'skip', or decoded
+        with their verified attribute False with 'flag'. Packets that pass
+        are marked verified. The number of failures is available as
+        verify_failures. The packet checked is rebuilt from the key, value
+        and first BER length byte as read, so lengths written in a longer
+        form than needed are checked as they were summed.
+        """
+        if verify not in (None, 'skip', 'flag'):
+            raise ValueError("verify must be None, 'skip' or 'flag'")
+
         self.source = source
+        self.lazy = lazy
+        self.tags = tags
+        self.verify = verify
+        self.verify_failures = 0
+
+        # Keys are looked up once per set parser rather than per packet.
+        self._tag_keys = {}
 
         # All keys in parser are expected to be 16 bytes long.
-        self.iter_stream = KLVParser(self.source, key_length=16)
+        if resync:
+            self.iter_stream = ResyncKLVParser(self.source, self._resync_keys(), key_length=16)
+        elif buffered:
+            self.iter_stream = BufferedKLVParser(self.source, key_length=16)
+        else:
+            self.iter_stream = KLVParser(self.source, key_length=16)
+
+    @property
+    def bytes_skipped(self):
+        """Return the number of bytes passed over while resynchronizing."""
+        return getattr(self.iter_stream, 'skipped', 0)
+
+    @classmethod
+    def from_path(cls, path, resync=False, lazy=False, tags=None, verify=None):
+        """Return a parser over the file at path through a read-only memory map.
+
+        Packets are framed directly from the mapped pages, so reads are served
+        by the OS page cache and processes parsing the same file share memory.
+        Element values are memoryviews into the map. Call close(), or use the
+        parser as a context manager, to release it.
+        """
+        with open(path, 'rb') as f:
+            try:
+                source = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped.
+                source = b''
+
+        return cls(source, buffered=True, resync=resync, lazy=lazy, tags=tags, verify=verify)
+
+    def close(self):
+        """Release the memory map opened by from_path.
+
+        A map that is still referenced by parsed packets is released once the
+        last of them is garbage collected instead.
+        """
+        if hasattr(self.iter_stream, 'close'):
+            self.iter_stream.close()
+
+        if isinstance(self.source, mmap.mmap):
+            try:
+                self.source.close()
+            except BufferError:
+                pass
+
+    def seek_time(self, when, neighbours=1, index=None):
+        """Return the packet at time when and up to neighbours packets either side.
+
+        The packet matched is the last one timestamped at or before when, or
+        the first packet if all are later. when is a datetime, taken as UTC if
+        naive, or microseconds since the epoch. Iteration resumes from the
+        matched packet.
+
+        Packet timestamps are binary searched in index, a PacketIndex of the
+        file, if given. Otherwise the source is probed at O(log n) offsets,
+        finding the next packet after each with a resync scan. Either way,
+        only the returned packets are decoded.
+
+        Seeking requires a parser over bytes or one created by from_path.
+        """
+        if not isinstance(self.source, (bytes, mmap.mmap)):
+            raise TypeError('seek_time requires a parser over bytes or from_path')
+
+        if isinstance(when, datetime):
+            if when.tzinfo is None:
+                when = when.replace(tzinfo=timezone.utc)
+
+            when = (when - datetime(1970, 1, 1, tzinfo=timezone.utc)) // timedelta(microseconds=1)
+
+        if index is not None:
+            elements, match = self._indexed(when, neighbours, index)
+        else:
+            elements, match = self._probed(when, neighbours)
+
+        if not elements:
+            return []
+
+        # Resume iteration from the matched packet.
+        self.seek(elements[match][0])
+
+        return [self._element(key, value) for offset, key, value in elements]
+
+    def seek(self, offset):
+        """Resume iteration at byte offset of the source, where a packet starts.
+
+        Seeking requires a parser over bytes or one created by from_path.
+        """
+        if not isinstance(self.source, (bytes, mmap.mmap)):
+            raise TypeError('seek requires a parser over bytes or from_path')
+
+        if hasattr(self.iter_stream, 'close'):
+            self.iter_stream.close()
+
+        if isinstance(self.iter_stream, ResyncKLVParser):
+            self.iter_stream = ResyncKLVParser(
+                self.source, self._resync_keys(), key_length=16, start=offset)
+        else:
+            self.iter_stream = BufferedKLVParser(self.source, key_length=16, start=offset)
+
+    def _indexed(self, when, neighbours, index):
+        """Return offset, key, value of the packets around when and the
+        position of the match among them, found with index."""
+        if not len(index):
+            return [], None
+
+        match = max(bisect_right(index.timestamps, when) - 1, 0)
+        first = max(match - neighbours, 0)
+        view = memoryview(self.source)
+        elements = []
+
+        for i in range(first, min(match + neighbours + 1, len(index))):
+            offset, length = index.offsets[i], index.lengths[i]
+            key, value = next(BufferedKLVParser(view[offset:offset + length], key_length=16))
+            elements.append((offset, key, value))
+
+        return elements, match - first
+
+    def _probed(self, when, neighbours):
+        """Return offset, key, value of the packets around when and the
+        position of the match among them, found by probing view."""
+        keys = self._resync_keys()
+
+        def packets(start):
+            """Generate offset, key, value and timestamp of packets from start."""
+            framer = ResyncKLVParser(self.source, keys, key_length=16, start=start)
+
+            for key, value in framer:
+                yield framer.offset, key, value, self._timestamp(key, value)
+
+        # lo is the offset of a packet timestamped at or before when, or the
+        # start of the source. No packet from hi on is.
+        lo, hi = 0, len(self.source)
+
+        while (lo + hi) // 2 > lo:
+            mid = (lo + hi) // 2
+            found = None
+
+            for found in packets(mid):
+                if found[0] >= hi or found[3] is not None:
+                    break
+
+            if found is None or found[0] >= hi or found[3] is None or found[3] > when:
+                hi = mid
+            else:
+                lo = found[0]
+
+        # Frame from further back until enough earlier packets are found,
+        # doubling the distance each time.
+        before = deque(maxlen=neighbours + 1)
+        back = 4096
+
+        while True:
+            start = max(lo - back, 0)
+            before.clear()
+
+            for packet in packets(start):
+                if packet[0] >= lo:
+                    break
+
+                before.append(packet)
+
+            if start == 0 or len(before) >= neighbours:
+                break
+
+            back *= 2
+
+        # The last packet before any later than when is the match.
+        after = []
+
+        for packet in packets(lo):
+            if not after and (not before or packet[3] is None or packet[3] <= when):
+                before.append(packet)
+            elif len(after) < neighbours:
+                after.append(packet)
+            else:
+                break
+
+        elements = [packet[:3] for packet in list(before) + after]
+
+        return elements, len(before) - 1
+
+    def _timestamp(self, key, value):
+        """Return the raw timestamp of an undecoded packet, or None."""
+        read_timestamp = getattr(self.parsers.get(key), 'read_timestamp', None)
+
+        return read_timestamp(value) if read_timestamp is not None else None
+
+    def _resync_keys(self):
+        """Return the known keys mapped to their packet validators."""
+        return {key: getattr(parser, 'verify', None) for key, parser in self.parsers.items()}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
 
     def __iter__(self):
         return self
 
     def __next__(self):
-        key, value = next(self.iter_stream)
+        while True:
+            key, value = next(self.iter_stream)
+
+            if self.verify is None:
+                return self._element(key, value)
+
+            element = self._verified(key, value, self.iter_stream.byte_length)
+
+            if element is not None:
+                return element
+
+    def _verified(self, key, value, byte_length):
+        """Return the element parsed from a checked packet, or None if it is
+        skipped. byte_length is the first byte of its BER length."""
+        verify = getattr(self.parsers.get(key), 'verify', None)
+
+        if verify is None:
+            return self._element(key, value)
+
+        length = int_to_bytes(byte_length)
+
+        if byte_length >= 128:
+            # BER Long Form, in as many bytes as read.
+            length += int_to_bytes(len(value), byte_length - 128)
+
+        verified = verify(bytes(key) + length + value)
+
+        if not verified:
+            self.verify_failures += 1
+
+            if self.verify == 'skip':
+                return None
+
+        element = self._element(key, value)
+        element.verified = verified
+
+        return element
+
+    def _element(self, key, value):
+        """Return the element parsed by the parser registered for key."""
         if key in self.parsers:
-            return self.parsers[key](value)
+            parser = self.parsers[key]
+
+            if (self.lazy or self.tags is not None) and issubclass(parser, SetParser):
+                return parser(value, lazy=self.lazy, tags=self._keys(parser))
+
+            return parser(value)
         else:
             # Even if KLV is not known, make best effort to parse and preserve.
             # Element is an abstract super class, do not create instances on
             # Element.
             return UnknownElement(key, value)
 
+    def _keys(self, parser):
+        """Return the keys of self.tags for the set parser, or None."""
+        if self.tags is None:
+            return None
+
+        if parser not in self._tag_keys:
+            self._tag_keys[parser] = parser.tag_keys(self.tags)
+
+        return self._tag_keys[parser]
+
     @classmethod
     def add_parser(cls, obj):
         """Decorator method used to register a parser to the class parsing repertoire.
@@ -59,3 +359,87 @@ class StreamParser:
         cls.parsers[bytes(obj.key)] = obj
 
         return obj
+
+
+class IncrementalStreamParser(StreamParser):
+    """Parse elements from data pushed in arbitrarily sized chunks.
+
+    Unlike StreamParser, nothing is read from a source. Data received from a
+    socket or other transport is passed to feed(), which returns the elements
+    completed by it. A partial element is kept until the rest of it is fed.
+    """
+
+    def __init__(self, verify=None):
+        super().__init__(b'', verify=verify)
+
+        # All keys in parser are expected to be 16 bytes long.
+        self.iter_stream = IncrementalKLVParser(key_length=16)
+
+    @property
+    def pending(self):
+        """Return the number of bytes buffered towards the next element."""
+        return self.iter_stream.pending
+
+    def feed(self, data):
+        """Buffer data and return a list of the elements it completed."""
+        self.iter_stream.feed(data)
+
+        return list(self)
+
+    def reset(self):
+        """Discard buffered data, such as a partial element that will never
+        be completed."""
+        self.iter_stream.reset()
+
+
+class AsyncStreamParser(StreamParser):
+    """Parse elements from an asyncio.StreamReader with async for.
+
+    Yields the same elements as StreamParser, reading each key and BER
+    length with readexactly() so many feeds can be parsed concurrently in a
+    single event loop. Iteration stops when the reader reaches end of
+    stream, including part way through an element.
+    """
+
+    def __init__(self, reader, verify=None):
+        super().__init__(b'', verify=verify)
+        self.reader = reader
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while True:
+            key, value, byte_length = await self._read()
+
+            if self.verify is None:
+                return self._element(key, value)
+
+            element = self._verified(key, value, byte_length)
+
+            if element is not None:
+                return element
+
+    async def _read(self):
+        """Return the key, value and first BER length byte of the next
+        element."""
+        reader = self.reader
+
+        try:
+            # All keys in parser are expected to be 16 bytes long. The key
+            # and first BER byte are read together.
+            header = await reader.readexactly(17)
+            key, byte_length = header[:16], header[16]
+
+            if byte_length < 128:
+                # BER Short Form
+                length = byte_length
+            else:
+                # BER Long Form
+                length = bytes_to_int(await reader.readexactly(byte_length - 128))
+
+            value = await reader.readexactly(length)
+        except IncompleteReadError:
+            raise StopAsyncIteration
+
+        return key, value, byte_length
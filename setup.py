@@ -72,6 +72,18 @@ setup(
     packages=['klvdata'],
     test_suite="test",
 
+    entry_points={
+        'console_scripts': [
+            'klvdata=klvdata.cli:main',
+        ],
+    },
+
     python_requires='>=3.5',
+
+    # NumPy is only needed by klvdata.columns, footprint, spatial and
+    # interpolate. sliding_window_view needs 1.20, np.unwrap(period=) 1.21.
+    extras_require={
+        'numpy': ['numpy>=1.21'],
+    },
 )
 
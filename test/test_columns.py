@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+
+#  The MIT License (MIT)
+#
+# Copyright (c) 2017 Matthew Pare (paretech@gmail.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def without(packet, tag):
+    """Return the ST0601 packet with the element of tag removed."""
+    from klvdata.common import ber_encode
+    from klvdata.klvparser import KLVParser
+
+    key, value = next(KLVParser(packet, 16))
+    value = b''.join(bytes(k) + ber_encode(len(v)) + bytes(v) for k, v in KLVParser(value, 1) if k[0] != tag)
+
+    return key + ber_encode(len(value)) + value
+
+
+@unittest.skipUnless(numpy, 'requires numpy')
+class DecodeColumns(unittest.TestCase):
+    def setUp(self):
+        with open('./data/Cheyenne.bin', 'rb') as f:
+            data = f.read()
+
+        # Vary the layout: drop latitude from every third packet and heading
+        # from every fifth.
+        packets = [data[i:i + 259] for i in range(0, len(data), 259)]
+        packets = [without(packet, 13) if i % 3 == 0 else packet for i, packet in enumerate(packets)]
+        packets = [without(packet, 5) if i % 5 == 0 else packet for i, packet in enumerate(packets)]
+        self.data = b''.join(packets)
+
+    def assertMatchesPackets(self, columns):
+        from klvdata.streamparser import StreamParser
+
+        packets = list(StreamParser(self.data))
+
+        for tag, column in columns.items():
+            self.assertEqual(len(column), len(packets))
+
+            for value, packet in zip(column, packets):
+                item = packet.items.get(bytes((tag,)))
+
+                if tag == 2:
+                    self.assertEqual(value.astype(object), item.value.value.replace(tzinfo=None))
+                elif item is None:
+                    self.assertTrue(numpy.isnan(value))
+                else:
+                    self.assertEqual(round(value, 4), item.value.value)
+
+    def test_all(self):
+        from klvdata.columns import columnar_tags
+        from klvdata.columns import decode_columns
+
+        columns = decode_columns(self.data)
+
+        self.assertEqual(list(columns), columnar_tags())
+        self.assertEqual(columns[2].dtype, numpy.dtype('datetime64[us]'))
+        self.assertEqual(int(numpy.isnan(columns[13]).sum()), 136)
+        self.assertMatchesPackets(columns)
+
+    def test_tags(self):
+        from io import BytesIO
+        from klvdata.columns import decode_columns
+        from klvdata.misb0601 import SensorLatitude
+
+        columns = decode_columns(BytesIO(self.data), tags=[2, SensorLatitude, 14])
+
+        self.assertEqual(list(columns), [2, 13, 14])
+        self.assertMatchesPackets(columns)
+
+    def test_batch(self):
+        from klvdata.columns import decode_columns
+
+        columns = decode_columns(self.data, tags=[2, 13, 14], batch=7)
+
+        self.assertMatchesPackets(columns)
+
+    def test_unsupported(self):
+        from klvdata.columns import decode_columns
+
+        self.assertRaises(ValueError, decode_columns, self.data, tags=[3])
+
+    def test_path(self):
+        from klvdata.columns import decode_columns
+
+        columns = decode_columns('./data/DynamicConstantMISMMSPacketData.bin', tags=[13, 14])
+
+        self.assertEqual(columns[13].tolist(), [60.176822966978335])
+        self.assertEqual(columns[14].tolist(), [128.42675904204452])
+
+
+@unittest.skipUnless(numpy, 'requires numpy')
+class VerifyPackets(unittest.TestCase):
+    def test_corrupted(self):
+        from klvdata.columns import verify_packets
+        from klvdata.common import packet_checksum
+
+        with open('./data/Cheyenne.bin', 'rb') as f:
+            data = bytearray(f.read())
+
+        data[259 * 3 + 100] ^= 0xFF
+        data[259 * 10 + 50] ^= 0x01
+
+        # Packets of other lengths, the last without a Checksum element.
+        shorter = without(bytes(data[:259]), 3)
+        packets = [bytes(data), shorter[:-2] + packet_checksum(shorter), without(bytes(data[:259]), 1)]
+
+        for batch in (7, 4096):
+            verified = verify_packets(b''.join(packets), batch=batch)
+
+            self.assertEqual(len(verified), 409)
+            self.assertEqual(numpy.flatnonzero(~verified).tolist(), [3, 10, 408])
+
+    def test_matches_verify(self):
+        from klvdata.columns import verify_packets
+        from klvdata.misb0601 import UASLocalMetadataSet
+
+        verified = verify_packets('./data/DynamicConstantMISMMSPacketData.bin')
+
+        with open('./data/DynamicConstantMISMMSPacketData.bin', 'rb') as f:
+            self.assertEqual(verified.tolist(), [UASLocalMetadataSet.verify(f.read())])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -221,6 +221,55 @@ class Checksum(unittest.TestCase):
         self.assertEqual(packet_checksum(packet), b'\x3E\x1e')
 
 
+class LinearMap(unittest.TestCase):
+    def test_matches_bytes_to_float(self):
+        from klvdata.common import LinearMap
+        from klvdata.common import bytes_to_float
+
+        for _domain, _range in (((0, 2 ** 16 - 1), (0, 360)),
+                                ((-(2 ** 15 - 1), 2 ** 15 - 1), (-20, 20)),
+                                ((-(2 ** 31 - 1), 2 ** 31 - 1), (-90, 90))):
+            linear_map = LinearMap.compile(_domain, _range)
+            length = linear_map.length
+
+            for value in (b'\x00' * length, b'\x7f' + b'\xff' * (length - 1), b'\x12\x34' * (length // 2)):
+                self.assertEqual(linear_map.to_float(value), bytes_to_float(value, _domain, _range))
+
+        self.assertEqual(LinearMap.compile((0, 255), (0, 1)).length, 1)
+
+    def test_out_of_domain(self):
+        from klvdata.common import LinearMap
+
+        # The most negative value is reserved as an error indicator.
+        self.assertRaises(ValueError, LinearMap.compile((-(2 ** 15 - 1), 2 ** 15 - 1), (-20, 20)).to_float, b'\x80\x00')
+
+    def test_from_float(self):
+        from klvdata.common import LinearMap
+        from klvdata.common import float_to_bytes
+
+        for _domain, _range in (((0, 2 ** 16 - 1), (0, 360)),
+                                ((-(2 ** 15 - 1), 2 ** 15 - 1), (-20, 20)),
+                                ((-(2 ** 31 - 1), 2 ** 31 - 1), (-90, 90))):
+            linear_map = LinearMap.compile(_domain, _range)
+
+            for value in (_range[0], 12.3456, -0.0001 if _domain[0] else 0.0001):
+                self.assertEqual(linear_map.from_float(value), float_to_bytes(value, _domain, _range))
+
+        self.assertRaises(ValueError, LinearMap.compile((0, 2 ** 16 - 1), (0, 360)).from_float, 360.1)
+
+        # Range endpoints map onto the domain endpoints despite float error.
+        self.assertEqual(LinearMap.compile((-(2 ** 31 - 1), 2 ** 31 - 1), (-90, 90)).from_float(90), b'\x7f\xff\xff\xff')
+        self.assertEqual(LinearMap.compile((-(2 ** 31 - 1), 2 ** 31 - 1), (-180, 180)).from_float(-180), b'\x80\x00\x00\x01')
+
+    def test_registered(self):
+        from klvdata.misb0601 import PlatformHeadingAngle
+        from klvdata.misb0601 import UASLocalMetadataSet
+
+        self.assertEqual(PlatformHeadingAngle._linear_map.length, 2)
+        self.assertIs(UASLocalMetadataSet._tags[5], PlatformHeadingAngle)
+        self.assertEqual(PlatformHeadingAngle(b'\x71\xC2').value.value, 159.9744)
+
+
 if __name__ == "__main__":
     unittest.main()
 
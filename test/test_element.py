@@ -69,6 +69,14 @@ class ElementTLV(unittest.TestCase):
             eval(repr(UnknownElement(b'\x02', b'\x00\x04\x60\x50\x58\x4E\x01\x80'))),
             UnknownElement)
 
+    def test_slots(self):
+        from klvdata.misb0601 import PlatformHeadingAngle
+        element = PlatformHeadingAngle(b'\x71\xC2')
+        self.assertFalse(hasattr(element, '__dict__'))
+        self.assertFalse(hasattr(element.value, '__dict__'))
+        self.assertEqual(element.key, b'\x05')
+        self.assertIs(element.value._domain, PlatformHeadingAngle._domain)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+
+#  The MIT License (MIT)
+#
+# Copyright (c) 2017 Matthew Pare (paretech@gmail.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import unittest
+from datetime import datetime
+from datetime import timezone
+
+
+class PacketEncoderTest(unittest.TestCase):
+    def setUp(self):
+        with open('./data/Cheyenne.bin', 'rb') as f:
+            self.data = f.read()
+
+    def test_record_round_trip(self):
+        from klvdata.encoder import PacketEncoder
+        from klvdata.misb0601 import UASLocalMetadataSet
+        from klvdata.streamparser import StreamParser
+
+        encoder = PacketEncoder()
+        records = [packet.record() for packet in StreamParser(self.data)]
+        packets = [encoder.encode(record) for record in records]
+
+        self.assertTrue(all(UASLocalMetadataSet.verify(packet) for packet in packets))
+
+        decoded = [packet.record() for packet in StreamParser(b''.join(packets))]
+
+        # Only the Checksum, computed over the re-encoded packets, differs.
+        self.assertEqual([record._replace(Checksum=None) for record in decoded],
+                         [record._replace(Checksum=None) for record in records])
+
+    def test_elements(self):
+        from klvdata.encoder import PacketEncoder
+        from klvdata.streamparser import StreamParser
+
+        encoder = PacketEncoder()
+        packet = next(StreamParser(self.data))
+
+        for key in (b'\x02', b'\x03', b'\x05', b'\x0d', b'\x41'):
+            item = packet.items[key]
+
+            with self.subTest(name=item.name):
+                self.assertEqual(encoder.encode_value({item.name: item.value.value}), bytes(item))
+
+    def test_order_and_checksum(self):
+        from klvdata.encoder import PacketEncoder
+        from klvdata.misb0601 import UASLocalMetadataSet
+        from klvdata.streamparser import StreamParser
+
+        when = datetime(2012, 9, 19, 20, 40, 44, 105300, tzinfo=timezone.utc)
+        packet = PacketEncoder().encode({'MissionID': 'Mission', 2: when, 1: 0, 5: 90.0})
+
+        self.assertTrue(packet.startswith(UASLocalMetadataSet.key))
+        self.assertTrue(UASLocalMetadataSet.verify(packet))
+
+        parsed = next(StreamParser(packet))
+        self.assertEqual(list(parsed.items), [b'\x02', b'\x03', b'\x05', b'\x01'])
+        self.assertEqual(parsed.items[b'\x02'].value.value, when)
+        self.assertAlmostEqual(parsed.items[b'\x05'].value.value, 90.0, places=2)
+
+    def test_range_endpoints(self):
+        from klvdata.elementparser import MappedElementParser
+        from klvdata.encoder import PacketEncoder
+        from klvdata.misb0601 import UASLocalMetadataSet
+        from klvdata.streamparser import StreamParser
+
+        encoder = PacketEncoder()
+        parsers = [parser for parser in UASLocalMetadataSet.parsers.values()
+                   if issubclass(parser, MappedElementParser) and parser._linear_map is not None]
+
+        # Latitude 90, longitude 180 and the full angles map a float error
+        # beyond their domain endpoints.
+        self.assertTrue({13, 14, 90, 91} <= {parser.TAG for parser in parsers})
+
+        for parser in parsers:
+            for value in parser._range:
+                with self.subTest(name=parser.__name__, value=value):
+                    packet = next(StreamParser(encoder.encode({parser.TAG: value})))
+                    self.assertAlmostEqual(packet.items[parser.key].value.value, value, places=4)
+
+    def test_nested(self):
+        from klvdata.encoder import PacketEncoder
+        from klvdata.record import SecurityRecord
+        from klvdata.streamparser import StreamParser
+
+        packet = PacketEncoder().encode({'SecurityLocalMetadataSet': SecurityRecord(1)})
+
+        self.assertEqual(next(StreamParser(packet)).record().SecurityLocalMetadataSet,
+                         SecurityRecord(1))
+
+    def test_errors(self):
+        from klvdata.encoder import PacketEncoder
+
+        with self.assertRaises(KeyError):
+            PacketEncoder().encode({'NotAnElement': 1.0})
+
+        with self.assertRaises(ValueError):
+            PacketEncoder().encode({'SensorLatitude': 91.0})
+
+
+if __name__ == "__main__":
+    unittest.main()
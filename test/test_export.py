@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+
+#  The MIT License (MIT)
+#
+# Copyright (c) 2017 Matthew Pare (paretech@gmail.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import unittest
+
+
+class Export(unittest.TestCase):
+    def records(self):
+        from klvdata.parallel import compact
+        from klvdata.streamparser import StreamParser
+
+        with open('./data/Cheyenne.bin', 'rb') as f:
+            return [compact(packet) for packet in StreamParser(f.read())]
+
+    def test_geojson(self):
+        import io
+        import json
+        from klvdata.export import write_geojson
+
+        records = self.records()
+        f = io.StringIO()
+        write_geojson(iter(records), f, properties=(2, 5), decimate=10)
+        features = json.loads(f.getvalue())['features']
+
+        self.assertEqual(len(features), len(records) + 1)
+        self.assertEqual(features[0]['geometry']['type'], 'Polygon')
+        self.assertEqual(features[0]['properties'], {
+            'Precision Time Stamp': '2012-09-19T20:40:44.105300+00:00',
+            'Platform Heading Angle': records[0][5]})
+
+        track = features[-1]['geometry']
+        self.assertEqual(track['type'], 'LineString')
+        self.assertEqual(len(track['coordinates']), (len(records) + 9) // 10)
+        self.assertEqual(track['coordinates'][1], [records[10][14], records[10][13]])
+
+    def test_geojson_track_only(self):
+        import io
+        import json
+        from klvdata.export import write_geojson
+
+        f = io.StringIO()
+        write_geojson(iter(self.records()), f, footprints=False)
+        features = json.loads(f.getvalue())['features']
+
+        self.assertEqual([feature['geometry']['type'] for feature in features], ['LineString'])
+
+    def test_geojson_empty(self):
+        import io
+        import json
+        from klvdata.export import write_geojson
+
+        f = io.StringIO()
+        write_geojson(iter([]), f)
+
+        self.assertEqual(json.loads(f.getvalue()), {'type': 'FeatureCollection', 'features': []})
+
+    def test_decimate(self):
+        import contextlib
+        import io
+        from klvdata.cli import main
+        from klvdata.export import write_geojson
+
+        self.assertRaises(ValueError, write_geojson, iter([]), io.StringIO(), decimate=0)
+
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            main(['export', './data/Cheyenne.bin', '--decimate', '0'])
+
+    def test_kml(self):
+        import io
+        import xml.etree.ElementTree as ElementTree
+        from klvdata.export import write_kml
+
+        records = self.records()
+        f = io.StringIO()
+        write_kml(iter(records), f, decimate=100)
+
+        ns = {'kml': 'http://www.opengis.net/kml/2.2'}
+        placemarks = ElementTree.fromstring(f.getvalue()).findall('./kml:Document/kml:Placemark', ns)
+
+        self.assertEqual(len(placemarks), len(records) + 1)
+        self.assertEqual(placemarks[0].find('.//kml:Data/kml:value', ns).text, '2012-09-19T20:40:44.105300+00:00')
+
+        coordinates = placemarks[-1].find('./kml:LineString/kml:coordinates', ns).text.split()
+        self.assertEqual(len(coordinates), 5)
+        self.assertEqual(coordinates[0], '{!r},{!r}'.format(records[0][14], records[0][13]))
+
+
+if __name__ == '__main__':
+    unittest.main()
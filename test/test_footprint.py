@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+
+#  The MIT License (MIT)
+#
+# Copyright (c) 2017 Matthew Pare (paretech@gmail.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@unittest.skipUnless(numpy, 'requires numpy')
+class Footprint(unittest.TestCase):
+    def columns(self, rows):
+        """Return columns of FOOTPRINT_TAGS with the values in rows, a list
+        of dictionaries of TAG to value."""
+        from klvdata.footprint import FOOTPRINT_TAGS
+
+        return {tag: numpy.array([row.get(tag, numpy.nan) for row in rows])
+                for tag in FOOTPRINT_TAGS}
+
+    def test_offset_and_full(self):
+        from klvdata.footprint import corners
+
+        offsets = {23: 40.0, 24: -105.0, 26: 0.01, 27: -0.01, 28: 0.01, 29: 0.01,
+                   30: -0.01, 31: 0.01, 32: -0.01, 33: -0.01}
+        full = dict(zip(range(82, 90), (1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0)))
+        partial = {**offsets, 82: 1.0, 83: 2.0}
+
+        latitudes, longitudes = corners(self.columns([offsets, {**offsets, **full}, partial, {}]))
+
+        self.assertEqual(latitudes.shape, (4, 4))
+        numpy.testing.assert_allclose(latitudes[0], [40.01, 40.01, 39.99, 39.99])
+        numpy.testing.assert_allclose(longitudes[0], [-105.01, -104.99, -104.99, -105.01])
+        numpy.testing.assert_allclose(latitudes[1], [1.0, 3.0, 5.0, 7.0])
+        numpy.testing.assert_allclose(longitudes[1], [2.0, 4.0, 6.0, 8.0])
+
+        # Incomplete full corners fall back to the offsets.
+        numpy.testing.assert_allclose(latitudes[2], latitudes[0])
+        self.assertTrue(numpy.isnan(latitudes[3]).all())
+
+    def test_antimeridian(self):
+        from klvdata.footprint import corners
+
+        row = {23: 0.0, 24: 179.99, 26: 0.0, 27: 0.02, 28: 0.0, 29: 0.0, 30: 0.0, 31: 0.0,
+               32: 0.0, 33: 0.0}
+        latitudes, longitudes = corners(self.columns([row]))
+
+        numpy.testing.assert_allclose(longitudes[0], [-179.99, 179.99, 179.99, 179.99])
+
+    def test_polygons(self):
+        from klvdata.footprint import to_geojson
+        from klvdata.footprint import to_wkt
+
+        latitudes = numpy.array([[1.0, 1.0, 0.0, 0.0], [numpy.nan] * 4])
+        longitudes = numpy.array([[0.0, 1.0, 1.0, 0.0], [numpy.nan] * 4])
+
+        # Clockwise corners make counter clockwise rings.
+        self.assertEqual(to_wkt(latitudes, longitudes),
+                         ['POLYGON ((0.0 1.0, 0.0 0.0, 1.0 0.0, 1.0 1.0, 0.0 1.0))', None])
+        self.assertEqual(to_geojson(latitudes, longitudes), [
+            {'type': 'Polygon', 'coordinates': [[[0.0, 1.0], [0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 1.0]]]},
+            None])
+
+    def test_counter_clockwise(self):
+        from klvdata.footprint import counter_clockwise
+        from klvdata.footprint import footprints
+        from klvdata.footprint import to_geojson
+
+        def area(ring):
+            return sum(x0 * y1 - x1 * y0 for (x0, y0), (x1, y1) in zip(ring, ring[1:]))
+
+        rings = [geometry['coordinates'][0] for geometry in to_geojson(*footprints('./data/Cheyenne.bin'))]
+        self.assertEqual(len(rings), 407)
+        self.assertTrue(all(area(ring) > 0 for ring in rings))
+
+        # Across the antimeridian.
+        ring = [(179.5, 1.0), (-179.5, 1.0), (-179.5, -1.0), (179.5, -1.0), (179.5, 1.0)]
+        self.assertEqual(counter_clockwise(ring), ring[::-1])
+        self.assertEqual(counter_clockwise(ring[::-1]), ring[::-1])
+
+    def test_recording(self):
+        from klvdata.footprint import footprints
+        from klvdata.streamparser import StreamParser
+
+        latitudes, longitudes = footprints('./data/Cheyenne.bin')
+
+        with open('./data/Cheyenne.bin', 'rb') as f:
+            for i, packet in enumerate(StreamParser(f.read())):
+                packet.MetadataList()
+
+                self.assertAlmostEqual(latitudes[i, 0], packet.GetFrameCenterLatitude() +
+                                       packet.GetOffsetCornerLatitudePoint1(), places=3)
+                self.assertAlmostEqual(longitudes[i, 2], packet.GetFrameCenterLongitude() +
+                                       packet.GetOffsetCornerLongitudePoint3(), places=3)
+
+
+if __name__ == '__main__':
+    unittest.main()
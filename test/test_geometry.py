@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+
+#  The MIT License (MIT)
+#
+# Copyright (c) 2017 Matthew Pare (paretech@gmail.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import unittest
+
+
+class Footprint(unittest.TestCase):
+    def test_full_corners(self):
+        from klvdata.geometry import footprint_ring
+
+        record = {82: 1.0, 83: 10.0, 84: 1.0, 85: 11.0, 86: 0.0, 87: 11.0, 88: 0.0, 89: 10.0,
+                  23: 50.0, 24: 50.0, 26: 0.1, 27: 0.1, 28: 0.1, 29: 0.1, 30: 0.1, 31: 0.1, 32: 0.1, 33: 0.1}
+
+        # Corners 1 to 4 run clockwise, the ring counter clockwise.
+        self.assertEqual(footprint_ring(record), [(10.0, 1.0), (10.0, 0.0), (11.0, 0.0), (11.0, 1.0), (10.0, 1.0)])
+
+    def test_offset_corners(self):
+        from klvdata.geometry import footprint_ring
+
+        record = {23: 0.0, 24: 179.5, 26: 1.0, 27: -1.0, 28: 1.0, 29: 1.0, 30: -1.0, 31: 1.0, 32: -1.0, 33: -1.0}
+
+        self.assertEqual(footprint_ring(record),
+                         [(178.5, 1.0), (178.5, -1.0), (-179.5, -1.0), (-179.5, 1.0), (178.5, 1.0)])
+
+    def test_missing(self):
+        from klvdata.geometry import footprint_ring
+
+        self.assertIsNone(footprint_ring({23: 0.0, 24: 0.0, 26: 1.0}))
+
+    def test_counter_clockwise(self):
+        from klvdata.geometry import counter_clockwise
+
+        ring = [(0.0, 0.0), (1.0, 0.0), (1.0, 1.0), (0.0, 0.0)]
+
+        self.assertEqual(counter_clockwise(ring), ring)
+        self.assertEqual(counter_clockwise(ring[::-1]), ring)
+
+
+if __name__ == '__main__':
+    unittest.main()
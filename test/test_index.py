@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+
+#  The MIT License (MIT)
+#
+# Copyright (c) 2017 Matthew Pare (paretech@gmail.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import os
+import shutil
+import tempfile
+import unittest
+
+
+class PacketIndexTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, 'Cheyenne.bin')
+        shutil.copy('./data/Cheyenne.bin', self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_build(self):
+        from klvdata.index import PacketIndex
+        from klvdata.misb0601 import UASLocalMetadataSet
+        from klvdata.streamparser import StreamParser
+
+        index = PacketIndex.build(self.path)
+
+        with open(self.path, 'rb') as f:
+            data = f.read()
+
+        packets = list(StreamParser(data))
+        self.assertEqual(len(index), len(packets))
+
+        offset = 0
+        for i, packet in enumerate(packets):
+            entry = index[i]
+            self.assertEqual(entry.offset, offset)
+            self.assertEqual(data[offset:offset + entry.length], bytes(packet))
+            self.assertEqual(entry.key, UASLocalMetadataSet.key)
+            self.assertEqual(entry.timestamp.to_bytes(8, 'big'), bytes(packet[b'\x02'].value))
+            offset += entry.length
+
+    def test_save_load(self):
+        from klvdata.index import PacketIndex
+
+        index = PacketIndex.build(self.path)
+        index.save(self.path + '.idx')
+        loaded = PacketIndex.load(self.path + '.idx')
+
+        self.assertEqual(list(map(tuple, loaded)), list(map(tuple, index)))
+        self.assertEqual((loaded.size, loaded.mtime), (index.size, index.mtime))
+
+        with open(self.path + '.idx', 'r+b') as f:
+            f.truncate(100)
+
+        with self.assertRaises(ValueError):
+            PacketIndex.load(self.path + '.idx')
+
+    def test_open_reuses_sidecar(self):
+        from klvdata.index import PacketIndex
+
+        index = PacketIndex.open(self.path)
+        self.assertTrue(os.path.exists(self.path + PacketIndex.suffix))
+
+        # A current sidecar is used as is, even if its content differs.
+        index.timestamps[0] = 0
+        index.save(self.path + PacketIndex.suffix)
+        self.assertEqual(PacketIndex.open(self.path).timestamps[0], 0)
+
+        # Touching the recording invalidates it.
+        os.utime(self.path, ns=(0, index.mtime + 10 ** 9))
+        self.assertNotEqual(PacketIndex.open(self.path).timestamps[0], 0)
+
+    def test_open_resync(self):
+        from klvdata.index import PacketIndex
+
+        with open(self.path, 'r+b') as f:
+            data = f.read()
+            f.seek(0)
+            f.write(b'\x00junk' + data)
+
+        self.assertNotEqual(len(PacketIndex.open(self.path)), 407)
+
+        # A sidecar framed without resync is not reused with it, or the
+        # other way round.
+        index = PacketIndex.open(self.path, resync=True)
+        self.assertEqual((len(index), index.resync, index[0].offset), (407, True, 5))
+        self.assertEqual(len(PacketIndex.load(self.path + PacketIndex.suffix)), 407)
+        self.assertNotEqual(len(PacketIndex.open(self.path)), 407)
+
+        # Sidecars are written through temporary files, none of them left.
+        self.assertEqual(sorted(os.listdir(self.tmp)), ['Cheyenne.bin', 'Cheyenne.bin' + PacketIndex.suffix])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+
+#  The MIT License (MIT)
+#
+# Copyright (c) 2017 Matthew Pare (paretech@gmail.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import contextlib
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+
+class Ingest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.inputs = os.path.join(self.tmp, 'inputs')
+
+        for name in ('a', 'b'):
+            os.makedirs(os.path.join(self.inputs, name))
+            shutil.copy('./data/Cheyenne.bin', os.path.join(self.inputs, name))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_expand(self):
+        from klvdata.ingest import expand
+
+        expected = [os.path.join(self.inputs, name, 'Cheyenne.bin') for name in ('a', 'b')]
+
+        self.assertEqual(expand([self.inputs]), expected)
+        self.assertEqual(expand([os.path.join(self.inputs, '*', '*.bin')]), expected)
+        self.assertEqual(expand([expected[1], expected[1]]), expected[1:])
+        self.assertEqual(expand([self.inputs], '*.ts'), [])
+
+        # Outputs and sidecars of earlier runs are not recordings.
+        for suffix in ('.jsonl', '.csv', '.columns.json', '.klvidx', '.klvgeo', '.klvidx.x1y2.partial'):
+            open(expected[0] + suffix, 'w').close()
+
+        self.assertEqual(expand([self.inputs]), expected)
+
+    def test_sinks(self):
+        from klvdata.ingest import ingest_file
+
+        path = os.path.join(self.inputs, 'a', 'Cheyenne.bin')
+
+        for sink in ('jsonl', 'csv', 'columns'):
+            output = os.path.join(self.tmp, 'out.' + sink)
+            self.assertEqual(ingest_file(path, output, sink)[:2], (path, 407))
+
+            with open(output, newline='') as f:
+                if sink == 'jsonl':
+                    records = [json.loads(line) for line in f]
+                    self.assertEqual(len(records), 407)
+                    self.assertEqual(records[0]['3'], 'ESRI_Metadata_Collect')
+                elif sink == 'csv':
+                    rows = list(csv.DictReader(f))
+                    self.assertEqual(len(rows), 407)
+                    self.assertEqual(rows[0]['Mission ID'], 'ESRI_Metadata_Collect')
+                    self.assertEqual(rows[0]['Precision Time Stamp'], '2012-09-19T20:40:44.105300+00:00')
+                else:
+                    columns = json.load(f)
+                    self.assertEqual(len(columns['13']), 407)
+                    self.assertEqual(columns['13'][0], 41.1438)
+
+    def test_cli(self):
+        from klvdata.cli import main
+
+        output = os.path.join(self.tmp, 'out')
+
+        with contextlib.redirect_stderr(io.StringIO()) as stderr:
+            main(['ingest', self.inputs, '--format', 'jsonl', '--output', output, '--jobs', '1'])
+
+        for name in ('a', 'b'):
+            with open(os.path.join(output, name, 'Cheyenne.bin.jsonl')) as f:
+                self.assertEqual(sum(1 for _ in f), 407)
+
+        self.assertIn('2 files, 814 packets', stderr.getvalue())
+
+    def test_cli_rerun(self):
+        from klvdata.cli import main
+
+        # Outputs written into the input tree are skipped when run again.
+        for _ in range(2):
+            with contextlib.redirect_stderr(io.StringIO()) as stderr:
+                main(['ingest', self.inputs, '--output', self.inputs, '--jobs', '1'])
+
+            self.assertIn('2 files, 814 packets', stderr.getvalue())
+
+    def test_cli_jobs(self):
+        from klvdata.cli import main
+
+        for command in ('ingest', 'decode'):
+            for jobs in ('0', '-1'):
+                with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+                    main([command, self.inputs, '--jobs', jobs])
+
+
+if __name__ == '__main__':
+    unittest.main()
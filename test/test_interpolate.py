@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+
+#  The MIT License (MIT)
+#
+# Copyright (c) 2017 Matthew Pare (paretech@gmail.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@unittest.skipUnless(numpy, 'requires numpy')
+class Interpolate(unittest.TestCase):
+    def setUp(self):
+        self.start = numpy.datetime64('2020-01-01T00:00:00', 'us')
+        self.columns = {
+            2: self.start + numpy.array([0, 100000, 200000, 300000]).astype('timedelta64[us]'),
+            5: numpy.array([350.0, 10.0, numpy.nan, 30.0]),
+            13: numpy.array([10.0, 20.0, 30.0, 40.0]),
+            14: numpy.array([179.0, -179.0, -178.0, -177.0]),
+        }
+
+    def test_linear(self):
+        from klvdata.interpolate import interpolate
+
+        times = self.start + numpy.array([0, 50000, 250000]).astype('timedelta64[us]')
+        values = interpolate(self.columns, times, tags=[13])
+
+        self.assertEqual(list(values), [13])
+        numpy.testing.assert_allclose(values[13], [10.0, 15.0, 35.0])
+
+    def test_angles(self):
+        from klvdata.interpolate import interpolate
+
+        times = self.start + numpy.array([25000, 50000, 200000]).astype('timedelta64[us]')
+        values = interpolate(self.columns, times)
+
+        # Heading turns through north and skips the missing value.
+        numpy.testing.assert_allclose(values[5], [355.0, 0.0, 20.0])
+        numpy.testing.assert_allclose(values[14], [179.5, -180.0, -178.0])
+
+    def test_microseconds(self):
+        from klvdata.interpolate import interpolate
+
+        micros = self.start.astype(numpy.int64) + numpy.array([-1, 150000, 300001])
+        values = interpolate(self.columns, micros, tags=[13])
+
+        # Outside the span of the packets values are missing.
+        numpy.testing.assert_allclose(values[13], [numpy.nan, 25.0, numpy.nan])
+
+    def test_unordered(self):
+        from klvdata.interpolate import interpolate
+
+        order = [2, 0, 3, 1]
+        columns = {tag: column[order] for tag, column in self.columns.items()}
+        columns[2] = numpy.concatenate([columns[2], [numpy.datetime64('NaT')]])
+        columns[13] = numpy.concatenate([columns[13], [99.0]])
+
+        times = self.start + numpy.array([50000, 250000]).astype('timedelta64[us]')
+
+        numpy.testing.assert_allclose(interpolate(columns, times, tags=[13])[13], [15.0, 35.0])
+
+    def test_recording(self):
+        from klvdata.columns import decode_columns
+        from klvdata.interpolate import interpolate
+
+        columns = decode_columns('./data/Cheyenne.bin')
+        values = interpolate(columns, columns[2])
+
+        for tag in (5, 13, 14):
+            numpy.testing.assert_allclose(values[tag], columns[tag])
+
+
+if __name__ == '__main__':
+    unittest.main()
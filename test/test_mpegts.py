@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+
+#  The MIT License (MIT)
+#
+# Copyright (c) 2017 Matthew Pare (paretech@gmail.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import os
+import tempfile
+import unittest
+
+
+def ts_packets(pid, payload, counter=0):
+    """Return payload split into TS packets of pid, padded with adaptation
+    field stuffing."""
+    packets = []
+
+    for i in range(0, len(payload), 184):
+        chunk = payload[i:i + 184]
+        header = bytes((0x47, (0x40 if i == 0 else 0x00) | pid >> 8, pid & 0xFF))
+        stuffing = 184 - len(chunk)
+
+        if stuffing:
+            field = bytes((stuffing - 1,)) + (b'\x00' + b'\xff' * (stuffing - 2) if stuffing > 1 else b'')
+            packets.append(header + bytes((0x30 | counter,)) + field + chunk)
+        else:
+            packets.append(header + bytes((0x10 | counter,)) + chunk)
+
+        counter = (counter + 1) & 0x0F
+
+    return packets
+
+
+def section(table_id, extension, body):
+    length = 5 + len(body) + 4
+    return (bytes((table_id, 0xB0 | length >> 8, length & 0xFF)) + extension.to_bytes(2, 'big') +
+            b'\xc1\x00\x00' + body + b'\x00' * 4)
+
+
+def pat(pmt_pid):
+    return b'\x00' + section(0x00, 1, b'\x00\x01' + bytes((0xE0 | pmt_pid >> 8, pmt_pid & 0xFF)))
+
+
+def pmt(pid, stream_type, descriptors=b''):
+    body = (b'\xe1\x00\xf0\x00' + bytes((stream_type, 0xE0 | pid >> 8, pid & 0xFF, 0xF0, len(descriptors))) +
+            descriptors)
+    return b'\x00' + section(0x02, 1, body)
+
+
+def pes(stream_id, pts, payload):
+    header = bytes((0x80, 0x80, 0x05, 0x21 | (pts >> 30 & 0x07) << 1, pts >> 22 & 0xFF,
+                    (pts >> 14 & 0xFE) | 0x01, pts >> 7 & 0xFF, (pts << 1 & 0xFE) | 0x01))
+    return b'\x00\x00\x01' + bytes((stream_id,)) + (len(header) + len(payload)).to_bytes(2, 'big') + header + payload
+
+
+def klv_packets():
+    data = open('./data/Cheyenne.bin', 'rb').read()
+    return [data[i:i + 259] for i in range(0, len(data), 259)]
+
+
+class TransportStream(unittest.TestCase):
+    klv_pid = 0x0101
+
+    def stream(self, packets, stream_type=0x06, stream_id=0xBD):
+        """Return a TS of the KLV packets, one per PES, interleaved with
+        packets on PIDs whose bytes straddle the KLV PID."""
+        descriptors = b'\x05\x04KLVA' if stream_type == 0x06 else b''
+        ts = ts_packets(0, pat(0x0100)) + ts_packets(0x0100, pmt(self.klv_pid, stream_type, descriptors))
+        counter = 0
+
+        for i, packet in enumerate(packets):
+            if stream_id == 0xFC:
+                packet = b'\x00' + bytes((i & 0xFF,)) + b'\xdf' + len(packet).to_bytes(2, 'big') + packet
+
+            chunks = ts_packets(self.klv_pid, pes(stream_id, 3003 * i, packet), counter)
+            counter = (counter + len(chunks)) & 0x0F
+            ts += chunks
+            ts += ts_packets(0x1001, b'\x01' * 184) + ts_packets(0x0110, b'\x01' * 184)
+
+        return ts
+
+    def parse(self, ts, chunk_packets=None):
+        from klvdata.mpegts import TransportStreamParser
+
+        parser = TransportStreamParser(b''.join(ts))
+
+        if chunk_packets:
+            parser.chunk_packets = chunk_packets
+
+        return parser, [(pts, bytes(element)) for pts, element in parser]
+
+    def test_klv_pids(self):
+        from klvdata.mpegts import TransportStreamParser
+
+        parser = TransportStreamParser(b''.join(self.stream(klv_packets()[:2])))
+
+        self.assertEqual(parser.programs(), [0x0100])
+        self.assertEqual(parser.klv_pids(), [self.klv_pid])
+
+    def test_asynchronous(self):
+        packets = klv_packets()
+        parser, decoded = self.parse(self.stream(packets), chunk_packets=7)
+
+        self.assertEqual([pts for pts, _ in decoded], [3003 * i for i in range(len(packets))])
+        self.assertEqual([element for _, element in decoded], packets)
+        self.assertEqual(parser.discontinuities, 0)
+
+    def test_synchronous(self):
+        packets = klv_packets()[:20]
+        _, decoded = self.parse(self.stream(packets, stream_type=0x15, stream_id=0xFC))
+
+        self.assertEqual([element for _, element in decoded], packets)
+
+    def test_discontinuity(self):
+        packets = klv_packets()[:3]
+        ts = self.stream(packets)
+
+        # Drop the second TS packet of the second PES.
+        del ts[2 + 4]
+
+        parser, decoded = self.parse(ts)
+
+        self.assertEqual([element for _, element in decoded], packets[:1] + packets[2:])
+        self.assertEqual(parser.discontinuities, 1)
+
+        # A KLV packet split across the lost PES is dropped with it, and the
+        # packets after it are framed from the next PES.
+        packets = klv_packets()[:4]
+        payloads = [packets[0] + packets[1][:100], packets[1][100:] + packets[2], packets[3]]
+        ts = self.stream(payloads)
+
+        # Drop the second TS packet of the second PES.
+        del ts[2 + len(ts_packets(self.klv_pid, pes(0xBD, 0, payloads[0]))) + 2 + 1]
+
+        parser, decoded = self.parse(ts)
+
+        self.assertEqual([element for _, element in decoded], [packets[0], packets[3]])
+        self.assertEqual(parser.discontinuities, 1)
+
+    def test_lost_sync(self):
+        packets = klv_packets()[:5]
+        ts = self.stream(packets)
+        ts.insert(7, b'\x47\x00garbage')
+
+        _, decoded = self.parse(ts)
+
+        self.assertEqual([element for _, element in decoded], packets)
+
+    def test_from_path(self):
+        from klvdata.mpegts import TransportStreamParser
+
+        packets = klv_packets()[:5]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'klv.ts')
+
+            with open(path, 'wb') as f:
+                f.write(b''.join(self.stream(packets)))
+
+            with TransportStreamParser.from_path(path) as parser:
+                self.assertEqual([bytes(element) for _, element in parser], packets)
+
+
+if __name__ == '__main__':
+    unittest.main()
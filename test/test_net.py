@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+
+#  The MIT License (MIT)
+#
+# Copyright (c) 2017 Matthew Pare (paretech@gmail.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import queue
+import socket
+import unittest
+
+
+class UDPReceiver(unittest.TestCase):
+    def setUp(self):
+        from klvdata.net import UDPReceiver
+
+        with open('./data/Cheyenne.bin', 'rb') as f:
+            data = f.read()
+
+        self.packets = [data[i:i + 259] for i in range(0, len(data), 259)]
+        self.received = []
+        self.receiver = UDPReceiver(0, host='127.0.0.1', callback=self.deliver)
+        self.sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def tearDown(self):
+        self.sender.close()
+        self.receiver.close()
+
+    def deliver(self, sender, packet):
+        self.received.append(bytes(packet))
+
+    def send(self, *datagrams):
+        for datagram in datagrams:
+            self.sender.sendto(datagram, self.receiver.address)
+
+    def poll(self, count):
+        while len(self.received) < count and self.receiver.poll(1):
+            pass
+
+    def test_datagrams(self):
+        self.send(*self.packets[:10])
+        self.poll(10)
+
+        self.assertEqual(self.received, self.packets[:10])
+        self.assertEqual(self.receiver.datagrams, 10)
+        self.assertEqual(self.receiver.packets, 10)
+
+    def test_reassembly(self):
+        # Two packets in one datagram, then one packet split over two.
+        self.send(self.packets[0] + self.packets[1], self.packets[2][:100], self.packets[2][100:])
+        self.poll(3)
+
+        self.assertEqual(self.received, self.packets[:3])
+
+    def test_truncated(self):
+        self.send(self.packets[0][:100], self.packets[1])
+        self.poll(1)
+
+        self.assertEqual(self.received, self.packets[1:2])
+        self.assertEqual(self.receiver.truncated, 1)
+
+    def test_parse_errors(self):
+        from klvdata.streamparser import StreamParser
+
+        class Failing(object):
+            key = b'\xff' * 16
+
+            def __init__(self, value):
+                raise ValueError(value)
+
+        StreamParser.parsers[Failing.key] = Failing
+
+        try:
+            self.send(Failing.key + b'\x01\x00' + self.packets[0])
+            self.poll(1)
+        finally:
+            del StreamParser.parsers[Failing.key]
+
+        self.assertEqual(self.received, self.packets[:1])
+        self.assertEqual(self.receiver.parse_errors, 1)
+
+    def test_verify(self):
+        from klvdata.net import UDPReceiver
+
+        corrupted = bytearray(self.packets[1])
+        corrupted[100] ^= 0xFF
+
+        with UDPReceiver(0, host='127.0.0.1', callback=self.deliver, verify='skip') as receiver:
+            for datagram in (self.packets[0], bytes(corrupted), self.packets[2]):
+                self.sender.sendto(datagram, receiver.address)
+
+            while len(self.received) < 2 and receiver.poll(1):
+                pass
+
+            self.assertEqual(self.received, [self.packets[0], self.packets[2]])
+            self.assertEqual(receiver.verify_failures, 1)
+
+    def test_kernel_drops(self):
+        from klvdata.net import UDPReceiver
+        from klvdata.net import SO_RXQ_OVFL
+
+        if SO_RXQ_OVFL is None:
+            self.skipTest('drop counts are not reported on this system')
+
+        with UDPReceiver(0, host='127.0.0.1', callback=self.deliver, buffer_size=4096) as receiver:
+            for _ in range(400):
+                self.sender.sendto(self.packets[0], receiver.address)
+
+            while receiver.poll(0.2):
+                pass
+
+            # Drops are reported with the next datagram queued after them.
+            self.sender.sendto(self.packets[0], receiver.address)
+            receiver.poll(1)
+
+            self.assertGreater(receiver.kernel_drops, 0)
+            self.assertEqual(receiver.kernel_drops + receiver.datagrams, 401)
+
+    def test_queue(self):
+        from klvdata.net import UDPReceiver
+
+        packets = queue.Queue(maxsize=2)
+
+        with UDPReceiver(0, host='127.0.0.1', queue=packets) as receiver:
+            for packet in self.packets[:3]:
+                self.sender.sendto(packet, receiver.address)
+
+            while receiver.datagrams < 3 and receiver.poll(1):
+                pass
+
+            self.assertEqual(packets.qsize(), 2)
+            self.assertEqual(receiver.queue_drops, 1)
+            self.assertEqual(receiver.packets, 2)
+
+            sender, packet = packets.get()
+            self.assertEqual(sender[1], self.sender.getsockname()[1])
+            self.assertEqual(bytes(packet), self.packets[0])
+
+    def test_idle(self):
+        import time
+        from klvdata.net import UDPReceiver
+
+        with UDPReceiver(0, host='127.0.0.1', callback=self.deliver, idle=0.05) as receiver:
+            self.sender.sendto(self.packets[0][:100], receiver.address)
+            receiver.poll(1)
+            self.assertEqual(len(receiver.parsers), 1)
+
+            time.sleep(0.1)
+            receiver.poll(0)
+
+            self.assertEqual(receiver.parsers, {})
+            self.assertEqual(receiver.truncated, 1)
+
+            self.sender.sendto(self.packets[1], receiver.address)
+            receiver.poll(1)
+
+            self.assertEqual(self.received, self.packets[1:2])
+            self.assertEqual(receiver.truncated, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
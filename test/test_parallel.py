@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+
+#  The MIT License (MIT)
+#
+# Copyright (c) 2017 Matthew Pare (paretech@gmail.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import unittest
+
+
+class ParallelDecode(unittest.TestCase):
+    def test_matches_serial(self):
+        from klvdata.index import PacketIndex
+        from klvdata.parallel import compact
+        from klvdata.parallel import decode_parallel
+        from klvdata.streamparser import StreamParser
+
+        path = './data/Cheyenne.bin'
+
+        with open(path, 'rb') as f:
+            expected = [compact(packet) for packet in StreamParser(f)]
+
+        decoded = list(decode_parallel(path, workers=2, index=PacketIndex.build(path)))
+
+        self.assertEqual(len(decoded), 407)
+        self.assertEqual(decoded, expected)
+
+    def test_packet_ranges(self):
+        from klvdata.index import PacketIndex
+        from klvdata.parallel import packet_ranges
+
+        index = PacketIndex.build('./data/Cheyenne.bin')
+        ranges = packet_ranges(index, 8)
+
+        self.assertEqual(len(ranges), 8)
+        self.assertEqual(ranges[0][0], 0)
+        self.assertEqual(ranges[-1][1], 407 * 259)
+
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            self.assertEqual(end, start)
+            self.assertEqual(start % 259, 0)
+
+        self.assertEqual(packet_ranges(PacketIndex(), 8), [])
+
+    def test_decode_range(self):
+        from klvdata.parallel import decode_range
+
+        decoded = decode_range('./data/Cheyenne.bin', 259 * 10, 259 * 20)
+
+        self.assertEqual(len(decoded), 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -74,5 +74,96 @@ class ParserSingleLong(ParserTestCase):
         self.assertEqual(value, self.value)
 
 
+class BufferedParserSingleShort(ParserSingleShort):
+    def setUp(self):
+        super().setUp()
+
+        from klvdata.klvparser import BufferedKLVParser
+        self.parser = BufferedKLVParser(self.packet, key_length=1)
+
+    def test_memoryview(self):
+        key, value = next(self.parser)
+        self.assertIsInstance(value, memoryview)
+        self.assertTrue(value.readonly)
+
+
+class BufferedParserSingleLong(ParserSingleLong):
+    def setUp(self):
+        super().setUp()
+
+        from io import BytesIO
+        from klvdata.klvparser import BufferedKLVParser
+        self.parser = BufferedKLVParser(BytesIO(self.packet), key_length=16)
+
+
+class BufferedParserChunks(unittest.TestCase):
+    def test_matches_klvparser(self):
+        from io import BytesIO
+        from klvdata.klvparser import BufferedKLVParser
+        from klvdata.klvparser import KLVParser
+
+        with open('./data/Cheyenne.bin', 'rb') as f:
+            data = f.read()
+
+        expected = list(KLVParser(data, key_length=16))
+
+        # Chunks smaller than a packet force elements to straddle reads.
+        for buffer_size in (1, 100, 4096):
+            parser = BufferedKLVParser(BytesIO(data), key_length=16, buffer_size=buffer_size)
+            self.assertEqual([(bytes(k), bytes(v)) for k, v in parser], expected)
+
+    def test_short_value(self):
+        from klvdata.klvparser import BufferedKLVParser
+        from klvdata.klvparser import KLVParser
+
+        for packet in (b'\x02\x05abc', b'\x02\x00\x03', b'\x02\x05', b'\x02'):
+            self.assertEqual(
+                [(bytes(k), bytes(v)) for k, v in BufferedKLVParser(packet, key_length=1)],
+                list(KLVParser(packet, key_length=1)))
+
+
+class ResyncParser(unittest.TestCase):
+    def test_chunks(self):
+        from io import BytesIO
+        from klvdata.klvparser import KLVParser
+        from klvdata.klvparser import ResyncKLVParser
+
+        with open('./data/Cheyenne.bin', 'rb') as f:
+            data = f.read()
+
+        expected = list(KLVParser(data, key_length=16))
+        keys = {expected[0][0]: None}
+
+        # Garbage containing a partial key before, between and after packets.
+        noise = expected[0][0][:6]
+        source = noise + b''.join(expected[0][0] + b'\x81\xF1' + v + noise for k, v in expected)
+
+        for buffer_size in (1, 7, 100, 4096):
+            parser = ResyncKLVParser(BytesIO(source), keys, key_length=16, buffer_size=buffer_size)
+            self.assertEqual([(bytes(k), bytes(v)) for k, v in parser], expected)
+            self.assertEqual(parser.skipped, len(noise) * (len(expected) + 1))
+
+    def test_rejects_length(self):
+        from klvdata.klvparser import ResyncKLVParser
+
+        key = b'\x06\x0E\x2B\x34'
+        source = b'\x00' + key + b'\x80' + key + b'\x84\xFF\xFF\xFF\xFF' + key + b'\x02ok'
+
+        parser = ResyncKLVParser(source, {key: None}, key_length=4)
+        self.assertEqual([(bytes(k), bytes(v)) for k, v in parser], [(key, b'ok')])
+        self.assertEqual(parser.skipped, 15)
+
+
+class SelectElements(unittest.TestCase):
+    def test_select(self):
+        from klvdata.klvparser import select_elements
+
+        data = b'\x01\x01a' + b'\x02\x81\x03bcd' + b'\x03\x00' + b'\x04\x05ef'
+
+        self.assertEqual(list(select_elements(data, {b'\x02', b'\x03'}, 1)), [(b'\x02', b'bcd'), (b'\x03', b'')])
+        self.assertEqual(list(select_elements(memoryview(data), {b'\x04'}, 1)), [(b'\x04', b'ef')])
+        self.assertEqual(list(select_elements(data, set(), 1)), [])
+
+
 if __name__ == "__main__":
     unittest.main()
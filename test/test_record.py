@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+
+#  The MIT License (MIT)
+#
+# Copyright (c) 2017 Matthew Pare (paretech@gmail.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import pickle
+import unittest
+from datetime import datetime
+
+
+class PacketRecordTest(unittest.TestCase):
+    def setUp(self):
+        with open('./data/Cheyenne.bin', 'rb') as f:
+            self.data = f.read()
+
+    def test_values(self):
+        from klvdata.streamparser import StreamParser
+        from klvdata.record import PacketRecord, SecurityRecord
+
+        packet = next(StreamParser(self.data))
+        record = packet.record()
+
+        self.assertIsInstance(record, PacketRecord)
+        self.assertEqual(record.MissionID, 'ESRI_Metadata_Collect')
+        self.assertEqual(record.PlatformHeadingAngle, 201.2726)
+        self.assertIsInstance(record.PrecisionTimeStamp, datetime)
+        self.assertEqual(record.SecurityLocalMetadataSet, SecurityRecord(1))
+        self.assertIsNone(record.PlatformTrueAirspeed)
+
+    def test_metadata_list(self):
+        from klvdata.streamparser import StreamParser
+
+        for packet in StreamParser(self.data):
+            record = packet.record()
+
+            for tag, (name, value) in packet.MetadataList().items():
+                item = packet.items[bytes((tag,))]
+                field = getattr(record, type(item).__name__)
+                self.assertEqual(str(field), value)
+
+    def test_buffered(self):
+        from klvdata.streamparser import StreamParser
+
+        expected = [packet.record() for packet in StreamParser(self.data)]
+
+        self.assertEqual([packet.record() for packet in StreamParser(self.data, buffered=True)],
+                         expected)
+        self.assertEqual([packet.record() for packet in StreamParser(self.data, lazy=True)],
+                         expected)
+
+    def test_pickle(self):
+        from klvdata.streamparser import StreamParser
+
+        record = next(StreamParser(self.data)).record()
+
+        self.assertEqual(pickle.loads(pickle.dumps(record)), record)
+
+    def test_field_types(self):
+        from klvdata.record import PacketRecord
+
+        self.assertIs(PacketRecord.__annotations__['SensorLatitude'], float)
+        self.assertIs(PacketRecord.__annotations__['PlatformTailNumber'], str)
+        self.assertIs(PacketRecord.__annotations__['VMTILocalSet'], bytes)
+
+    def test_no_record_type(self):
+        from klvdata.element import UnknownElement
+        from klvdata.setparser import SetParser
+
+        class OtherSet(SetParser):
+            key, name = b'\x01', 'Other Set'
+            parsers = {}
+            _unknown_element = UnknownElement
+
+        with self.assertRaises(TypeError):
+            OtherSet(b'').record()
+
+
+if __name__ == "__main__":
+    unittest.main()
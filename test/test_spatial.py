@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+
+#  The MIT License (MIT)
+#
+# Copyright (c) 2017 Matthew Pare (paretech@gmail.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import os
+import shutil
+import tempfile
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@unittest.skipUnless(numpy, 'requires numpy')
+class FootprintIndexTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, 'Cheyenne.bin')
+        shutil.copy('./data/Cheyenne.bin', self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def brute_force(self, index, west, south, east, north):
+        boxes = index.boxes
+        hits = ((boxes[:, 0] <= east) & (boxes[:, 2] >= west) &
+                (boxes[:, 1] <= north) & (boxes[:, 3] >= south))
+
+        return numpy.sort(index.offsets[hits]).tolist()
+
+    def test_build(self):
+        from klvdata.footprint import footprints
+        from klvdata.spatial import FootprintIndex
+
+        index = FootprintIndex.build(self.path, capacity=4)
+        latitudes, longitudes = footprints(self.path)
+
+        self.assertEqual(len(index), 407)
+        self.assertEqual(sorted(index.offsets.tolist()), list(range(0, 407 * 259, 259)))
+
+        # Each box holds the corners of its packet.
+        row = index.offsets // 259
+        self.assertTrue((index.boxes[:, 0] <= longitudes[row].min(axis=1)).all())
+        self.assertTrue((index.boxes[:, 3] >= latitudes[row].max(axis=1)).all())
+
+        # Every node holds the boxes below it.
+        for level, below in zip(index.levels, index.levels[1:] + [index.boxes]):
+            for i, node in enumerate(level):
+                children = below[i * 4:(i + 1) * 4]
+                self.assertTrue((node[:2] <= children[:, :2]).all())
+                self.assertTrue((node[2:] >= children[:, 2:]).all())
+
+    def test_query(self):
+        from klvdata.spatial import FootprintIndex
+
+        index = FootprintIndex.build(self.path, capacity=4)
+        west, south, east, north = index.levels[0][0]
+
+        for box in ((-104.80, 41.13, -104.79, 41.135),
+                    (west, south, east, north),
+                    (0.0, 0.0, 1.0, 1.0)):
+            self.assertEqual(index.query(*box).tolist(), self.brute_force(index, *box))
+
+        self.assertEqual(len(index.query(west, south, east, north)), 407)
+        self.assertEqual(index.query_point(-104.7855, 41.1383).tolist(),
+                         self.brute_force(index, -104.7855, 41.1383, -104.7855, 41.1383))
+
+    def test_pack(self):
+        from klvdata.spatial import FootprintIndex
+
+        rng = numpy.random.default_rng(1)
+        points = rng.uniform([-180, -80], [180, 80], (5000, 2))
+        index = FootprintIndex.pack(numpy.arange(5000), numpy.column_stack([points, points + 1]))
+
+        self.assertEqual(len(index.levels[0]), 1)
+
+        for box in ((10, 10, 20, 20), (-180, -90, 180, 90), (100, 85, 110, 89)):
+            self.assertEqual(index.query(*box).tolist(), self.brute_force(index, *box))
+
+        empty = FootprintIndex.pack([], [])
+        self.assertEqual(empty.query(-180, -90, 180, 90).tolist(), [])
+
+    def test_open(self):
+        from klvdata.spatial import FootprintIndex
+
+        built = FootprintIndex.open(self.path)
+        sidecar = self.path + FootprintIndex.suffix
+        self.assertTrue(os.path.exists(sidecar))
+
+        loaded = FootprintIndex.open(self.path)
+        self.assertEqual(loaded.offsets.tolist(), built.offsets.tolist())
+        self.assertEqual(loaded.boxes.tolist(), built.boxes.tolist())
+        self.assertEqual(loaded.query(-104.80, 41.13, -104.79, 41.135).tolist(),
+                         built.query(-104.80, 41.13, -104.79, 41.135).tolist())
+
+        # A damaged sidecar is rebuilt.
+        with open(sidecar, 'wb') as f:
+            f.write(b'not an index')
+
+        self.assertEqual(FootprintIndex.open(self.path).offsets.tolist(), built.offsets.tolist())
+        self.assertRaises(ValueError, FootprintIndex.load, self.path)
+
+    def test_open_resync(self):
+        from klvdata.index import PacketIndex
+        from klvdata.spatial import FootprintIndex
+
+        with open(self.path, 'r+b') as f:
+            data = f.read()
+            f.seek(0)
+            f.write(b'\x00junk' + data)
+
+        # Sidecars framed without resync are not reused with it.
+        PacketIndex.open(self.path)
+        FootprintIndex.open(self.path)
+        index = FootprintIndex.open(self.path, resync=True)
+
+        self.assertEqual(len(index), 407)
+        self.assertEqual(sorted(index.offsets.tolist()), list(range(5, 5 + 407 * 259, 259)))
+        self.assertTrue(FootprintIndex.load(self.path + FootprintIndex.suffix).resync)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+#  The MIT License (MIT)
+#
+# Copyright (c) 2017 Matthew Pare (paretech@gmail.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import unittest
+
+
+class PacketStateTest(unittest.TestCase):
+    def setUp(self):
+        from klvdata.encoder import PacketEncoder
+        from klvdata.streamparser import StreamParser
+
+        with open('./data/Cheyenne.bin', 'rb') as f:
+            self.records = [packet.record() for packet in StreamParser(f.read())]
+
+        # Change-only packets: the first full, then only what changed.
+        encoder = PacketEncoder()
+        packets = [encoder.encode(self.records[0])]
+
+        for previous, record in zip(self.records, self.records[1:]):
+            packets.append(encoder.encode({name: value for name, value, last in
+                                           zip(record._fields, record, previous)
+                                           if value != last and name != 'Checksum'}))
+
+        self.data = b''.join(packets)
+
+    def test_snapshots(self):
+        from klvdata.state import PacketState
+        from klvdata.streamparser import StreamParser
+
+        state = PacketState()
+        snapshots = [state.snapshot() for view in state.merge(StreamParser(self.data))]
+
+        self.assertEqual(state.packets, len(self.records))
+        self.assertEqual([record._replace(Checksum=None) for record in snapshots],
+                         [record._replace(Checksum=None) for record in self.records])
+
+    def test_deltas(self):
+        from klvdata.state import PacketState
+        from klvdata.streamparser import StreamParser
+
+        state = PacketState()
+        packets = list(StreamParser(self.data))
+        deltas = list(state.merge(packets, deltas=True))
+
+        self.assertEqual(len(deltas[0]), len(state.view))
+        self.assertEqual(deltas[1][5], self.records[1].PlatformHeadingAngle)
+        self.assertNotIn(3, deltas[1])
+
+        # Nothing changes when a packet is repeated.
+        self.assertEqual(state.update(packets[-1]), {})
+
+    def test_view(self):
+        from klvdata.state import PacketState
+        from klvdata.streamparser import StreamParser
+
+        state = PacketState()
+        views = state.merge(StreamParser(self.data))
+        view = next(views)
+
+        self.assertIs(next(views), view)
+        self.assertEqual(view[3], 'ESRI_Metadata_Collect')
+        self.assertEqual(view[48].SecurityClassification, 1)
+        self.assertNotIn(8, view)
+        self.assertRaises(KeyError, view.__getitem__, 8)
+        self.assertEqual(len(view), len(list(view)))
+
+        state.clear()
+        self.assertEqual(len(view), 0)
+        self.assertEqual(state.packets, 0)
+        self.assertEqual(dict(view), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
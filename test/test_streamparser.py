@@ -21,9 +21,34 @@
 # LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 
+import asyncio
 import unittest
 
 
+def run(coroutine):
+    """Run coroutine in a new event loop; asyncio.run needs Python 3.7."""
+    loop = asyncio.new_event_loop()
+
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+async def collect(parser):
+    """Return the elements of an AsyncStreamParser, without an async
+    comprehension, which needs Python 3.6."""
+    packets = []
+
+    while True:
+        try:
+            packets.append(await parser.__anext__())
+        except StopAsyncIteration:
+            break
+
+    return packets
+
+
 class ParserSingleLong(unittest.TestCase):
     def test_singlepacket(self):
 
@@ -39,6 +64,388 @@ class ParserSingleLong(unittest.TestCase):
             # packet.structure()
             pass
 
+    def test_buffered(self):
+        with open('./data/Cheyenne.bin', 'rb') as f:
+            data = f.read()
+
+        from klvdata.streamparser import StreamParser
+        from klvdata import misb0601
+
+        with open('./data/Cheyenne.bin', 'rb') as f:
+            buffered = [packet.MetadataList() for packet in StreamParser(f, buffered=True)]
+
+        self.assertEqual(buffered, [packet.MetadataList() for packet in StreamParser(data)])
+
+    def test_from_path(self):
+        from klvdata.streamparser import StreamParser
+        from klvdata import misb0601
+
+        with open('./data/Cheyenne.bin', 'rb') as f:
+            expected = [packet.MetadataList() for packet in StreamParser(f)]
+
+        with StreamParser.from_path('./data/Cheyenne.bin') as parser:
+            self.assertEqual([packet.MetadataList() for packet in parser], expected)
+
+    def test_from_path_close(self):
+        from klvdata.streamparser import StreamParser
+        from klvdata import misb0601
+
+        parser = StreamParser.from_path('./data/Cheyenne.bin')
+        next(parser)
+        parser.close()
+
+        self.assertTrue(parser.source.closed)
+        self.assertEqual(list(parser), [])
+
+    def test_from_path_empty(self):
+        import os
+        import tempfile
+        from klvdata.streamparser import StreamParser
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'empty.bin')
+            open(path, 'wb').close()
+
+            with StreamParser.from_path(path) as parser:
+                self.assertEqual(list(parser), [])
+
+    def test_resync(self):
+        from klvdata.streamparser import StreamParser
+        from klvdata import misb0601
+
+        with open('./data/Cheyenne.bin', 'rb') as f:
+            data = f.read()
+
+        expected = [packet.MetadataList() for packet in StreamParser(data)]
+
+        parser = StreamParser(data, resync=True)
+        self.assertEqual([packet.MetadataList() for packet in parser], expected)
+        self.assertEqual(parser.bytes_skipped, 0)
+
+        # Start mid-packet and corrupt the third packet.
+        packet_length = len(bytes(next(StreamParser(data))))
+        corrupted = bytearray(data[100:])
+        corrupted[2 * packet_length] ^= 0xFF
+
+        parser = StreamParser(bytes(corrupted), resync=True)
+        packets = [packet.MetadataList() for packet in parser]
+
+        self.assertEqual(packets, expected[1:2] + expected[3:])
+        self.assertEqual(parser.bytes_skipped, 2 * packet_length - 100)
+
+    def test_resync_verify(self):
+        from klvdata.misb0601 import UASLocalMetadataSet
+
+        with open('./data/DynamicOnlyMISMMSPacketData.bin', 'rb') as f:
+            packet = f.read()
+
+        self.assertTrue(UASLocalMetadataSet.verify(packet))
+        self.assertFalse(UASLocalMetadataSet.verify(packet[:-1] + b'\x00'))
+
+
+class SeekTime(unittest.TestCase):
+    def setUp(self):
+        from klvdata.streamparser import StreamParser
+        from klvdata import misb0601
+
+        with open('./data/Cheyenne.bin', 'rb') as f:
+            self.data = f.read()
+
+        self.packets = [packet.MetadataList() for packet in StreamParser(self.data)]
+        self.timestamps = [
+            misb0601.UASLocalMetadataSet.read_timestamp(bytes(packet)[18:])
+            for packet in StreamParser(self.data)]
+
+    def assertSeek(self, when, match, neighbours, **kwargs):
+        from klvdata.streamparser import StreamParser
+
+        parser = StreamParser(self.data)
+        packets = parser.seek_time(when, neighbours, **kwargs)
+
+        self.assertEqual(
+            [packet.MetadataList() for packet in packets],
+            self.packets[max(match - neighbours, 0):match + neighbours + 1])
+        self.assertEqual(next(parser).MetadataList(), self.packets[match])
+
+    def test_probe(self):
+        for match in (0, 1, 200, len(self.packets) - 1):
+            for neighbours in (0, 2):
+                self.assertSeek(self.timestamps[match], match, neighbours)
+                self.assertSeek(self.timestamps[match] + 1, match, neighbours)
+
+        self.assertSeek(self.timestamps[0] - 1, 0, 1)
+        self.assertSeek(self.timestamps[-1] + 10 ** 6, len(self.packets) - 1, 1)
+
+    def test_index(self):
+        from klvdata.index import PacketIndex
+
+        index = PacketIndex.build('./data/Cheyenne.bin')
+
+        for match in (0, 200, len(self.packets) - 1):
+            self.assertSeek(self.timestamps[match], match, 1, index=index)
+
+        self.assertSeek(self.timestamps[0] - 1, 0, 1, index=index)
+
+    def test_datetime(self):
+        from datetime import datetime
+        from datetime import timedelta
+        from datetime import timezone
+
+        when = datetime(1970, 1, 1, tzinfo=timezone.utc) + timedelta(microseconds=self.timestamps[100])
+
+        self.assertSeek(when, 100, 0)
+        self.assertSeek(when.replace(tzinfo=None), 100, 0)
+
+    def test_stream_source(self):
+        from io import BytesIO
+        from klvdata.streamparser import StreamParser
+
+        with self.assertRaises(TypeError):
+            StreamParser(BytesIO(self.data)).seek_time(0)
+
+
+class IncrementalParser(unittest.TestCase):
+    def test_chunks(self):
+        from klvdata.streamparser import IncrementalStreamParser
+        from klvdata.streamparser import StreamParser
+        from klvdata import misb0601
+
+        with open('./data/Cheyenne.bin', 'rb') as f:
+            data = f.read()
+
+        expected = [packet.MetadataList() for packet in StreamParser(data)]
+
+        for chunk_size in (1, 17, 1000, len(data)):
+            parser = IncrementalStreamParser()
+            packets = []
+
+            for start in range(0, len(data), chunk_size):
+                packets.extend(parser.feed(data[start:start + chunk_size]))
+
+            self.assertEqual([packet.MetadataList() for packet in packets], expected)
+            self.assertEqual(parser.pending, 0)
+
+    def test_partial(self):
+        from klvdata.streamparser import IncrementalStreamParser
+        from klvdata import misb0601
+
+        with open('./data/DynamicOnlyMISMMSPacketData.bin', 'rb') as f:
+            data = f.read()
+
+        parser = IncrementalStreamParser()
+
+        self.assertEqual(parser.feed(data[:50]), [])
+        self.assertEqual(parser.pending, 50)
+
+        packets = parser.feed(data[50:] + data[:10])
+
+        self.assertEqual(len(packets), 1)
+        self.assertEqual(bytes(packets[0]), data)
+        self.assertEqual(parser.pending, 10)
+
+
+class AsyncParser(unittest.TestCase):
+    def test_reader(self):
+        from klvdata.streamparser import AsyncStreamParser
+        from klvdata.streamparser import StreamParser
+        from klvdata import misb0601
+
+        with open('./data/Cheyenne.bin', 'rb') as f:
+            data = f.read()
+
+        async def parse(data):
+            reader = asyncio.StreamReader()
+            reader.feed_data(data)
+            reader.feed_eof()
+
+            return await collect(AsyncStreamParser(reader))
+
+        expected = [packet.MetadataList() for packet in StreamParser(data)]
+
+        # A truncated final packet ends iteration like a short read does.
+        for source in (data, data + data[:100]):
+            packets = run(parse(source))
+            self.assertEqual([packet.MetadataList() for packet in packets], expected)
+
+
+class LazySet(unittest.TestCase):
+    def test_lazy(self):
+        from klvdata.misb0601 import SensorLatitude
+        from klvdata.setparser import LazyItems
+        from klvdata.streamparser import StreamParser
+
+        with open('./data/Cheyenne.bin', 'rb') as f:
+            data = f.read()
+
+        expected = list(StreamParser(data))
+        packets = list(StreamParser(data, lazy=True))
+
+        self.assertIsInstance(packets[0].items, LazyItems)
+        self.assertEqual(len(packets[0].items), len(expected[0].items))
+
+        # Items are only parsed when accessed.
+        self.assertEqual(packets[0].items._parsed, {})
+        self.assertEqual(packets[0][SensorLatitude.key].value.value, expected[0][SensorLatitude.key].value.value)
+        self.assertEqual(list(packets[0].items._parsed), [SensorLatitude.key])
+
+        self.assertEqual([packet.MetadataList() for packet in packets],
+                         [packet.MetadataList() for packet in expected])
+
+    def test_parse_error(self):
+        from klvdata.setparser import LazyItems
+
+        class Failing(object):
+            def __init__(self, value):
+                raise ValueError(value)
+
+        items = LazyItems({b'\x01': bytes, b'\x02': Failing}, [(b'\x01', b'a'), (b'\x02', b'b'), (b'\x03', b'c')])
+
+        self.assertEqual(len(items), 2)
+        self.assertEqual(items.values(), [b'a'])
+        self.assertNotIn(b'\x02', items)
+        self.assertRaises(KeyError, items.__getitem__, b'\x03')
+
+
+class TagProjection(unittest.TestCase):
+    def test_tags(self):
+        from klvdata.misb0601 import SensorLatitude
+        from klvdata.streamparser import StreamParser
+
+        with open('./data/Cheyenne.bin', 'rb') as f:
+            data = f.read()
+
+        tags = {2, SensorLatitude, 14}
+        expected = [{tag: value for tag, value in packet.MetadataList().items() if tag in (2, 13, 14)}
+                    for packet in StreamParser(data)]
+
+        for options in ({}, {'lazy': True}, {'buffered': True}):
+            packets = list(StreamParser(data, tags=tags, **options))
+
+            self.assertEqual([len(packet.items) for packet in packets], [3] * len(expected))
+            self.assertEqual([packet.MetadataList() for packet in packets], expected)
+
+    def test_nested(self):
+        from klvdata.misb0102 import SecurityLocalMetadataSet
+        from klvdata.streamparser import StreamParser
+
+        with open('./data/Cheyenne.bin', 'rb') as f:
+            data = f.read()
+
+        packet = next(StreamParser(data, tags={2}))
+        self.assertNotIn(SecurityLocalMetadataSet.key, packet.items)
+
+        packet = next(StreamParser(data, tags={2, SecurityLocalMetadataSet}))
+        self.assertIn(SecurityLocalMetadataSet.key, packet.items)
+        self.assertEqual(len(packet[SecurityLocalMetadataSet.key].items), 1)
+
+    def test_tag_keys(self):
+        from klvdata.misb0601 import SensorLatitude
+        from klvdata.misb0601 import UASLocalMetadataSet
+
+        keys = UASLocalMetadataSet.tag_keys([2, SensorLatitude, 48])
+
+        self.assertEqual(keys, {b'\x02', b'\x0d', b'\x30'})
+        self.assertIs(UASLocalMetadataSet(b'', tags=keys).tags, keys)
+
+
+class VerifyPackets(unittest.TestCase):
+    def setUp(self):
+        with open('./data/Cheyenne.bin', 'rb') as f:
+            data = bytearray(f.read())
+
+        # Corrupt a value byte of the fourth and eleventh packets.
+        data[259 * 3 + 100] ^= 0xFF
+        data[259 * 10 + 50] ^= 0x01
+        self.data = bytes(data)
+
+    def test_skip(self):
+        from klvdata.streamparser import StreamParser
+
+        parser = StreamParser(self.data, verify='skip')
+        packets = list(parser)
+
+        self.assertEqual(len(packets), 405)
+        self.assertEqual(parser.verify_failures, 2)
+        self.assertTrue(all(packet.verified for packet in packets))
+
+    def test_flag(self):
+        from klvdata.streamparser import StreamParser
+
+        for options in ({}, {'buffered': True}):
+            parser = StreamParser(self.data, verify='flag', **options)
+            packets = list(parser)
+
+            self.assertEqual(len(packets), 407)
+            self.assertEqual(parser.verify_failures, 2)
+            self.assertEqual([i for i, packet in enumerate(packets) if not packet.verified], [3, 10])
+
+    def test_default(self):
+        from klvdata.streamparser import StreamParser
+
+        packets = list(StreamParser(self.data))
+
+        self.assertEqual(len(packets), 407)
+        self.assertIsNone(packets[3].verified)
+        self.assertRaises(ValueError, StreamParser, self.data, verify='drop')
+
+    def test_long_form_length(self):
+        from klvdata.common import packet_checksum
+        from klvdata.streamparser import AsyncStreamParser
+        from klvdata.streamparser import IncrementalStreamParser
+        from klvdata.streamparser import StreamParser
+
+        # Five valid packets with their length in a longer form than needed,
+        # 82 00 F1 for 81 F1, and the checksum summed over those bytes.
+        data = b''
+
+        for i in range(5):
+            packet = self.data[259 * i:259 * (i + 1)]
+            self.assertEqual(packet[16], 0x81)
+            packet = bytearray(packet[:16] + b'\x82\x00' + packet[17:])
+            packet[-2:] = packet_checksum(packet)
+            data += bytes(packet)
+
+        for options in ({}, {'buffered': True}, {'resync': True}):
+            parser = StreamParser(data, verify='skip', **options)
+            self.assertEqual(len(list(parser)), 5)
+            self.assertEqual(parser.verify_failures, 0)
+
+        parser = IncrementalStreamParser(verify='skip')
+        self.assertEqual(len(parser.feed(data)), 5)
+
+        async def parse():
+            reader = asyncio.StreamReader()
+            reader.feed_data(data)
+            reader.feed_eof()
+            parser = AsyncStreamParser(reader, verify='skip')
+
+            return await collect(parser)
+
+        self.assertEqual(len(run(parse())), 5)
+
+    def test_incremental(self):
+        from klvdata.streamparser import IncrementalStreamParser
+
+        parser = IncrementalStreamParser(verify='skip')
+
+        self.assertEqual(len(parser.feed(self.data)), 405)
+        self.assertEqual(parser.verify_failures, 2)
+
+    def test_async(self):
+        from klvdata.streamparser import AsyncStreamParser
+
+        async def parse():
+            reader = asyncio.StreamReader()
+            reader.feed_data(self.data)
+            reader.feed_eof()
+            parser = AsyncStreamParser(reader, verify='skip')
+
+            return await collect(parser), parser.verify_failures
+
+        packets, failures = run(parse())
+
+        self.assertEqual((len(packets), failures), (405, 2))
+
 
 if __name__ == "__main__":
     unittest.main()